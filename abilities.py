@@ -0,0 +1,46 @@
+"""
+Available abilities of our units, queried at most once per game step.
+
+Chronoboost asks for the abilities of every nexus and the warp-in loop for those of every warpgate, one query per
+warpgate. AbilityCache asks the game about every unit of its group (our nexuses and ready warpgates) in one query the
+first time any of them is needed in a step, and answers from that for the rest of the step. Units outside the group are
+queried together when they are first asked for, and kept for the step as well.
+"""
+
+
+class AbilityCache:
+    def __init__(self, bot, group):
+        # group: function returning the Units that are queried together, e.g. lambda: bot.own(NEXUS) | bot.own.ready(WARPGATE)
+        self.bot = bot
+        self.group = group
+        self.game_loop = None
+        # {tag: [AbilityId]}
+        self.abilities = {}
+        # Number of queries sent to the game, for the debug output
+        self.queries = 0
+
+    async def fetch(self, units):
+        # Queries the units that aren't cached yet this step, with the rest of the group on the first query of the step.
+        if self.bot.state.game_loop != self.game_loop:
+            self.game_loop = self.bot.state.game_loop
+            self.abilities = {}
+            units = list(units) + list(self.group())
+        missing = []
+        missing_tags = set()
+        for unit in units:
+            if unit.tag not in self.abilities and unit.tag not in missing_tags:
+                missing.append(unit)
+                missing_tags.add(unit.tag)
+        if missing:
+            self.queries += 1
+            for unit, abilities in zip(missing, await self.bot.get_available_abilities(missing)):
+                self.abilities[unit.tag] = abilities
+
+    async def of(self, unit):
+        await self.fetch([unit])
+        return self.abilities[unit.tag]
+
+    async def of_units(self, units):
+        # Abilities of each unit, in the same order, like BotAI.get_available_abilities
+        await self.fetch(units)
+        return [self.abilities[unit.tag] for unit in units]
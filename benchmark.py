@@ -0,0 +1,439 @@
+"""
+Times the heavy parts of a game step without the game.
+
+Builds TheUnseenz on a synthetic game: game data with static costs (weapons, speeds and attributes are filled in from
+unit_list.py), a flat map with mirrored bases, and one observation per scenario with generated workers, structures
+and armies for both players. The bot goes through the same _prepare_start/_prepare_step/_prepare_first_step calls
+main.py makes in a real game and only the client is a stand-in, so the timed code runs unchanged. Every timed call
+starts a new game loop, so the per-step caches are rebuilt each time like they would be in a game.
+
+Before timing, each scenario checks PlacementCache.search against a plain ring by ring scan with is_free on random
+anchors (--checks of them), and stops with the first difference.
+
+    python benchmark.py                                  # all scenarios against terran
+    python benchmark.py max --enemy-race zerg --seconds 2
+    python benchmark.py --csv bench.csv
+"""
+import argparse
+import asyncio
+import csv
+import math
+import random
+import time
+from s2clientprotocol import common_pb2, data_pb2, raw_pb2, sc2api_pb2, score_pb2
+from sc2 import Race
+from sc2.constants import *
+from sc2.game_data import GameData
+from sc2.game_info import GameInfo
+from sc2.game_state import GameState
+from sc2.position import Point2
+from theunseenz import TheUnseenz
+from known_units import KnownUnits
+from profiler import Profiler
+from placement import snap, CANDIDATES
+from unit_list import unit_tables
+
+
+MAP_SIZE = 176
+# Base centers on our half of the map, main first. The enemy's are mirrored through the map center.
+BASES = [(28.5, 28.5), (30.5, 62.5), (62.5, 30.5), (62.5, 62.5), (28.5, 98.5), (98.5, 28.5)]
+
+# (minerals, vespene, supply) of everything the scenarios place or the bot looks up
+COSTS = {
+    # Protoss
+    PROBE: (50, 0, 1), ZEALOT: (100, 0, 2), STALKER: (125, 50, 2), SENTRY: (50, 100, 2), ADEPT: (100, 25, 2),
+    HIGHTEMPLAR: (50, 150, 2), DARKTEMPLAR: (125, 125, 2), ARCHON: (175, 275, 4), OBSERVER: (25, 75, 1),
+    WARPPRISM: (250, 0, 2), IMMORTAL: (275, 100, 4), COLOSSUS: (300, 200, 6), DISRUPTOR: (150, 150, 3),
+    PHOENIX: (150, 100, 2), ORACLE: (150, 150, 3), VOIDRAY: (250, 150, 4), TEMPEST: (250, 175, 5),
+    CARRIER: (350, 250, 6), INTERCEPTOR: (15, 0, 0), MOTHERSHIP: (400, 400, 8),
+    NEXUS: (400, 0, 0), PYLON: (100, 0, 0), ASSIMILATOR: (75, 0, 0), GATEWAY: (150, 0, 0), WARPGATE: (150, 0, 0),
+    FORGE: (150, 0, 0), CYBERNETICSCORE: (150, 0, 0), PHOTONCANNON: (150, 0, 0), SHIELDBATTERY: (100, 0, 0),
+    TWILIGHTCOUNCIL: (150, 100, 0), STARGATE: (150, 150, 0), ROBOTICSFACILITY: (150, 100, 0),
+    FLEETBEACON: (300, 200, 0), ROBOTICSBAY: (150, 150, 0), TEMPLARARCHIVE: (150, 200, 0), DARKSHRINE: (150, 150, 0),
+    # Terran
+    SCV: (50, 0, 1), MARINE: (50, 0, 1), MARAUDER: (100, 25, 2), REAPER: (50, 50, 1), GHOST: (150, 125, 2),
+    HELLION: (100, 0, 2), HELLIONTANK: (100, 0, 2), WIDOWMINE: (75, 25, 2), SIEGETANK: (150, 125, 3),
+    SIEGETANKSIEGED: (150, 125, 3), CYCLONE: (150, 100, 3), THOR: (300, 200, 6), THORAP: (300, 200, 6),
+    VIKINGFIGHTER: (150, 75, 2), VIKINGASSAULT: (150, 75, 2), MEDIVAC: (100, 100, 2), LIBERATOR: (150, 150, 3),
+    LIBERATORAG: (150, 150, 3), BANSHEE: (150, 100, 3), BATTLECRUISER: (400, 300, 6),
+    COMMANDCENTER: (400, 0, 0), ORBITALCOMMAND: (550, 0, 0), SUPPLYDEPOT: (100, 0, 0), REFINERY: (75, 0, 0),
+    BARRACKS: (150, 0, 0), FACTORY: (150, 100, 0), STARPORT: (150, 100, 0), ENGINEERINGBAY: (125, 0, 0),
+    MISSILETURRET: (100, 0, 0), BUNKER: (100, 0, 0),
+    # Zerg
+    DRONE: (50, 0, 1), ZERGLING: (25, 0, 0.5), BANELING: (50, 25, 0.5), QUEEN: (150, 0, 2), ROACH: (75, 25, 2),
+    RAVAGER: (100, 100, 3), HYDRALISK: (100, 50, 2), LURKERMP: (150, 150, 3), MUTALISK: (100, 100, 2),
+    CORRUPTOR: (150, 100, 2), BROODLORD: (300, 250, 4), ULTRALISK: (275, 200, 6), OVERLORD: (100, 0, 0),
+    OVERSEER: (150, 50, 0), LARVA: (0, 0, 0), EGG: (0, 0, 0),
+    HATCHERY: (300, 0, 0), LAIR: (450, 100, 0), EXTRACTOR: (25, 0, 0), SPAWNINGPOOL: (200, 0, 0),
+    EVOLUTIONCHAMBER: (75, 0, 0), ROACHWARREN: (150, 0, 0), HYDRALISKDEN: (100, 100, 0), SPIRE: (200, 200, 0),
+    SPINECRAWLER: (100, 0, 0), SPORECRAWLER: (75, 0, 0),
+}
+STRUCTURES = {NEXUS, PYLON, ASSIMILATOR, GATEWAY, WARPGATE, FORGE, CYBERNETICSCORE, PHOTONCANNON, SHIELDBATTERY,
+              TWILIGHTCOUNCIL, STARGATE, ROBOTICSFACILITY, FLEETBEACON, ROBOTICSBAY, TEMPLARARCHIVE, DARKSHRINE,
+              COMMANDCENTER, ORBITALCOMMAND, SUPPLYDEPOT, REFINERY, BARRACKS, FACTORY, STARPORT, ENGINEERINGBAY,
+              MISSILETURRET, BUNKER, HATCHERY, LAIR, EXTRACTOR, SPAWNINGPOOL, EVOLUTIONCHAMBER, ROACHWARREN,
+              HYDRALISKDEN, SPIRE, SPINECRAWLER, SPORECRAWLER}
+# Build ability and footprint radius of the structures placement.py places
+BUILD_ABILITIES = {PYLON: (PROTOSSBUILD_PYLON, 1), GATEWAY: (PROTOSSBUILD_GATEWAY, 1.5), CYBERNETICSCORE: (PROTOSSBUILD_CYBERNETICSCORE, 1.5),
+                   SHIELDBATTERY: (BUILD_SHIELDBATTERY, 1), DARKSHRINE: (PROTOSSBUILD_DARKSHRINE, 1)}
+FLYING = {OBSERVER, WARPPRISM, PHOENIX, ORACLE, VOIDRAY, TEMPEST, CARRIER, INTERCEPTOR, MOTHERSHIP, VIKINGFIGHTER,
+          MEDIVAC, LIBERATOR, LIBERATORAG, BANSHEE, BATTLECRUISER, MUTALISK, CORRUPTOR, BROODLORD, OVERLORD, OVERSEER}
+TOWNHALL = {Race.Protoss: NEXUS, Race.Terran: COMMANDCENTER, Race.Zerg: HATCHERY}
+WORKER = {Race.Protoss: PROBE, Race.Terran: SCV, Race.Zerg: DRONE}
+GAS_BUILDING = {Race.Protoss: ASSIMILATOR, Race.Terran: REFINERY, Race.Zerg: EXTRACTOR}
+ATTRIBUTE_IDS = {'Light': 1, 'Armored': 2, 'Biological': 3, 'Mechanical': 4, 'Psionic': 6, 'Massive': 7, 'Structure': 8, 'Heroic': 10}
+
+# Scenarios: game time, bases, workers and gas buildings per player, our structures and army, and the enemy's by race.
+SCENARIOS = {
+    'early': dict(
+        minutes=4, bases=2, workers=32, gas=2,
+        structures={PYLON: 4, GATEWAY: 3, CYBERNETICSCORE: 1},
+        army={ZEALOT: 2, STALKER: 4, ADEPT: 2},
+        enemy={
+            Race.Terran: ({SUPPLYDEPOT: 3, BARRACKS: 3, FACTORY: 1}, {MARINE: 12, MARAUDER: 2, REAPER: 1}),
+            Race.Protoss: ({PYLON: 4, GATEWAY: 3, CYBERNETICSCORE: 1}, {ZEALOT: 2, STALKER: 4, ADEPT: 2}),
+            Race.Zerg: ({SPAWNINGPOOL: 1, ROACHWARREN: 1, SPINECRAWLER: 1}, {ZERGLING: 16, QUEEN: 3, ROACH: 4, OVERLORD: 5}),
+        },
+    ),
+    'mid': dict(
+        minutes=8, bases=3, workers=52, gas=5,
+        structures={PYLON: 9, GATEWAY: 6, CYBERNETICSCORE: 1, FORGE: 1, TWILIGHTCOUNCIL: 1, ROBOTICSFACILITY: 2,
+                    ROBOTICSBAY: 1, SHIELDBATTERY: 2},
+        army={ZEALOT: 6, STALKER: 10, SENTRY: 1, IMMORTAL: 3, COLOSSUS: 2, OBSERVER: 1},
+        enemy={
+            Race.Terran: ({SUPPLYDEPOT: 10, BARRACKS: 5, FACTORY: 1, STARPORT: 1, ENGINEERINGBAY: 1},
+                          {MARINE: 24, MARAUDER: 8, SIEGETANK: 3, MEDIVAC: 3}),
+            Race.Protoss: ({PYLON: 9, GATEWAY: 6, CYBERNETICSCORE: 1, STARGATE: 2, FLEETBEACON: 1},
+                           {ZEALOT: 6, STALKER: 8, VOIDRAY: 4, PHOENIX: 2}),
+            Race.Zerg: ({SPAWNINGPOOL: 1, ROACHWARREN: 1, HYDRALISKDEN: 1, EVOLUTIONCHAMBER: 2},
+                        {ROACH: 16, RAVAGER: 4, HYDRALISK: 8, ZERGLING: 16, QUEEN: 4, OVERLORD: 12}),
+        },
+    ),
+    'max': dict(
+        minutes=14, bases=5, workers=72, gas=8,
+        structures={PYLON: 18, GATEWAY: 10, CYBERNETICSCORE: 1, FORGE: 2, TWILIGHTCOUNCIL: 1, TEMPLARARCHIVE: 1,
+                    ROBOTICSFACILITY: 2, ROBOTICSBAY: 1, STARGATE: 3, FLEETBEACON: 1, PHOTONCANNON: 4, SHIELDBATTERY: 6},
+        army={ZEALOT: 8, STALKER: 12, ARCHON: 4, IMMORTAL: 4, COLOSSUS: 3, VOIDRAY: 4, TEMPEST: 2, CARRIER: 3,
+              INTERCEPTOR: 24, OBSERVER: 2},
+        enemy={
+            Race.Terran: ({SUPPLYDEPOT: 22, BARRACKS: 8, FACTORY: 2, STARPORT: 2, ENGINEERINGBAY: 2, MISSILETURRET: 6},
+                          {MARINE: 40, MARAUDER: 12, SIEGETANKSIEGED: 6, VIKINGFIGHTER: 8, LIBERATOR: 4, MEDIVAC: 6, THOR: 2}),
+            Race.Protoss: ({PYLON: 18, GATEWAY: 10, CYBERNETICSCORE: 1, STARGATE: 3, FLEETBEACON: 1, PHOTONCANNON: 4},
+                           {ZEALOT: 10, STALKER: 14, ARCHON: 4, IMMORTAL: 4, CARRIER: 4, INTERCEPTOR: 32, TEMPEST: 2}),
+            Race.Zerg: ({SPAWNINGPOOL: 1, ROACHWARREN: 1, HYDRALISKDEN: 1, SPIRE: 1, EVOLUTIONCHAMBER: 2, SPORECRAWLER: 5},
+                        {ROACH: 20, HYDRALISK: 20, LURKERMP: 6, ZERGLING: 24, CORRUPTOR: 8, BROODLORD: 4, QUEEN: 6,
+                         OVERLORD: 20, OVERSEER: 2}),
+        },
+    ),
+}
+
+
+class StandInClient:
+    # Answers the few client queries the benchmarked code makes, without a game.
+    async def chat_send(self, message, team_only):
+        pass
+
+    async def query_pathings(self, queries):
+        return [Point2(start).distance_to(Point2(end)) for start, end in queries]
+
+    async def query_available_abilities(self, units, ignore_resource_requirements=False):
+        return [[] for unit in units]
+
+
+def image(bits_per_pixel, value):
+    # A map layer with every point set to value.
+    if bits_per_pixel == 1:
+        data = bytes([0xFF if value else 0])*(MAP_SIZE*MAP_SIZE//8)
+    else:
+        data = bytes([value])*(MAP_SIZE*MAP_SIZE)
+    return common_pb2.ImageData(bits_per_pixel=bits_per_pixel, size=common_pb2.Size2DI(x=MAP_SIZE, y=MAP_SIZE), data=data)
+
+
+def mirror(position):
+    return (MAP_SIZE - position[0], MAP_SIZE - position[1])
+
+
+def game_data():
+    units = [data_pb2.UnitTypeData(unit_id=MINERALFIELD.value, name='MineralField', available=True, has_minerals=True),
+             data_pb2.UnitTypeData(unit_id=VESPENEGEYSER.value, name='VespeneGeyser', available=True, has_vespene=True)]
+    for type_id, (minerals, vespene, supply) in COSTS.items():
+        unit = data_pb2.UnitTypeData(unit_id=type_id.value, name=type_id.name.title(), available=True,
+                                     mineral_cost=minerals, vespene_cost=vespene, food_required=supply)
+        if type_id in STRUCTURES:
+            unit.attributes.extend([ATTRIBUTE_IDS['Armored'], ATTRIBUTE_IDS['Structure']])
+        units.append(unit)
+        if type_id in BUILD_ABILITIES:
+            unit.ability_id = BUILD_ABILITIES[type_id][0].value
+    abilities = [data_pb2.AbilityData(ability_id=ability.value, available=True) for ability in (HARVEST_GATHER, HARVEST_RETURN, ATTACK, MOVE, WARPGATETRAIN_STALKER)]
+    abilities += [data_pb2.AbilityData(ability_id=ability.value, available=True, is_building=True, footprint_radius=radius)
+                  for ability, radius in BUILD_ABILITIES.values()]
+    return GameData(sc2api_pb2.ResponseData(units=units, abilities=abilities))
+
+
+def add_unit_stats(bot):
+    # Weapons, speed and attributes of every unit with stats in unit_list.py, so targeting and range checks work.
+    for table in unit_tables(bot).values():
+        for stats in table:
+            proto = bot._game_data.units[stats.type_id.value]._proto
+            proto.movement_speed = stats.movement_speed/1.4
+            proto.attributes.extend([ATTRIBUTE_IDS[attribute] for attribute in stats.attribute])
+            for weapon_type, attacks, damage, attack_range, speed in (
+                    (data_pb2.Weapon.Ground, stats.attacks_ground, stats.dmg_ground, stats.range_ground, stats.attack_speed_ground),
+                    (data_pb2.Weapon.Air, stats.attacks_air, stats.dmg_air, stats.range_air, stats.attack_speed_air)):
+                if attacks and damage:
+                    proto.weapons.append(data_pb2.Weapon(type=weapon_type, damage=damage, attacks=max(int(attacks), 1),
+                                                         range=attack_range, speed=speed))
+    bot._game_data.unit_types.clear()
+
+
+def game_info(enemy_race):
+    start_raw = raw_pb2.StartRaw(
+        map_size=common_pb2.Size2DI(x=MAP_SIZE, y=MAP_SIZE),
+        pathing_grid=image(1, 1), placement_grid=image(1, 1), terrain_height=image(8, 100),
+        playable_area=common_pb2.RectangleI(p0=common_pb2.PointI(x=0, y=0), p1=common_pb2.PointI(x=MAP_SIZE, y=MAP_SIZE)),
+        start_locations=[common_pb2.Point2D(x=mirror(BASES[0])[0], y=mirror(BASES[0])[1])],
+    )
+    players = [sc2api_pb2.PlayerInfo(player_id=1, type=sc2api_pb2.Participant, race_requested=Race.Protoss.value),
+               sc2api_pb2.PlayerInfo(player_id=2, type=sc2api_pb2.Participant, race_requested=enemy_race.value)]
+    return sc2api_pb2.ResponseGameInfo(map_name='Benchmark', start_raw=start_raw, player_info=players)
+
+
+class Observation:
+    # Builds the raw units of one observation.
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.units = []
+        self.next_tag = 1
+
+    def add(self, type_id, position, alliance, **fields):
+        tag = self.next_tag
+        self.next_tag += 1
+        if type_id in COSTS and 'health_max' not in fields:
+            fields['health_max'] = fields['health'] = 1000 if type_id in STRUCTURES else 100
+        unit = raw_pb2.Unit(display_type=raw_pb2.Visible, alliance=alliance, tag=tag, unit_type=type_id.value,
+                            owner={raw_pb2.Self: 1, raw_pb2.Enemy: 2}.get(alliance, 16),
+                            pos=common_pb2.Point(x=position[0], y=position[1], z=10), build_progress=1,
+                            is_flying=type_id in FLYING, radius=fields.pop('radius', 0.5), **fields)
+        self.units.append(unit)
+        return unit
+
+    def near(self, position, spread):
+        return (position[0] + self.random.uniform(-spread, spread), position[1] + self.random.uniform(-spread, spread))
+
+    def base(self, center):
+        # Eight mineral fields in an arc facing away from the map center and two geysers to the sides.
+        away = math.atan2(center[1] - MAP_SIZE/2, center[0] - MAP_SIZE/2)
+        minerals = [self.add(MINERALFIELD, (center[0] + 7*math.cos(away + angle), center[1] + 7*math.sin(away + angle)),
+                             raw_pb2.Neutral, mineral_contents=1800 if i % 2 else 900, radius=1)
+                    for i, angle in enumerate(math.radians(angle) for angle in range(-60, 61, 17))]
+        geysers = [self.add(VESPENEGEYSER, (center[0] + 7.5*math.cos(away + angle), center[1] + 7.5*math.sin(away + angle)),
+                            raw_pb2.Neutral, vespene_contents=2250, radius=1.5)
+                   for angle in (math.radians(-100), math.radians(100))]
+        return minerals, geysers
+
+    def player(self, race, alliance, bases, workers, gas, structures, army, bases_resources, front, seed_army_cooldowns=False):
+        worker_type = WORKER[race]
+        for index, center in enumerate(bases):
+            minerals, geysers = bases_resources[center]
+            base_workers = min(workers, 22) if index < len(bases) - 1 else workers
+            workers -= base_workers
+            mining = min(base_workers, 16)
+            self.add(TOWNHALL[race], center, alliance, assigned_harvesters=base_workers, ideal_harvesters=16, radius=2.75)
+            for worker in range(base_workers):
+                mineral = minerals[worker % len(minerals)]
+                orders = [raw_pb2.UnitOrder(ability_id=HARVEST_GATHER.value, target_unit_tag=mineral.tag)] if worker < mining + 4 else []
+                self.add(worker_type, self.near((mineral.pos.x, mineral.pos.y), 2), alliance, orders=orders, radius=0.375)
+            for geyser in geysers[:max(min(gas, 2), 0)]:
+                self.add(GAS_BUILDING[race], (geyser.pos.x, geyser.pos.y), alliance, assigned_harvesters=3, ideal_harvesters=3,
+                         vespene_contents=2000, radius=1.5)
+                gas -= 1
+        main = bases[0]
+        for type_id, amount in structures.items():
+            for i in range(amount):
+                self.add(type_id, self.near(main, 14), alliance, radius=1.5)
+        for type_id, amount in army.items():
+            for i in range(amount):
+                cooldown = self.random.choice((0, 0, 5)) if seed_army_cooldowns else 0
+                self.add(type_id, self.near(front, 6), alliance, weapon_cooldown=cooldown, radius=0.6)
+
+    def response(self, game_loop, army_supply, workers):
+        common = sc2api_pb2.PlayerCommon(player_id=1, minerals=400, vespene=200, food_cap=200,
+                                         food_used=min(int(army_supply) + workers, 200), food_army=int(army_supply),
+                                         food_workers=workers, army_count=0, warp_gate_count=0)
+        score = score_pb2.Score(score_details=score_pb2.ScoreDetails(collection_rate_minerals=60*workers,
+                                                                     collection_rate_vespene=40*workers//3))
+        raw = raw_pb2.ObservationRaw(units=self.units,
+                                     map_state=raw_pb2.MapState(visibility=image(8, 2), creep=image(1, 0)))
+        observation = sc2api_pb2.Observation(game_loop=game_loop, player_common=common, raw_data=raw, score=score)
+        return sc2api_pb2.ResponseObservation(observation=observation)
+
+
+def build_bot(name, enemy_race, seed=0):
+    # A TheUnseenz set up as it would be after its first step in a game of the given scenario.
+    scenario = SCENARIOS[name]
+    enemy_structures, enemy_army = scenario['enemy'][enemy_race]
+    observation = Observation(seed)
+    own_bases = BASES[:scenario['bases']]
+    enemy_bases = [mirror(base) for base in BASES[:scenario['bases']]]
+    resources = {base: observation.base(base) for base in BASES + [mirror(base) for base in BASES]}
+    # Armies meet in the middle, close enough that some units are in range of each other
+    own_front = (MAP_SIZE/2 - 6, MAP_SIZE/2 - 6)
+    enemy_front = (MAP_SIZE/2 + 2, MAP_SIZE/2 + 2)
+    observation.player(Race.Protoss, raw_pb2.Self, own_bases, scenario['workers'], scenario['gas'], scenario['structures'],
+                       scenario['army'], resources, own_front, seed_army_cooldowns=True)
+    observation.player(enemy_race, raw_pb2.Enemy, enemy_bases, scenario['workers'], scenario['gas'], enemy_structures,
+                       enemy_army, resources, enemy_front)
+    army_supply = sum(COSTS[type_id][2]*amount for type_id, amount in scenario['army'].items())
+    response = observation.response(int(scenario['minutes']*60*22.4), army_supply, scenario['workers'])
+
+    bot = TheUnseenz()
+    bot._initialize_variables()
+    info = game_info(enemy_race)
+    bot._prepare_start(StandInClient(), 1, GameInfo(info), game_data())
+    add_unit_stats(bot)
+    bot._prepare_step(GameState(response), sc2api_pb2.Response(game_info=info))
+    bot._prepare_first_step()
+    return bot
+
+
+async def prepare(bot):
+    # First step setup, then one pass of the tasks that the benchmarked code reads from.
+    await bot.initialize()
+    # In a game the enemy is out of sight on the first step and gets discovered later, so start with nothing known.
+    bot.known_enemy_units = KnownUnits(bot)
+    bot.known_enemy_structures = KnownUnits(bot)
+    iteration = 1
+    for task in (bot.track_expansions, bot.update_state, bot.track_enemy_units, bot.track_enemy_economy, bot.update_threat):
+        await task(iteration)
+    bot.harvesters.sync(bot.workers, bot.mineral_field.tags | bot.gas_buildings.tags)
+    bot.actions.clear()
+
+
+def benchmarks(bot):
+    # name: coroutine function timed once per call, each call on a new game loop
+    async def threat_level(iteration):
+        bot.threat_cache.clear()
+        bot.calculate_threat_level(bot.own_army_race, bot.all_army, bot.enemy_army_race, bot.known_enemy_units,
+                                   bot.pending_units, bot.future_enemy_units)
+
+    async def threat_level_cached(iteration):
+        bot.calculate_threat_level(bot.own_army_race, bot.all_army, bot.enemy_army_race, bot.known_enemy_units,
+                                   bot.pending_units, bot.future_enemy_units)
+
+    async def unit_score(iteration):
+        bot.threat_cache.clear()
+        bot.army_snapshot['score_units'] = None
+        await bot.score_units(iteration)
+
+    async def distribute_workers(iteration):
+        await bot.better_distribute_workers(bot.resource_ratio)
+
+    async def enemy_economy(iteration):
+        await bot.track_enemy_economy(iteration)
+
+    async def micro(iteration):
+        await bot.micro(iteration)
+
+    pylons = bot.structures(PYLON).ready
+    proxy = pylons.closest_to(bot.enemy_start_locations[0])
+    hidden = pylons.furthest_to(bot.enemy_start_locations[0])
+
+    async def placement_search(iteration):
+        # The searches find_placements makes when none of its placements can be kept, without the game confirming them
+        placements = bot.placements
+        placements.placements.clear()
+        placements.want('pylon', PYLON, bot.townhalls.random.position.towards(bot.game_info.map_center, 5), placement_step=5)
+        placements.want('building', GATEWAY, pylons.random.position.towards(bot.game_info.map_center, 3), placement_step=3)
+        placements.want('tech', CYBERNETICSCORE, hidden.position.towards(bot.game_info.map_center, -3), placement_step=3)
+        placements.want('defence_small', SHIELDBATTERY, proxy.position)
+        placements.want('tech_small', DARKSHRINE, hidden.position)
+        placements.want('warpin', WARPGATETRAIN_STALKER, proxy.position.to2.random_on_distance(4), placement_step=1)
+
+    return {'calculate_threat_level': threat_level, 'calculate_threat_level (cached)': threat_level_cached,
+            'unit_score': unit_score, 'better_distribute_workers': distribute_workers, 'enemy_economy': enemy_economy,
+            'micro': micro, 'placement search': placement_search}
+
+
+def scan_placements(placements, unit_type, near, step, max_distance):
+    # What PlacementCache.search should find, one position at a time: every free position of the closest ring that
+    # has any, the same lattice as BotAI.find_placement.
+    near = snap(near, placements.size(unit_type))
+    if placements.is_free(unit_type, near):
+        return [near]
+    for distance in range(step, max_distance, step):
+        ring = {(near.x + dx, near.y + dy) for dx in range(-distance, distance + 1, step) for dy in (-distance, distance)}
+        ring |= {(near.x + dx, near.y + dy) for dx in (-distance, distance) for dy in range(-distance, distance + 1, step)}
+        free = [Point2(position) for position in ring if placements.is_free(unit_type, Point2(position))]
+        if free:
+            return free
+    return []
+
+
+def check_placements(bot, checks, seed=0):
+    # Compares PlacementCache.search with scan_placements on random anchors. search returns the closest few of the
+    # positions the scan finds.
+    placements = bot.placements
+    generator = random.Random(seed)
+    unit_types = [PYLON, GATEWAY, CYBERNETICSCORE, SHIELDBATTERY, DARKSHRINE, WARPGATETRAIN_STALKER]
+    for check in range(checks):
+        unit_type = generator.choice(unit_types)
+        near = Point2((generator.uniform(0, MAP_SIZE), generator.uniform(0, MAP_SIZE)))
+        step = generator.choice([1, 2, 3, 5])
+        found = placements.search(unit_type, near, step, 20)
+        expected = scan_placements(placements, unit_type, near, step, 20)
+        snapped = snap(near, placements.size(unit_type))
+        expected_distances = sorted(position.distance_to_point2(snapped) for position in expected)[:CANDIDATES]
+        if not set(found) <= set(expected) or [position.distance_to_point2(snapped) for position in found] != expected_distances:
+            raise SystemExit("Placement search differs from the scan for %s near %s, step %d: found %s, expected %s"
+                             % (unit_type, near, step, found, sorted(expected)))
+
+
+async def run(name, enemy_race, seconds, checks, profiler):
+    bot = build_bot(name, enemy_race)
+    await prepare(bot)
+    print("%s vs %s: %d own units, %d enemy units, %d structures" % (name, enemy_race.name, len(bot.units),
+          len(bot.enemy_units), len(bot.structures) + len(bot.enemy_structures)))
+    check_placements(bot, checks)
+    iteration = 2
+    for benchmark, function in benchmarks(bot).items():
+        section = name + ' ' + benchmark
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            bot.state.game_loop += 1
+            with profiler.section(section):
+                await function(iteration)
+            bot.actions.clear()
+            iteration += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Times the heavy parts of a TheUnseenz game step on synthetic game states.")
+    parser.add_argument('scenarios', nargs='*', help="scenarios to run, default all: " + ", ".join(SCENARIOS))
+    parser.add_argument('--enemy-race', choices=['terran', 'protoss', 'zerg'], default='terran')
+    parser.add_argument('--seconds', type=float, default=1.0, help="time spent on each benchmark")
+    parser.add_argument('--csv', help="also write the results to this CSV file")
+    parser.add_argument('--checks', type=int, default=300, help="random placement searches checked per scenario")
+    args = parser.parse_args()
+    enemy_race = Race[args.enemy_race.title()]
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error("unknown scenario " + name + ", choose from " + ", ".join(SCENARIOS))
+
+    profiler = Profiler()
+    for name in args.scenarios or list(SCENARIOS):
+        asyncio.run(run(name, enemy_race, args.seconds, args.checks, profiler))
+
+    rows = [profiler.histograms[section].row(section) for section in profiler.histograms]
+    print("%-48s %10s %10s %10s %10s" % ('benchmark', 'ops/sec', 'mean ms', 'p95 ms', 'max ms'))
+    for row in rows:
+        row['ops_per_sec'] = 1000/row['mean_ms'] if row['mean_ms'] else 0
+        print("%-48s %10.1f %10.3f %10.3f %10.3f" % (row['section'], row['ops_per_sec'], row['mean_ms'], row['p95_ms'], row['max_ms']))
+    if args.csv:
+        with open(args.csv, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Builds unit_stats.npz from the unit definitions in unit_list.py.
+
+The data file holds the stats of the definitions, and for costs and supply only which unit types' game data costs they
+are made of, since the bot reads those from the game data of the game it is in. So no game is needed here, and the
+file only has to be rebuilt after changing the definitions, not after a balance patch.
+
+When the definitions changed since the file was last built, DEFINITIONS_VERSION in unit_list.py is bumped, which is all
+the bot checks at startup. --check only reports whether the file is up to date with the definitions, e.g. for CI.
+
+    python build_unit_stats.py
+    python build_unit_stats.py --check
+"""
+import argparse
+import collections
+import hashlib
+import inspect
+import re
+import sys
+import numpy as np
+import unit_list
+from unit_list import unit_rows, UNIT_STATS_FILE, DEFINITIONS_VERSION
+from unit_stats import StatTable, save_tables, read_header, COST_FIELDS, SCHEMA_VERSION
+
+
+UnitValue = collections.namedtuple('UnitValue', ['minerals', 'vespene'])
+
+
+class CostTerm:
+    # A cost made of game data costs, {unit type: coefficient}. Supports what the definitions do with costs: adding
+    # them up and multiplying them by a number.
+    def __init__(self, coefficients):
+        self.coefficients = coefficients
+
+    def __add__(self, other):
+        if not isinstance(other, CostTerm):
+            return NotImplemented
+        coefficients = dict(self.coefficients)
+        for type_id, coefficient in other.coefficients.items():
+            coefficients[type_id] = coefficients.get(type_id, 0) + coefficient
+        return CostTerm(coefficients)
+
+    def __mul__(self, factor):
+        return CostTerm({type_id: coefficient*factor for type_id, coefficient in self.coefficients.items()})
+
+    __rmul__ = __mul__
+
+
+class CostRecorder:
+    # Stands in for the bot in unit_rows, so each cost comes out as the game data costs it is made of.
+    def calculate_unit_value(self, type_id):
+        return UnitValue(CostTerm({type_id: 1}), CostTerm({type_id: 1}))
+
+    def calculate_supply_cost(self, type_id):
+        return CostTerm({type_id: 1})
+
+
+def definitions_hash():
+    return hashlib.sha1(inspect.getsource(unit_rows).encode()).hexdigest()
+
+
+def build():
+    # Returns the tables with zero costs and the cost recipes, as save_tables takes them.
+    armies, rows = unit_rows(CostRecorder())
+    type_ids = [type_id for army in armies.values() for type_id in army]
+    for type_id in type_ids:
+        for field in COST_FIELDS:
+            if not isinstance(rows[type_id][field], CostTerm):
+                raise SystemExit("The %s of %s is not made of game data costs" % (field, type_id))
+    cost_type_ids = sorted({cost_type for type_id in type_ids for field in COST_FIELDS for cost_type in rows[type_id][field].coefficients},
+                           key=lambda type_id: type_id.value)
+    column = {type_id: i for i, type_id in enumerate(cost_type_ids)}
+    coefficients = np.zeros((len(COST_FIELDS), len(type_ids), len(cost_type_ids)))
+    for row, type_id in enumerate(type_ids):
+        for field_index, field in enumerate(COST_FIELDS):
+            for cost_type, coefficient in rows[type_id][field].coefficients.items():
+                coefficients[field_index, row, column[cost_type]] = coefficient
+    stat_rows = {type_id: dict(rows[type_id], **{field: 0 for field in COST_FIELDS}) for type_id in type_ids}
+    tables = {name: StatTable.from_rows(army, stat_rows) for name, army in armies.items()}
+    return tables, (cost_type_ids, coefficients)
+
+
+def bump_definitions_version(version):
+    path = inspect.getsourcefile(unit_list)
+    with open(path, newline='') as file:
+        source = file.read()
+    source, count = re.subn(r'^DEFINITIONS_VERSION = \d+', 'DEFINITIONS_VERSION = %d' % version, source, flags=re.MULTILINE)
+    if count != 1:
+        raise SystemExit("Can't find DEFINITIONS_VERSION in " + path)
+    with open(path, 'w', newline='') as file:
+        file.write(source)
+    print("Bumped DEFINITIONS_VERSION in " + path + " to " + str(version))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds unit_stats.npz from the unit definitions in unit_list.py.")
+    parser.add_argument('--check', action='store_true', help="only check that the data file is up to date, exit with 1 if not")
+    args = parser.parse_args()
+    header = read_header(UNIT_STATS_FILE)
+    current_hash = definitions_hash()
+    if args.check:
+        if header != (SCHEMA_VERSION, DEFINITIONS_VERSION, current_hash):
+            print(UNIT_STATS_FILE + " is out of date with unit_list.py, run build_unit_stats.py to rebuild it.")
+            sys.exit(1)
+        print(UNIT_STATS_FILE + " is up to date.")
+        return
+
+    version = DEFINITIONS_VERSION
+    if header is not None and header[2] != current_hash and header[1] >= version:
+        version = header[1] + 1
+        bump_definitions_version(version)
+    tables, recipes = build()
+    save_tables(UNIT_STATS_FILE, tables, recipes, version, current_hash)
+    print("Wrote " + str(sum(len(table) for table in tables.values())) + " units to " + UNIT_STATS_FILE
+          + " (schema version " + str(SCHEMA_VERSION) + ", definitions version " + str(version) + ")")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Enemy economy estimator.
+
+Estimates how many minerals and how much gas the enemy has mined, base by base. Each base keeps the parameters of its
+mining model (workers, saturation times, mined-out contents and last seen times of its resources), and these are only
+recomputed when something at the base is observed: the base or one of its resources is in vision, a worker near it is
+seen or killed, or the enemy's townhall count changes. In between, the amount mined is a closed-form function of time,
+evaluated for every resource of every base at once with the parameters stacked into NumPy arrays.
+What we last saw of each mineral field and geyser is kept in a PatchTable keyed by position.
+
+Will not include the cost of the drone for zerg buildings (we might not see the worker that was used).
+Will only recognize lost mining time after seeing the mineral fields (especially relevant vs terran).
+Will not model mule mining rate, but upon seeing more minerals being mined from the mineral patch, will retroactively add that in.
+"""
+import numpy as np
+from sc2.ids.unit_typeid import UnitTypeId
+
+
+WORKERS = {UnitTypeId.SCV, UnitTypeId.PROBE, UnitTypeId.DRONE}
+TOWNHALLS = {UnitTypeId.NEXUS, UnitTypeId.COMMANDCENTER, UnitTypeId.COMMANDCENTERFLYING, UnitTypeId.ORBITALCOMMAND,
+             UnitTypeId.ORBITALCOMMANDFLYING, UnitTypeId.PLANETARYFORTRESS, UnitTypeId.HATCHERY, UnitTypeId.LAIR, UnitTypeId.HIVE}
+TOWNHALL_BUILD_TIME = 71
+WORKER_BUILD_TIME = 12
+WORKER_COST = 50
+STARTING_WORKERS = 12
+# Each base has half 900, half 1800 mineral fields. Regular has 8 mineral fields, gold bases have 6.
+LARGE_MINERAL_CONTENTS = 1800
+SMALL_MINERAL_CONTENTS = 900
+AVERAGE_MINERAL_CONTENTS = 1350
+VESPENE_CONTENTS = 2250
+MINERAL_MINING_RATE = (660/8)/60 # Mining rate per saturated mineral patch per second. x1.4 for gold.
+VESPENE_MINING_RATE = 114/60 # Mining rate per saturated geyser per second. x2 for purple.
+RICH_MINERAL_MULTIPLIER = 1.4
+RICH_VESPENE_MULTIPLIER = 2
+
+
+def is_rich(resource):
+    return resource.name.find('Rich') != -1
+
+
+def is_small_mineral(mineral):
+    # Small mineral fields have "750" in their name despite holding 900 because Blizzard
+    return mineral.name.find('750') != -1
+
+
+class Patch:
+    # What we last saw of a mineral field or vespene geyser. Its type, richness and size are parsed from its name once.
+    def __init__(self, resource, time):
+        self.is_mineral_field = resource.is_mineral_field
+        if self.is_mineral_field:
+            self.multiplier = RICH_MINERAL_MULTIPLIER if is_rich(resource) else 1
+        else:
+            self.multiplier = RICH_VESPENE_MULTIPLIER if is_rich(resource) else 1
+        self.is_small = self.is_mineral_field and is_small_mineral(resource)
+        self.see(resource, time)
+
+    def see(self, resource, time):
+        self.contents = resource.mineral_contents if self.is_mineral_field else resource.vespene_contents
+        self.last_seen = time
+
+
+class PatchTable:
+    # Last known state of every resource we have seen, keyed by position since resources never move
+    # (snapshots of the same resource do not keep its tag).
+    def __init__(self):
+        self.patches = {}
+
+    def see(self, resource, time):
+        patch = self.patches.get(resource.position)
+        if patch is None:
+            self.patches[resource.position] = Patch(resource, time)
+        else:
+            patch.see(resource, time)
+
+    def get(self, position):
+        # None if we have never seen the resource at that position.
+        return self.patches.get(position)
+
+    def __len__(self):
+        return len(self.patches)
+
+
+class BaseEconomy:
+    # Mining model parameters of one enemy base, recomputed by refresh() from what we know.
+    # The per-resource lists (mineral fields first, then geysers) are stacked into arrays by EnemyEconomy.
+    def __init__(self, position, minerals_available, vespene_available, start_location):
+        self.position = position
+        self.minerals_available = minerals_available
+        self.vespene_available = vespene_available
+        self.start_location = start_location
+        self.completed = 0
+        self.known_workers = 0
+        self.known_workers_time = 0
+        self.max_workers_minerals = 0
+        self.max_workers_vespene = 0
+        # Last known or assumed contents, mining rate multiplier and last seen time of each resource of the base.
+        self.contents = []
+        self.multipliers = []
+        self.last_seen = []
+        self.is_mineral_field = []
+
+    def refresh(self, bot, resources, patches):
+        # The last seen time of the base is its completion time, kept up to date by the bot while the base is in vision.
+        self.completed = self.position.last_update
+        mineral_fields = resources.mineral_fields(self.position)
+        vespene_geysers = resources.vespene_geysers(self.position)
+        self.max_workers_minerals = len(mineral_fields)*2
+        self.max_workers_vespene = len(vespene_geysers)*3
+
+        # TODO: What if we scout 1 worker of a fully saturated base, then our scout dies before seeing the rest?
+        # TODO: If we scout that they have less workers than we anticipated, lower the resource mined value retroactively.
+        known_workers = bot.known_enemy_units.closer_than(10, self.position).of_type(WORKERS)
+        if known_workers:
+            # Workers keep being produced from the time we last saw one.
+            self.known_workers = len(known_workers)
+            self.known_workers_time = max(worker.last_update for worker in known_workers)
+        elif self.start_location and not bot.known_enemy_units.amount_of(WORKERS):
+            self.known_workers = STARTING_WORKERS
+            self.known_workers_time = self.completed
+        else:
+            # We somehow saw an expansion but no workers, so assume this expansions is empty.
+            self.known_workers = 0
+            self.known_workers_time = self.completed
+
+        # Mineral fields we have seen before use their last known contents, the others are assumed to be mined since the base was completed.
+        self.contents = []
+        self.multipliers = []
+        self.last_seen = []
+        large_minerals = 0
+        small_minerals = 0
+        unseen_minerals = []
+        for mineral in mineral_fields:
+            patch = patches.get(mineral.position)
+            if patch is None:
+                unseen_minerals.append(mineral)
+                continue
+            self.contents.append(patch.contents)
+            self.multipliers.append(patch.multiplier)
+            self.last_seen.append(patch.last_seen)
+            if patch.is_small:
+                small_minerals += 1
+            else:
+                large_minerals += 1
+        for mineral in unseen_minerals:
+            # Assume the same number of large and small mineral fields.
+            if large_minerals < small_minerals:
+                self.contents.append(LARGE_MINERAL_CONTENTS)
+                large_minerals += 1
+            else:
+                self.contents.append(SMALL_MINERAL_CONTENTS)
+                small_minerals += 1
+            self.multipliers.append(RICH_MINERAL_MULTIPLIER if is_rich(mineral) else 1)
+            self.last_seen.append(self.completed)
+
+        for geyser in vespene_geysers:
+            patch = patches.get(geyser.position)
+            if patch is None:
+                # Assume gas is mined only after mineral saturation, following what most players do.
+                self.contents.append(VESPENE_CONTENTS)
+                self.multipliers.append(RICH_VESPENE_MULTIPLIER if is_rich(geyser) else 1)
+                self.last_seen.append(self.completed)
+            else:
+                self.contents.append(patch.contents)
+                self.multipliers.append(patch.multiplier)
+                self.last_seen.append(patch.last_seen)
+        self.is_mineral_field = [True]*len(mineral_fields) + [False]*len(vespene_geysers)
+
+
+class EnemyEconomy:
+    def __init__(self):
+        self.bases = {}
+        self.stale = set()
+        self.num_townhalls = None
+        self.patches = PatchTable()
+        self.arrays = None
+        # Minerals and gas mined per base, in the order of self.bases, for debugging.
+        self.base_minerals = np.zeros(0)
+        self.base_vespene = np.zeros(0)
+        # Starting resources; the initial base is deducted later.
+        self.minerals_mined = 50
+        self.vespene_mined = 0
+
+    def worker_changed(self, position):
+        # Call when a known enemy worker is added, removed or last seen, so the base it is at gets refreshed.
+        for base in self.bases:
+            if base.distance_to(position) < 10:
+                self.stale.add(base)
+
+    def update(self, bot, resources):
+        # Brings the estimate up to date. Only bases that were observed since the last update are refreshed.
+        time = bot.time
+        townhalls = bot.enemy_types(TOWNHALLS)
+        num_townhalls = max(len(townhalls), 1)
+        if num_townhalls != self.num_townhalls:
+            self.num_townhalls = num_townhalls
+            self.stale.update(self.bases)
+
+        enemy_bases = {}
+        for base in bot.enemy_expansions:
+            # Base positions that map to the same expansion are the same base.
+            expansion = resources.expansion_at(base)
+            if expansion in enemy_bases.values():
+                continue
+            enemy_bases[base] = expansion
+            if base not in self.bases:
+                # Initialize each base to have available resources equal to the snapshots of the known resources nearby.
+                # If we see that the resources have been mined out before we see the expansion location, it will count the resources incorrectly and think much less resources were mined.
+                self.bases[base] = BaseEconomy(base, len(resources.mineral_fields(base))*AVERAGE_MINERAL_CONTENTS,
+                                               len(resources.vespene_geysers(base))*VESPENE_CONTENTS,
+                                               expansion == resources.expansion_at(bot.enemy_start_locations[0]))
+                self.stale.add(base)
+            # Update our last seen time of the enemy base. If it is under construction, instead use the estimated completion time.
+            # If terran floats a CC into the expansion, it will only register the base as taken upon seeing the CC in the expansion (generally acceptable, as it may be a long while).
+            if bot.is_visible(base) and townhalls:
+                eta = (1 - townhalls.closest_to(base).build_progress)*TOWNHALL_BUILD_TIME
+                base.last_update = time + eta
+                self.stale.add(base)
+        # Resources in vision: update their last known contents, and refresh the enemy base they belong to.
+        enemy_base_at = {expansion: base for base, expansion in enemy_bases.items()}
+        for position, resource in resources.current.items():
+            if not resource.is_snapshot:
+                self.patches.see(resource, time)
+                base = enemy_base_at.get(resources.resource_expansion.get(position))
+                if base is not None:
+                    self.stale.add(base)
+        for base in list(self.bases):
+            if base not in enemy_bases:
+                del self.bases[base]
+                self.arrays = None
+
+        for base in self.stale:
+            if base in self.bases:
+                self.bases[base].refresh(bot, resources, self.patches)
+                self.arrays = None
+        self.stale.clear()
+        if self.arrays is None:
+            self.arrays = self.stack()
+
+        self.base_minerals, self.base_vespene = self.mined(time)
+        self.minerals_mined = 50 + self.base_minerals.sum()
+        self.vespene_mined = self.base_vespene.sum()
+        return self.minerals_mined, self.vespene_mined
+
+    def stack(self):
+        # Per base and per resource parameters of all bases as arrays. Resources refer to their base by index.
+        bases = list(self.bases.values())
+        arrays = {
+            'completed': np.array([base.completed for base in bases], dtype=float),
+            'known_workers': np.array([base.known_workers for base in bases], dtype=float),
+            'known_workers_time': np.array([base.known_workers_time for base in bases], dtype=float),
+            'max_workers_minerals': np.array([base.max_workers_minerals for base in bases], dtype=float),
+            'max_workers_vespene': np.array([base.max_workers_vespene for base in bases], dtype=float),
+            'minerals_available': np.array([base.minerals_available for base in bases], dtype=float),
+            'vespene_available': np.array([base.vespene_available for base in bases], dtype=float),
+            'base_index': np.array([index for index, base in enumerate(bases) for _ in base.contents], dtype=int),
+            'contents': np.array([contents for base in bases for contents in base.contents], dtype=float),
+            'multiplier': np.array([multiplier for base in bases for multiplier in base.multipliers], dtype=float),
+            'last_seen': np.array([last_seen for base in bases for last_seen in base.last_seen], dtype=float),
+            'is_mineral_field': np.array([is_mineral_field for base in bases for is_mineral_field in base.is_mineral_field], dtype=bool),
+        }
+        return arrays
+
+    def mined(self, time):
+        # Minerals and gas mined from each base by the given time, minus what was spent on the workers mining it.
+        # Assume constant worker production from all bases (includes macro hatches/orbitals) until saturation.
+        # Resources are mined at a rate proportional to the average workers on them (trapezoidal rule) until saturation, then at the full rate.
+        # TODO: Townhalls in progress do not yet contribute to worker production. If many bases are unsaturated, they should be filled evenly (currently n times too fast)
+        a = self.arrays
+        num_bases = len(a['completed'])
+        worker_rate = self.num_townhalls/WORKER_BUILD_TIME
+        max_workers_minerals = a['max_workers_minerals']
+        max_workers = max_workers_minerals + a['max_workers_vespene']
+        known_workers = a['known_workers']
+        workers = np.floor(np.minimum(known_workers + worker_rate*(time - a['known_workers_time']), max_workers))
+        saturated_mineral_time = a['known_workers_time'] + np.maximum(max_workers_minerals - known_workers, 0)/worker_rate
+        saturated_vespene_time = a['known_workers_time'] + np.maximum(max_workers - known_workers, 0)/worker_rate
+        average_workers_minerals = (np.minimum(known_workers, max_workers_minerals) + np.minimum(workers, max_workers_minerals))/2
+        average_workers_vespene = (np.minimum(np.maximum(known_workers - max_workers_minerals, 0), a['max_workers_vespene'])
+                                   + np.minimum(np.maximum(workers - max_workers_minerals, 0), a['max_workers_vespene']))/2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mineral_rate = np.where(max_workers_minerals > 0, MINERAL_MINING_RATE*average_workers_minerals/max_workers_minerals, 0)
+            vespene_rate = np.where(a['max_workers_vespene'] > 0, VESPENE_MINING_RATE*average_workers_vespene/a['max_workers_vespene'], 0)
+
+        # Per resource
+        base_index = a['base_index']
+        is_mineral_field = a['is_mineral_field']
+        saturated_time = np.where(is_mineral_field, saturated_mineral_time[base_index], saturated_vespene_time[base_index])
+        rate = np.where(is_mineral_field, mineral_rate[base_index], vespene_rate[base_index])
+        saturated_rate = np.where(is_mineral_field, MINERAL_MINING_RATE, VESPENE_MINING_RATE)
+        multiplier = a['multiplier']
+        mined = np.where(saturated_time > time,
+                         multiplier*(time - a['last_seen'])*rate,
+                         multiplier*(saturated_time - a['last_seen'])*rate + multiplier*(time - saturated_time)*saturated_rate)
+        mined -= a['contents']
+
+        minerals = a['minerals_available'] - (workers - known_workers)*WORKER_COST \
+            + np.bincount(base_index, weights=np.where(is_mineral_field, mined, 0), minlength=num_bases)
+        vespene = a['vespene_available'] + np.bincount(base_index, weights=np.where(is_mineral_field, 0, mined), minlength=num_bases)
+        # Ignore bases that aren't complete yet
+        complete = a['completed'] <= time
+        return np.where(complete, minerals, 0), np.where(complete, vespene, 0)
+
+    def breakdown(self):
+        # {base: (minerals mined, vespene mined)} as of the last update.
+        return {base: (minerals, vespene) for base, minerals, vespene in zip(self.bases, self.base_minerals, self.base_vespene)}
@@ -0,0 +1,73 @@
+"""
+Running totals of enemy spending and army value.
+
+Updated once per enemy unit or structure we see for the first time and once per known enemy unit that dies, using
+per-type seen counters and a cache of unit costs, instead of refiltering the enemy units for every new unit.
+As we aren't given any information on enemy upgrades, the cost of upgrades is ignored.
+"""
+from sc2.ids.unit_typeid import UnitTypeId
+
+
+WORKERS = {UnitTypeId.SCV, UnitTypeId.PROBE, UnitTypeId.DRONE}
+TOWNHALLS = {UnitTypeId.NEXUS, UnitTypeId.COMMANDCENTER, UnitTypeId.HATCHERY}
+# Units that do not count towards army value
+NON_ARMY = WORKERS | {UnitTypeId.OVERLORD}
+# First 12 workers, zerg's first overlord and the first townhall are free.
+FREE_WORKERS = 12
+FREE_OVERLORDS = 1
+FREE_TOWNHALLS = 1
+
+
+class EnemyLedger:
+    def __init__(self, bot):
+        self.bot = bot
+        self.costs = {}
+        self.seen = {}
+        self.minerals_spent = 0
+        self.vespene_spent = 0
+        # [minerals, vespene] of the known enemy army
+        self.army_value = [0, 0]
+
+    def cost(self, type_id):
+        cost = self.costs.get(type_id)
+        if cost is None:
+            cost = self.bot.calculate_unit_value(type_id)
+            self.costs[type_id] = cost
+        return cost
+
+    def seen_amount(self, type_ids):
+        return sum(self.seen.get(type_id, 0) for type_id in type_ids)
+
+    def count_seen(self, type_id):
+        self.seen[type_id] = self.seen.get(type_id, 0) + 1
+
+    def unit_seen(self, unit):
+        # Call once for each enemy unit when it is first seen.
+        type_id = unit.type_id
+        free = (type_id in WORKERS and self.seen_amount(WORKERS) < FREE_WORKERS) \
+            or (type_id == UnitTypeId.OVERLORD and self.seen.get(UnitTypeId.OVERLORD, 0) < FREE_OVERLORDS)
+        self.count_seen(type_id)
+        cost = self.cost(type_id)
+        if not free:
+            self.minerals_spent += cost.minerals
+            self.vespene_spent += cost.vespene
+        if type_id not in NON_ARMY:
+            self.army_value[0] += cost.minerals
+            self.army_value[1] += cost.vespene
+
+    def structure_seen(self, structure):
+        # Call once for each enemy structure when it is first seen.
+        type_id = structure.type_id
+        free = type_id in TOWNHALLS and self.seen_amount(TOWNHALLS) < FREE_TOWNHALLS
+        self.count_seen(type_id)
+        if not free:
+            cost = self.cost(type_id)
+            self.minerals_spent += cost.minerals
+            self.vespene_spent += cost.vespene
+
+    def unit_lost(self, unit):
+        # Call when a known enemy unit dies. Its cost stays spent, but it no longer counts towards their army.
+        if unit.type_id not in NON_ARMY:
+            cost = self.cost(unit.type_id)
+            self.army_value[0] -= cost.minerals
+            self.army_value[1] -= cost.vespene
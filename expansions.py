@@ -0,0 +1,126 @@
+"""
+Which expansions are ours, the enemy's or free.
+
+Expansions are ordered once per map by distance from our start location and from the enemy start location. Our bases
+are tracked from townhall construction and destruction events, enemy bases from the enemy townhalls in sight, so the
+ordered lists of free, not owned and enemy expansions are only rebuilt when a base changes hands instead of being
+re-sorted and re-scanned against every structure each step.
+"""
+import math
+from sc2.ids.unit_typeid import UnitTypeId
+from spatial import GridIndex
+
+
+TOWNHALLS = {UnitTypeId.NEXUS, UnitTypeId.COMMANDCENTER, UnitTypeId.COMMANDCENTERFLYING, UnitTypeId.ORBITALCOMMAND,
+             UnitTypeId.ORBITALCOMMANDFLYING, UnitTypeId.PLANETARYFORTRESS, UnitTypeId.HATCHERY, UnitTypeId.LAIR, UnitTypeId.HIVE}
+TOWNHALL_BUILD_TIME = 71
+# Townhalls own the expansion they are closer than this to, same as BotAI.owned_expansions
+OWN_EXPANSION_DISTANCE = 15
+# Enemy townhalls must be closer than this to an expansion to count as taking it
+ENEMY_EXPANSION_DISTANCE = 5
+
+
+class ExpansionManager:
+    def __init__(self, bot):
+        self.bot = bot
+        self.locations = list(bot.expansion_locations_list)
+        self.grid = GridIndex()
+        for location in self.locations:
+            self.grid.insert(location, location)
+        self.own_order = sorted(self.locations, key=lambda location: location.distance_to(bot.start_location))
+        self.enemy_order = sorted(self.locations, key=lambda location: location.distance_to(bot.enemy_start_locations[0]))
+        # Expansions we can't walk to from our main, skipped when looking for the next free expansion
+        self.unreachable = set()
+        # {expansion: townhall tag}
+        self.owned = {}
+        self.enemy = set()
+        self.lists = None
+        # The enemy main is taken from the start. Its last_update is the time the base was completed, used by the enemy economy.
+        self.enemy_main = self.expansion_near(bot.enemy_start_locations[0], OWN_EXPANSION_DISTANCE)
+        if self.enemy_main is not None:
+            self.enemy_main.last_update = 0
+            self.enemy.add(self.enemy_main)
+
+    async def measure_paths(self):
+        # Reorders the expansions by ground distance from both start locations, with one batched pathing query.
+        # Expansions without a path keep their straight line order behind the others.
+        bot = self.bot
+        start = bot._game_info.player_start_location
+        enemy_start = bot.enemy_start_locations[0]
+        queries = [[start, location] for location in self.locations] + [[enemy_start, location] for location in self.locations]
+        distances = await bot._client.query_pathings(queries)
+        own_distances = dict(zip(self.locations, distances[:len(self.locations)]))
+        enemy_distances = dict(zip(self.locations, distances[len(self.locations):]))
+        # Pathing returns 0 when no path is found
+        if any(own_distances.values()):
+            self.unreachable = {location for location in self.locations if not own_distances[location]}
+        self.own_order.sort(key=lambda location: own_distances[location] or math.inf)
+        self.enemy_order.sort(key=lambda location: enemy_distances[location] or math.inf)
+        self.lists = None
+
+    def expansion_near(self, position, distance):
+        return self.grid.closest(position, distance)
+
+    def townhall_started(self, townhall):
+        # Call when one of our townhalls starts construction (or exists on game start).
+        expansion = self.expansion_near(townhall.position, OWN_EXPANSION_DISTANCE)
+        if expansion is not None:
+            self.owned[expansion] = townhall.tag
+            self.lists = None
+
+    def townhall_lost(self, tag):
+        # Call when one of our structures is destroyed.
+        for expansion, townhall_tag in list(self.owned.items()):
+            if townhall_tag == tag:
+                del self.owned[expansion]
+                self.lists = None
+
+    def update(self):
+        # Marks expansions with enemy townhalls in sight (or their snapshots) as enemy bases, and drops enemy bases we
+        # see are empty. Only looks at enemy townhalls and enemy bases, not at every expansion and structure.
+        bot = self.bot
+        townhalls = bot.enemy_types(TOWNHALLS)
+        for townhall in townhalls:
+            expansion = self.expansion_near(townhall.position, ENEMY_EXPANSION_DISTANCE)
+            if expansion is not None and expansion not in self.enemy and expansion not in self.owned:
+                self.enemy.add(expansion)
+                # ETA = estimated completion time of base
+                expansion.last_update = bot.time + (1 - townhall.build_progress)*TOWNHALL_BUILD_TIME
+                self.lists = None
+        for expansion in list(self.enemy):
+            # The enemy main may be a bit further from its expansion location, so keep bases with any townhall nearby.
+            if bot.is_visible(expansion) and not townhalls.closer_than(OWN_EXPANSION_DISTANCE, expansion):
+                self.enemy.remove(expansion)
+                self.lists = None
+
+    def build_lists(self):
+        self.lists = {
+            'not_owned': [location for location in self.own_order if location not in self.owned],
+            'free': [location for location in self.own_order
+                     if location not in self.owned and location not in self.enemy and location not in self.unreachable],
+            'enemy': [location for location in self.enemy_order if location in self.enemy],
+        }
+        return self.lists
+
+    @property
+    def not_owned(self):
+        # Expansions we don't own, including enemy bases, closest to us first
+        return (self.lists or self.build_lists())['not_owned']
+
+    @property
+    def free(self):
+        # Expansions nobody is known to own, closest to us first
+        return (self.lists or self.build_lists())['free']
+
+    @property
+    def enemy_bases(self):
+        # Enemy bases, closest to the enemy main first
+        return (self.lists or self.build_lists())['enemy']
+
+    def next_free(self):
+        free = self.free
+        return free[0] if free else None
+
+    def next_enemy(self):
+        enemy_bases = self.enemy_bases
+        return enemy_bases[0] if enemy_bases else None
@@ -0,0 +1,98 @@
+"""
+Registry of units we have seen, indexed by tag.
+
+Used for the known enemy units and structures. Membership, lookup, insertion and removal are dict operations and unit
+counts per type are kept as units come and go, instead of scanning a Units list. Known units are snapshots that never
+move, so they are also kept in a GridIndex for closer_than. Anything else (of_type, closer_than, filter, indexing...)
+goes to a Units view of the registry, so code written against the old Units lists keeps working.
+"""
+from sc2.units import Units
+from spatial import GridIndex
+
+
+class KnownUnits:
+    def __init__(self, bot, units=()):
+        self.bot = bot
+        self.by_tag = {}
+        self.type_counts = {}
+        self.grid = GridIndex()
+        self.view = None
+        for unit in units:
+            self.add(unit)
+
+    def add(self, unit):
+        # Returns False if a unit with that tag is already known. Remove it first to store a newer snapshot of it.
+        if unit.tag in self.by_tag:
+            return False
+        self.by_tag[unit.tag] = unit
+        self.type_counts[unit.type_id] = self.type_counts.get(unit.type_id, 0) + 1
+        self.grid.insert(unit.tag, unit.position)
+        self.view = None
+        return True
+
+    def new(self, units):
+        # The units in a Units group that are not known yet, skipping snapshots.
+        return Units([unit for unit in units if unit.tag not in self.by_tag and not unit.is_snapshot], self.bot)
+
+    def add_new(self, units):
+        # Adds the units that are not known yet, skipping snapshots. Returns the added units.
+        new_units = self.new(units)
+        for unit in new_units:
+            self.add(unit)
+        return new_units
+
+    def remove(self, unit):
+        # Takes a unit or a tag. Returns the removed unit, or None if it was not known.
+        tag = getattr(unit, 'tag', unit)
+        known_unit = self.by_tag.pop(tag, None)
+        if known_unit is not None:
+            self.type_counts[known_unit.type_id] -= 1
+            self.grid.remove(tag)
+            self.view = None
+        return known_unit
+
+    def find_by_tag(self, tag):
+        return self.by_tag.get(tag)
+
+    def amount_of(self, type_ids):
+        # Number of known units of a type or set of types.
+        if isinstance(type_ids, (set, frozenset, list, tuple)):
+            return sum(self.type_counts.get(type_id, 0) for type_id in type_ids)
+        return self.type_counts.get(type_ids, 0)
+
+    def closer_than(self, distance, position):
+        # Same as Units.closer_than, but only looks at the grid cells around the position.
+        position = getattr(position, 'position', position)
+        return Units([self.by_tag[tag] for tag in self.grid.closer_than(distance, position)], self.bot)
+
+    @property
+    def units(self):
+        # Units view in insertion order, rebuilt only after the registry changed.
+        if self.view is None:
+            self.view = Units(self.by_tag.values(), self.bot)
+        return self.view
+
+    @property
+    def amount(self):
+        return len(self.by_tag)
+
+    def __len__(self):
+        return len(self.by_tag)
+
+    def __iter__(self):
+        return iter(self.by_tag.values())
+
+    def __contains__(self, unit):
+        return getattr(unit, 'tag', unit) in self.by_tag
+
+    def __getitem__(self, index):
+        return self.units[index]
+
+    def __call__(self, *args, **kwargs):
+        return self.units(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # Only called for attributes not defined above, e.g. of_type, closer_than, filter, random.
+        if name in ('bot', 'by_tag', 'type_counts', 'grid', 'view'):
+            raise AttributeError(name)
+        return getattr(self.units, name)
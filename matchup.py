@@ -0,0 +1,77 @@
+"""
+Batched matchup engine.
+
+Computes time to kill and time to reach for every attacker/target unit pair of two races in one pass,
+using the same model as TheUnseenz.calculate_effective_dps but on the stat columns of each race's StatTable.
+"""
+import numpy as np
+
+
+def bonus_mask(attackers, targets, weapon):
+    # [i][j] is True if attacker i gets its bonus damage with the given weapon ('air' or 'ground') against target j.
+    return (attackers.columns['bonus_attr_' + weapon][:, None] & targets.columns['attribute'][None, :]) != 0
+
+
+def time_to_kill_and_reach(attackers, targets, gas_value):
+    # Vectorized calculate_effective_dps between two StatTables: rows are attackers, columns are targets.
+    # Every expression keeps the operand order of the scalar version so results match it exactly.
+    # Pairs where a weapon cannot damage the target keep the initial value of infinity, as in the scalar version.
+    a = attackers.columns
+    t = targets.columns
+    shape = (len(attackers), len(targets))
+    col = lambda x: x[:, None]
+    row = lambda x: x[None, :]
+
+    time_to_kill = {}
+    time_to_reach = {}
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for weapon, target_mask in (('air', t['is_air']), ('ground', t['is_ground'])):
+            bonus = bonus_mask(attackers, targets, weapon).astype(int)
+            attacks = col(a['attacks_' + weapon])
+            attack_speed = col(a['attack_speed_' + weapon])
+            dmg = col(a['dmg_' + weapon]) + col(a['bonus_dmg_' + weapon])*bonus
+            damage_done = dmg - row(t['armor'])
+            hits = row(target_mask) & (damage_done > 0)
+
+            # Time_to_kill = Total hp+shield/(damage done per attacks per attack speed). Does NOT consider overkill damage.
+            kill = (row(t['hp'])/((attacks*(dmg - row(t['armor'])))/attack_speed)
+                    + row(t['shields'])/((attacks*(dmg - row(t['shield_armor'])))/attack_speed))
+
+            # Range-kiting speed disadvantage. The target shoots back with its anti-air weapon at air attackers
+            # and with its anti-ground weapon at ground attackers.
+            attacker_air = col(a['is_air'])
+            enemy_range = np.where(attacker_air, row(t['range_air']), row(t['range_ground']))
+            enemy_attack_speed = np.where(attacker_air, row(t['attack_speed_air']), row(t['attack_speed_ground']))
+            enemy_attack_point = np.where(attacker_air, row(t['attack_point_air']), row(t['attack_point_ground']))
+            own_range = col(a['range_' + weapon])
+            kiting_speed = row(t['movement_speed'])*((enemy_attack_speed - enemy_attack_point)/enemy_attack_speed)
+            catch_up = (enemy_range - own_range)/(col(a['movement_speed']) - kiting_speed)
+            reach = np.where(enemy_range > own_range,
+                             np.where(col(a['movement_speed']) > kiting_speed, catch_up, np.inf),
+                             0)
+
+            # Splash damage modifier
+            splash = np.maximum(0.8*(col(a['splash_area_' + weapon])/(np.pi*(row(t['size'])/2)**2)), 1)
+            kill = kill/splash
+
+            time_to_kill[weapon] = np.where(hits, kill, np.inf)
+            time_to_reach[weapon] = np.where(hits, reach, np.inf)
+
+        # Cost difference modifier
+        cost_ratio = ((col(a['minerals']) + gas_value*col(a['vespene']))/(row(t['minerals']) + gas_value*row(t['vespene'])))
+        for weapon in time_to_kill:
+            time_to_kill[weapon] = time_to_kill[weapon]*cost_ratio
+
+        # Choose the better weapon
+        use_air = (time_to_kill['air'] + time_to_reach['air']) < (time_to_kill['ground'] + time_to_reach['ground'])
+    return (np.where(use_air, time_to_kill['air'], time_to_kill['ground']).reshape(shape),
+            np.where(use_air, time_to_reach['air'], time_to_reach['ground']).reshape(shape))
+
+
+def calculate_matchups(own_army_race, enemy_army_race, gas_value):
+    # Returns own_time_to_kill, own_time_to_reach, enemy_time_to_kill, enemy_time_to_reach.
+    # All four are indexed [own unit id][enemy unit id], like the matrices built by the per-pair loop.
+    own_time_to_kill, own_time_to_reach = time_to_kill_and_reach(own_army_race, enemy_army_race, gas_value)
+    enemy_time_to_kill, enemy_time_to_reach = time_to_kill_and_reach(enemy_army_race, own_army_race, gas_value)
+    return (own_time_to_kill, own_time_to_reach,
+            np.ascontiguousarray(enemy_time_to_kill.T), np.ascontiguousarray(enemy_time_to_reach.T))
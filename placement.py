@@ -0,0 +1,300 @@
+"""
+Building and warp-in placements, found locally and kept until they stop being valid.
+
+The placement grid of the map is copied once, and the cells under every structure, mineral field and geyser are counted
+in an occupancy grid that is updated from structure events (construction started, destroyed), so checking whether a
+footprint is free is a numpy slice instead of a query to the game. Warp-ins are checked against the pathing grid.
+Protoss power is a bitmap at half-cell resolution, since footprint centers are on cell centers or corners, redrawn when
+a pylon is completed or destroyed.
+
+To search, a summed-area table of the blocked cells gives the number of blocked cells under every 2x2, 3x3 or 5x5
+footprint of the map with four lookups each, so every footprint is checked at once. The tables are kept until the game
+loop or the occupancy grid changes. Candidates are the free and powered positions on the same lattice as
+BotAI.find_placement (anchor plus multiples of placement_step), in the closest ring that has any, closest first.
+
+Each placement is wanted by name every step. It is kept while its footprint is still free and it is wanted for the same
+reason (key), so nothing is asked of the game. Otherwise it is searched, and the closest few candidates are left for the
+game to confirm. resolve() sends the candidates of all placements that changed in a single building placement query,
+since the game also knows about what we can't see (units in the way, enemy structures out of vision). Candidates the
+game rejects are not free for REJECTED_TIME, or until a structure is destroyed, so the search moves on to other
+positions and eventually to other anchors instead of asking about the same ones every step.
+"""
+import math
+import numpy as np
+from s2clientprotocol import common_pb2 as common_pb, query_pb2 as query_pb
+from sc2.data import ActionResult
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+
+
+# Radius of a pylon's power field
+POWER_RADIUS = 6.5
+# Structures that don't need power
+UNPOWERED = {UnitTypeId.NEXUS, UnitTypeId.PYLON, UnitTypeId.ASSIMILATOR, UnitTypeId.ASSIMILATORRICH}
+# Candidates per placement that are sent to the game for confirmation
+CANDIDATES = 4
+# Game loops (a minute) for which a position the game rejected is not free
+REJECTED_TIME = 60*22.4
+
+
+def footprint_size(radius):
+    # Side of the square footprint of a structure from its unit radius (pylon 1.125, gateway 1.8125, nexus 2.75)
+    if radius < 0.75:
+        return 1
+    if radius < 1.4:
+        return 2
+    if radius < 2.4:
+        return 3
+    return 5
+
+
+def snap(position, size):
+    # Center of the footprint of this size closest to position. Odd footprints are centered on cells, even ones on corners.
+    offset = 0.5 if size % 2 else 0
+    return Point2((math.floor(position[0] - offset + 0.5) + offset, math.floor(position[1] - offset + 0.5) + offset))
+
+
+class Placement:
+    __slots__ = ('unit_type', 'position', 'key', 'candidates')
+
+    def __init__(self, unit_type, key):
+        self.unit_type = unit_type
+        self.position = None
+        self.key = key
+        # Locally valid positions waiting for the game to confirm one, closest to the anchor first
+        self.candidates = None
+
+
+class PlacementCache:
+    def __init__(self, bot):
+        self.bot = bot
+        placement_grid = bot.game_info.placement_grid.data_numpy
+        self.height, self.width = placement_grid.shape
+        # Both grids are indexed [y, x]
+        self.buildable = placement_grid != 0
+        self.occupied = np.zeros(placement_grid.shape, dtype=np.int16)
+        # Changes with the occupancy grid, so the free footprint tables can be reused until it changes
+        self.version = 0
+        self.free_tables = {}
+        self.free_tables_stamp = None
+        # {tag: (x0, y0, x1, y1)} cells counted in the occupancy grid for each structure
+        self.footprints = {}
+        # {tag: position} of ready pylons
+        self.pylons = {}
+        # power[2*y, 2*x]: whether a footprint centered on (x, y) is powered
+        self.power = np.zeros((2*self.height + 1, 2*self.width + 1), dtype=bool)
+        # {name: Placement}
+        self.placements = {}
+        # {(unit_type, position): game loop} of candidates the game rejected
+        self.rejected = {}
+        for field in bot.mineral_field:
+            self.structure_added(field)
+        for unit in bot.vespene_geyser | bot.structures | bot.enemy_structures:
+            self.structure_added(unit)
+        for pylon in bot.structures(UnitTypeId.PYLON).ready:
+            self.pylon_completed(pylon)
+
+    def __getitem__(self, name):
+        placement = self.placements.get(name)
+        return placement.position if placement else None
+
+    def size(self, unit_type):
+        if isinstance(unit_type, AbilityId):
+            # Warp-ins
+            return 1
+        return max(int(round(self.bot._game_data.units[unit_type.value].footprint_radius*2)), 1)
+
+    def ability_id(self, unit_type):
+        if isinstance(unit_type, AbilityId):
+            return unit_type.value
+        return self.bot._game_data.units[unit_type.value].creation_ability.id.value
+
+    def cells(self, position, size):
+        x0 = int(round(position[0] - size/2))
+        y0 = int(round(position[1] - size/2))
+        return x0, y0, x0 + size, y0 + size
+
+    # Structure events
+
+    def structure_added(self, unit):
+        if unit.tag in self.footprints:
+            return
+        if unit.is_mineral_field:
+            # Mineral fields are 2x1
+            x0 = int(round(unit.position.x - 1))
+            y0 = int(round(unit.position.y - 0.5))
+            cells = (x0, y0, x0 + 2, y0 + 1)
+        else:
+            cells = self.cells(unit.position, footprint_size(unit.radius))
+        x0, y0, x1, y1 = cells
+        self.occupied[max(y0, 0):y1, max(x0, 0):x1] += 1
+        self.footprints[unit.tag] = cells
+        self.version += 1
+
+    def structure_removed(self, tag):
+        cells = self.footprints.pop(tag, None)
+        if cells is not None:
+            x0, y0, x1, y1 = cells
+            self.occupied[max(y0, 0):y1, max(x0, 0):x1] -= 1
+            self.version += 1
+            # It may have been what the game rejected them for
+            self.rejected = {}
+        if self.pylons.pop(tag, None) is not None:
+            self.update_power()
+
+    def pylon_completed(self, unit):
+        self.pylons[unit.tag] = unit.position
+        self.update_power()
+
+    def update_power(self):
+        power = np.zeros(self.power.shape, dtype=bool)
+        reach = int(POWER_RADIUS*2) + 1
+        for x, y in self.pylons.values():
+            column, row = int(round(2*x)), int(round(2*y))
+            x0, x1 = max(column - reach, 0), min(column + reach + 1, power.shape[1])
+            y0, y1 = max(row - reach, 0), min(row + reach + 1, power.shape[0])
+            xs = np.arange(x0, x1)[np.newaxis, :]/2 - x
+            ys = np.arange(y0, y1)[:, np.newaxis]/2 - y
+            power[y0:y1, x0:x1] |= xs*xs + ys*ys <= POWER_RADIUS**2
+        self.power = power
+
+    # Local checks
+
+    def powered(self, position):
+        column, row = int(round(2*position[0])), int(round(2*position[1]))
+        return 0 <= row < self.power.shape[0] and 0 <= column < self.power.shape[1] and bool(self.power[row, column])
+
+    def free_table(self, size, warp_in=False):
+        # free[y0, x0]: whether the size x size footprint with (x0, y0) as its lowest cell has no blocked cell, from a
+        # summed-area table of the blocked cells. Kept until the game loop (creep, pathing) or the occupancy grid changes.
+        stamp = (self.bot.state.game_loop, self.version)
+        if stamp != self.free_tables_stamp:
+            self.free_tables = {}
+            self.free_tables_stamp = stamp
+        free = self.free_tables.get((size, warp_in))
+        if free is None:
+            if warp_in:
+                blocked = (self.bot.game_info.pathing_grid.data_numpy == 0) | (self.occupied != 0)
+            else:
+                blocked = ~self.buildable | (self.occupied != 0) | (self.bot.state.creep.data_numpy != 0)
+            table = np.zeros((self.height + 1, self.width + 1), dtype=np.int32)
+            table[1:, 1:] = blocked.cumsum(axis=0).cumsum(axis=1)
+            free = (table[size:, size:] - table[:-size, size:] - table[size:, :-size] + table[:-size, :-size]) == 0
+            self.free_tables[(size, warp_in)] = free
+        return free
+
+    def is_free(self, unit_type, position):
+        # Whether unit_type can be placed at position as far as we know, without asking the game.
+        # position must be a footprint center (see snap), like the wall positions of the main base ramp.
+        size = self.size(unit_type)
+        x0, y0, x1, y1 = self.cells(position, size)
+        if x0 < 0 or y0 < 0 or x1 > self.width or y1 > self.height:
+            return False
+        if self.occupied[y0:y1, x0:x1].any():
+            return False
+        if isinstance(unit_type, AbilityId):
+            if not self.bot.game_info.pathing_grid.data_numpy[y0:y1, x0:x1].all():
+                return False
+        elif not self.buildable[y0:y1, x0:x1].all() or self.bot.state.creep.data_numpy[y0:y1, x0:x1].any():
+            return False
+        if self.is_rejected(unit_type, position):
+            return False
+        return unit_type in UNPOWERED or self.powered(position)
+
+    def is_rejected(self, unit_type, position):
+        rejected_loop = self.rejected.get((unit_type, position))
+        return rejected_loop is not None and self.bot.state.game_loop - rejected_loop < REJECTED_TIME
+
+    def search(self, unit_type, near, step, max_distance):
+        # Locally valid positions around near, the closest ring that has any, like BotAI.find_placement
+        size = self.size(unit_type)
+        near = snap(near, size)
+        if self.is_free(unit_type, near):
+            return [near]
+        rings = len(range(step, max_distance, step))
+        if not rings:
+            return []
+        # Lattice of offsets around near, rings[j, i] is the ring of near + (offsets[i], offsets[j])
+        steps = np.arange(-rings, rings + 1)
+        offsets = steps*step
+        ring = np.maximum(np.abs(steps)[np.newaxis, :], np.abs(steps)[:, np.newaxis])
+        x0 = int(round(near.x - size/2)) + offsets
+        y0 = int(round(near.y - size/2)) + offsets
+        free = self.free_table(size, isinstance(unit_type, AbilityId))
+        inside_x = (x0 >= 0) & (x0 < free.shape[1])
+        inside_y = (y0 >= 0) & (y0 < free.shape[0])
+        valid = np.zeros(ring.shape, dtype=bool)
+        valid[np.ix_(inside_y, inside_x)] = free[np.ix_(y0[inside_y], x0[inside_x])]
+        if unit_type not in UNPOWERED:
+            columns = np.clip(np.rint(2*(near.x + offsets)).astype(int), 0, self.power.shape[1] - 1)
+            rows = np.clip(np.rint(2*(near.y + offsets)).astype(int), 0, self.power.shape[0] - 1)
+            valid &= self.power[np.ix_(rows, columns)]
+        valid[ring == 0] = False
+        for rejected_type, position in self.rejected:
+            if rejected_type == unit_type and self.is_rejected(unit_type, position):
+                column, row = (position[0] - near.x)/step + rings, (position[1] - near.y)/step + rings
+                if column.is_integer() and row.is_integer() and 0 <= column < len(steps) and 0 <= row < len(steps):
+                    valid[int(row), int(column)] = False
+        if not valid.any():
+            return []
+        closest_ring = ring[valid].min()
+        rows, columns = np.nonzero(valid & (ring == closest_ring))
+        closest = np.argsort(offsets[rows]**2 + offsets[columns]**2, kind='stable')[:CANDIDATES]
+        return [Point2((near.x + dx, near.y + dy)) for dx, dy in zip(offsets[columns[closest]].tolist(), offsets[rows[closest]].tolist())]
+
+    # Placements
+
+    def want(self, name, unit_type, near, placement_step=2, max_distance=20, key=None):
+        # Keeps the placement called name if it is still free and wanted with the same key. Otherwise searches around
+        # near, which can be a function so that random anchors are only picked when searching. The candidates found
+        # are confirmed by resolve(). Returns False if there is no free position around near, and then the placement
+        # is left as it was, so it can be wanted near another anchor.
+        placement = self.placements.get(name)
+        if placement is None or placement.unit_type != unit_type:
+            placement = self.placements[name] = Placement(unit_type, key)
+        elif placement.key == key and placement.position is not None and self.is_free(unit_type, placement.position):
+            placement.candidates = None
+            return True
+        if callable(near):
+            near = near()
+        placement.candidates = self.search(unit_type, near, placement_step, max_distance)
+        if not placement.candidates:
+            return False
+        placement.key = key
+        return True
+
+    def forget(self, name):
+        # The placement is searched again the next time it is wanted, e.g. after warping in at it.
+        placement = self.placements.get(name)
+        if placement is not None:
+            placement.position = None
+
+    async def resolve(self):
+        # Asks the game about the candidates of every placement that was searched this step, in one query. Each
+        # placement takes its closest confirmed candidate. If none is confirmed, it keeps its previous position and
+        # is searched again next step, without the rejected candidates.
+        pending = [placement for placement in self.placements.values() if placement.candidates]
+        if not pending:
+            return
+        requests = []
+        for placement in pending:
+            ability_id = self.ability_id(placement.unit_type)
+            for position in placement.candidates:
+                requests.append(query_pb.RequestQueryBuildingPlacement(ability_id=ability_id, target_pos=common_pb.Point2D(x=position.x, y=position.y)))
+        result = await self.bot._client._execute(query=query_pb.RequestQuery(placements=requests, ignore_resource_requirements=True))
+        results = iter(result.query.placements)
+        game_loop = self.bot.state.game_loop
+        for placement in pending:
+            confirmed = []
+            for position in placement.candidates:
+                if ActionResult(next(results).result) == ActionResult.Success:
+                    confirmed.append(position)
+                else:
+                    self.rejected[(placement.unit_type, position)] = game_loop
+            if confirmed:
+                placement.position = confirmed[0]
+            else:
+                # Searched again next step
+                placement.key = None
+            placement.candidates = None
@@ -0,0 +1,150 @@
+"""
+Wall time spent in each part of a game step.
+
+Each named section gets a histogram with fixed bucket bounds, so recording a call is a bisect and an increment no matter
+how long the game runs, and p50/p95/p99 are read off the bucket counts (as the upper bound of the bucket the percentile
+falls in). Sections are timed with profiler.section(name) as a context manager, the timed(name) method decorator, or
+record() for durations measured elsewhere (the scheduler times its tasks already). When the profiler is disabled,
+section() hands back a shared no-op context manager and timed methods go straight to the wrapped function, so the
+instrumentation can stay in ladder builds. Results are written as CSV and JSON with export(), at the end of the game.
+"""
+import bisect
+import csv
+import functools
+import inspect
+import json
+import math
+import time
+
+
+# Bucket upper bounds in milliseconds. Calls slower than the last bound go in an overflow bucket.
+BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+PERCENTILES = (50, 95, 99)
+FIELDS = ['section', 'calls', 'total_ms', 'mean_ms', 'max_ms'] + ['p%d_ms' % p for p in PERCENTILES]
+
+
+class Histogram:
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.counts = [0]*(len(bounds) + 1)
+        self.calls = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, milliseconds):
+        self.counts[bisect.bisect_left(self.bounds, milliseconds)] += 1
+        self.calls += 1
+        self.total += milliseconds
+        if milliseconds > self.max:
+            self.max = milliseconds
+
+    def percentile(self, percent):
+        # Upper bound of the bucket holding the call at this percentile. The overflow bucket has no bound, so use the slowest call.
+        if not self.calls:
+            return 0
+        rank = max(math.ceil(percent/100*self.calls), 1)
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bounds[bucket], self.max) if bucket < len(self.bounds) else self.max
+        return self.max
+
+    def row(self, name):
+        row = {'section': name, 'calls': self.calls, 'total_ms': self.total, 'mean_ms': self.total/self.calls if self.calls else 0,
+               'max_ms': self.max}
+        for percent in PERCENTILES:
+            row['p%d_ms' % percent] = self.percentile(percent)
+        return row
+
+
+class Section:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.add((time.perf_counter() - self.start)*1000)
+        return False
+
+
+class NullSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SECTION = NullSection()
+
+
+class Profiler:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.histograms = {}
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def section(self, name):
+        # with profiler.section('micro'): ...
+        if not self.enabled:
+            return NULL_SECTION
+        return Section(self.histogram(name))
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self.histogram(name).add(seconds*1000)
+
+    def rows(self):
+        # Slowest sections (by total time) first
+        rows = [histogram.row(name) for name, histogram in self.histograms.items()]
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows
+
+    def export(self, path):
+        # Writes path.csv with one row per section and path.json with the same rows plus the bucket counts.
+        if not self.histograms:
+            return
+        rows = self.rows()
+        with open(path + '.csv', 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        for row in rows:
+            row['buckets'] = dict(zip([str(bound) for bound in BUCKETS] + ['inf'], self.histograms[row['section']].counts))
+        with open(path + '.json', 'w') as file:
+            json.dump({'bucket_bounds_ms': BUCKETS, 'sections': rows}, file, indent=2)
+
+
+def timed(name):
+    # Method decorator, times each call in the profiler of the object it is called on (self.profiler).
+    def decorator(function):
+        if inspect.iscoroutinefunction(function):
+            async def wrapper(self, *args, **kwargs):
+                profiler = self.profiler
+                if not profiler.enabled:
+                    return await function(self, *args, **kwargs)
+                with profiler.section(name):
+                    return await function(self, *args, **kwargs)
+        else:
+            def wrapper(self, *args, **kwargs):
+                profiler = self.profiler
+                if not profiler.enabled:
+                    return function(self, *args, **kwargs)
+                with profiler.section(name):
+                    return function(self, *args, **kwargs)
+        return functools.wraps(function)(wrapper)
+    return decorator
@@ -0,0 +1,78 @@
+"""
+Runs the parts of a game step as separate tasks within a wall-clock budget.
+
+Each task has a priority, an interval (in steps) and a time budget (in seconds). Tasks run in the order they were
+added, so later tasks can use what earlier ones computed. Priority 0 tasks run whenever they are due. Other tasks only
+run if their budget still fits in what is left of the step's budget, otherwise they are deferred to the next step,
+but never more than max_deferrals steps in a row so that nothing goes stale for long.
+A task can return False to skip the rest of the step.
+If a profiler is given, each task's run time and the whole step are recorded in it (see profiler.py).
+"""
+import time
+
+
+class Task:
+    def __init__(self, name, function, priority, interval, budget, max_deferrals):
+        self.name = name
+        self.function = function
+        self.priority = priority
+        self.interval = interval
+        self.budget = budget
+        self.max_deferrals = max_deferrals
+        self.last_iteration = None
+        self.deferrals = 0
+        # Statistics
+        self.runs = 0
+        self.total_deferrals = 0
+        self.overruns = 0
+        self.last_duration = 0
+
+    def due(self, iteration):
+        return self.last_iteration is None or iteration - self.last_iteration >= self.interval
+
+
+class Scheduler:
+    def __init__(self, step_budget, profiler=None):
+        self.step_budget = step_budget
+        self.profiler = profiler
+        self.tasks = []
+        self.last_step_duration = 0
+
+    def add(self, name, function, priority=0, interval=1, budget=0, max_deferrals=8):
+        # function is a coroutine function taking the iteration.
+        task = Task(name, function, priority, interval, budget, max_deferrals)
+        self.tasks.append(task)
+        return task
+
+    async def run(self, iteration):
+        step_start = time.perf_counter()
+        for task in self.tasks:
+            if not task.due(iteration):
+                continue
+            elapsed = time.perf_counter() - step_start
+            if task.priority > 0 and elapsed + task.budget > self.step_budget and task.deferrals < task.max_deferrals:
+                task.deferrals += 1
+                task.total_deferrals += 1
+                continue
+            task_start = time.perf_counter()
+            result = await task.function(iteration)
+            task.last_duration = time.perf_counter() - task_start
+            if self.profiler is not None:
+                self.profiler.record(task.name, task.last_duration)
+            # Priority 0 tasks have no budget of their own
+            if task.budget > 0 and task.last_duration > task.budget:
+                task.overruns += 1
+            task.last_iteration = iteration
+            task.deferrals = 0
+            task.runs += 1
+            if result is False:
+                break
+        self.last_step_duration = time.perf_counter() - step_start
+        if self.profiler is not None:
+            self.profiler.record('step', self.last_step_duration)
+
+    def summary(self):
+        # One line per task, for the debug output. Tasks without a budget have no overruns to report.
+        return ["%s: runs %d deferred %d %slast %.1fms" % (task.name, task.runs, task.total_deferrals,
+                                                            "over budget %d " % task.overruns if task.budget > 0 else "", task.last_duration*1000)
+                for task in self.tasks]
@@ -0,0 +1,199 @@
+"""
+Spatial lookups that avoid scanning every unit.
+
+GridIndex buckets positions into square cells, so "closer than" queries only look at the units in the cells around a
+point. ExpansionResources maps every expansion to the positions of its mineral fields and vespene geysers once per
+game, since resources never move. NearestUnits answers "closest unit" for many positions at once with a KD-tree, for
+when every unit of a group needs its closest target. DistanceService computes the distance matrix between two groups
+of units once per step and answers every distance query on those groups from it.
+"""
+import math
+import numpy as np
+from scipy.spatial import cKDTree
+from sc2.units import Units
+
+
+class GridIndex:
+    def __init__(self, cell_size=10):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.positions = {}
+
+    def cell(self, position):
+        return (math.floor(position[0]/self.cell_size), math.floor(position[1]/self.cell_size))
+
+    def insert(self, key, position):
+        # Key can be anything hashable, e.g. a unit tag. Inserting a key again moves it.
+        if key in self.positions:
+            self.remove(key)
+        self.positions[key] = position
+        self.cells.setdefault(self.cell(position), set()).add(key)
+
+    def remove(self, key):
+        position = self.positions.pop(key, None)
+        if position is not None:
+            cell = self.cells[self.cell(position)]
+            cell.discard(key)
+            if not cell:
+                del self.cells[self.cell(position)]
+
+    def closer_than(self, distance, position):
+        # Keys whose position is strictly closer than distance, like Units.closer_than.
+        x, y = position[0], position[1]
+        min_cell = self.cell((x - distance, y - distance))
+        max_cell = self.cell((x + distance, y + distance))
+        distance_squared = distance**2
+        keys = []
+        for cell_x in range(min_cell[0], max_cell[0] + 1):
+            for cell_y in range(min_cell[1], max_cell[1] + 1):
+                for key in self.cells.get((cell_x, cell_y), ()):
+                    key_position = self.positions[key]
+                    if (key_position[0] - x)**2 + (key_position[1] - y)**2 < distance_squared:
+                        keys.append(key)
+        return keys
+
+    def closest(self, position, max_distance):
+        # Closest key within max_distance, or None.
+        keys = self.closer_than(max_distance, position)
+        if not keys:
+            return None
+        x, y = position[0], position[1]
+        return min(keys, key=lambda key: (self.positions[key][0] - x)**2 + (self.positions[key][1] - y)**2)
+
+    def __len__(self):
+        return len(self.positions)
+
+
+class ExpansionResources:
+    # Resources of every expansion, built once from expansion_locations_dict.
+    # Call update once per step with the current mineral fields and geysers, then look up resources of any base position.
+    def __init__(self, bot, expansion_locations_dict):
+        self.bot = bot
+        self.minerals = {}
+        self.geysers = {}
+        self.expansions = GridIndex()
+        # Expansion each resource position belongs to
+        self.resource_expansion = {}
+        for expansion, resources in expansion_locations_dict.items():
+            self.minerals[expansion] = [resource.position for resource in resources if resource.is_mineral_field]
+            self.geysers[expansion] = [resource.position for resource in resources if resource.is_vespene_geyser]
+            for resource in resources:
+                self.resource_expansion[resource.position] = expansion
+            self.expansions.insert(expansion, expansion)
+        # Base positions that are not exactly an expansion location, e.g. start locations, mapped to the nearest expansion
+        self.base_expansion = {}
+        self.current = {}
+
+    def update(self, mineral_field, vespene_geyser):
+        # Mined out mineral fields disappear, so only resources that still exist are returned.
+        self.current = {resource.position: resource for resource in mineral_field}
+        self.current.update((resource.position, resource) for resource in vespene_geyser)
+
+    def expansion_at(self, base):
+        if base in self.minerals:
+            return base
+        if base not in self.base_expansion:
+            self.base_expansion[base] = self.expansions.closest(base, 10)
+        return self.base_expansion[base]
+
+    def resources(self, positions):
+        return Units([self.current[position] for position in positions if position in self.current], self.bot)
+
+    def mineral_fields(self, base):
+        return self.resources(self.minerals.get(self.expansion_at(base), ()))
+
+    def vespene_geysers(self, base):
+        return self.resources(self.geysers.get(self.expansion_at(base), ()))
+
+
+class NearestUnits:
+    # KD-tree over the positions of a group of units, built once per step. Query with the positions of all the units
+    # that need a target at once instead of calling closest_to for each of them.
+    def __init__(self, units):
+        self.units = list(units)
+        self.tree = cKDTree(np.array([unit.position_tuple for unit in self.units])) if self.units else None
+
+    def closest(self, positions, k=1):
+        # The closest unit to each position, or the list of the k closest units (closest first) if k > 1.
+        if self.tree is None:
+            return [None if k == 1 else [] for _ in positions]
+        points = np.array([getattr(position, 'position_tuple', position) for position in positions], dtype=float).reshape(-1, 2)
+        distances, indices = self.tree.query(points, k=k)
+        if k == 1:
+            return [self.units[index] for index in indices]
+        # With fewer than k units, the missing neighbours have index len(units).
+        return [[self.units[index] for index in row if index < len(self.units)] for row in indices]
+
+    def __len__(self):
+        return len(self.units)
+
+
+class DistanceService:
+    # Squared distance matrices between groups of units, cached for the current game step by the identity of the groups.
+    # Bind a group to a variable once per step (e.g. townhalls = self.townhalls.ready) and pass that same object,
+    # since filtering a Units again creates a new group.
+    def __init__(self, bot):
+        self.bot = bot
+        self.game_loop = None
+        # {id: (units, positions)}. Keeping the units alive keeps their id from being reused within the step.
+        self.groups = {}
+        self.matrices = {}
+        # {id: (units, {tag: position in the group})}
+        self.indices = {}
+
+    def refresh(self):
+        if self.bot.state.game_loop != self.game_loop:
+            self.game_loop = self.bot.state.game_loop
+            self.groups.clear()
+            self.matrices.clear()
+            self.indices.clear()
+
+    def positions(self, units):
+        self.refresh()
+        group = self.groups.get(id(units))
+        if group is None:
+            group = (units, np.array([unit.position_tuple for unit in units], dtype=float).reshape(-1, 2))
+            self.groups[id(units)] = group
+        return group[1]
+
+    def index(self, units, unit):
+        # Position of a unit in its group
+        self.refresh()
+        group = self.indices.get(id(units))
+        if group is None:
+            group = (units, {member.tag: i for i, member in enumerate(units)})
+            self.indices[id(units)] = group
+        return group[1][unit.tag]
+
+    def squared(self, units_a, units_b):
+        # Matrix of squared distances, rows are units_a and columns are units_b.
+        positions_a = self.positions(units_a)
+        positions_b = self.positions(units_b)
+        key = (id(units_a), id(units_b))
+        matrix = self.matrices.get(key)
+        if matrix is None:
+            difference = positions_a[:, np.newaxis, :] - positions_b[np.newaxis, :, :]
+            matrix = np.einsum('ijk,ijk->ij', difference, difference)
+            self.matrices[key] = matrix
+        return matrix
+
+    def squared_to(self, units, point):
+        # Squared distances from every unit of the group to a point.
+        positions = self.positions(units)
+        key = (id(units), (point[0], point[1]))
+        distances = self.matrices.get(key)
+        if distances is None:
+            difference = positions - np.array([point[0], point[1]], dtype=float)
+            distances = np.einsum('ij,ij->i', difference, difference)
+            self.matrices[key] = distances
+        return distances
+
+    def closest_to(self, units, unit, group):
+        # Same as units.closest_to(unit), where unit is a member of group.
+        column = self.squared(units, group)[:, self.index(group, unit)]
+        return units[int(np.argmin(column))]
+
+    def closer_than(self, units, distance, unit, group):
+        # Same as units.closer_than(distance, unit), where unit is a member of group.
+        column = self.squared(units, group)[:, self.index(group, unit)]
+        return Units([units[i] for i in np.flatnonzero(column < distance**2)], self.bot)
@@ -38,6 +38,19 @@ from sc2 import Race, Difficulty
 from sc2.constants import *
 from sc2.player import Bot, Computer, Human
 from unit_list import unit_list
+from known_units import KnownUnits
+from spatial import ExpansionResources, NearestUnits, DistanceService
+from type_index import TypeIndex
+from expansions import ExpansionManager
+from enemy_ledger import EnemyLedger
+from economy import EnemyEconomy
+from matchup import calculate_matchups
+from threat import threat_level, threat_levels, ThreatModel, ThreatCache
+from scheduler import Scheduler
+from profiler import Profiler, timed
+from workers import HarvesterRegistry, WorkerAllocator
+from placement import PlacementCache
+from abilities import AbilityCache
 
 
 
@@ -75,6 +88,20 @@ class TheUnseenz(sc2.BotAI):
         self.have_detection = False
         self.need_utility = False
         
+        self.expansions = None
+        # Building and warp-in placements, checked on our own copy of the placement grid
+        self.placements = None
+        # Distance matrices between unit groups, shared by everything that runs in the same step
+        self.distances = DistanceService(self)
+        # Workers of every mineral field and gas building, kept across steps
+        self.harvesters = HarvesterRegistry()
+        # Moves idle and surplus workers where harvesters are missing
+        self.worker_allocator = WorkerAllocator(self, self.harvesters)
+        # Our units and structures and the enemy's by type, e.g. self.own(PYLON), self.own.ready(GATEWAY), self.enemy_types(SCV)
+        self.own = TypeIndex(self, lambda: (self.units, self.structures))
+        self.enemy_types = TypeIndex(self, lambda: (self.enemy_units, self.enemy_structures))
+        # Available abilities of our nexuses (chronoboost) and warpgates (warp-in), one query per step for all of them
+        self.ability_cache = AbilityCache(self, lambda: self.own(NEXUS) | self.own.ready(WARPGATE))
         self.ordered_expansions = None
         self.enemy_expansions = None
         self.scout_enemy = None
@@ -89,21 +116,32 @@ class TheUnseenz(sc2.BotAI):
         
         self.enemy_minerals_mined = 50
         self.enemy_vespene_mined = 0
-        self.enemy_minerals_spent = 0
-        self.enemy_vespene_spent = 0
+        # Enemy spending and army value, counted as we first see their units and structures
+        self.enemy_ledger = EnemyLedger(self)
+        # Enemy minerals and gas mined, estimated base by base
+        self.enemy_economy = EnemyEconomy()
         self.enemy_minerals = 50 
         self.enemy_vespene = 0
         
         self.last_scout = 0
-        self.last_army_supply = 0
-        self.last_known_enemy_amount = 0
-        self.enemy_army_value = [0, 0]
+        # (army supply, known enemy units) that update_threat and score_units last recomputed for, and the snapshot they
+        # compare against, which update_army_snapshot refreshes. Each task has its own so a deferred task still sees the change.
+        self.army_seen = {'update_threat': (0, 0), 'score_units': (0, 0)}
+        self.army_snapshot = dict(self.army_seen)
         self.threat_level = 1
         self.unit_score = None
-        self.best_unit = STALKER
-        self.best_stargate_unit = VOIDRAY
-        self.best_robo_unit = IMMORTAL
-        self.best_warpgate_unit = STALKER
+        # Incremental threat level, kept up to date from unit events. Recounted from scratch every THREAT_RESYNC_TIME seconds in case we missed an event.
+        self.threat_model = None
+        self.THREAT_RESYNC_TIME = 30
+        self.last_threat_resync = None
+        # Threat levels of army compositions we have scored before. Units dying and being rebuilt or flickering in and out of vision bring back old compositions.
+        self.threat_cache = ThreatCache()
+        # Tech building each unit needs on top of its production building. Its cost is deducted when scoring units we don't have the tech for yet.
+        self.tech_requirements = {FLEETBEACON: [TEMPEST, CARRIER, MOTHERSHIP], ROBOTICSBAY: [COLOSSUS, DISRUPTOR], TEMPLARARCHIVE: [ARCHON], DARKSHRINE: [DARKTEMPLAR]}
+        self.best_unit = None
+        self.best_stargate_unit = None
+        self.best_robo_unit = None
+        self.best_warpgate_unit = None
         self.worker_scout = None 
         # Terran: Note that many units have different forms and each form has a different unit name! -> Hellion/Hellbat, Widow mine, Siege tank, Viking, Liberator
         # Excluded units: Raven
@@ -117,103 +155,58 @@ class TheUnseenz(sc2.BotAI):
         # Excluded units: Vipers, Infestors, Swarm hosts, Overseers, Overlords, Broodlings, Locusts, Baneling
         # How do we count the combat strength of swarm hosts and brood lords? What about spellcasters?
         self.zerg_army = [ZERGLING, ROACH, RAVAGER, HYDRALISK, LURKERMP, QUEEN, MUTALISK, CORRUPTOR, BROODLORD, ULTRALISK]
+        
+        # Values carried between the tasks of a step. Placements are kept from the last time find_placements ran if it gets deferred.
+        self.nexus = None
+        self.pending_units = None
+        self.save_resources = 0
+        self.pylon_placement = None
+        self.building_placement = None
+        self.tech_placement = None
+        self.tech_placement_small = None
+        self.defence_placement_small = None
+        self.warpin_placement = None
+        
+        # Each step runs the tasks below in order. Priority 0 tasks always run, the others are deferred to a later step
+        # when their budget (in seconds) doesn't fit in what is left of STEP_TIME_BUDGET, see scheduler.py.
+        self.STEP_TIME_BUDGET = 0.04
+        # Set to True to time every task and section and write them to PROFILE_OUTPUT.csv/.json at game end. Off for ladder games,
+        # where the instrumentation stays in but does next to nothing.
+        self.PROFILE = False
+        self.PROFILE_OUTPUT = 'step_profile'
+        self.profiler = Profiler(self.PROFILE)
+        self.scheduler = Scheduler(self.STEP_TIME_BUDGET, self.profiler)
+        self.scheduler.add('track_expansions', self.track_expansions)
+        self.scheduler.add('update_state', self.update_state)
+        self.scheduler.add('track_enemy_units', self.track_enemy_units)
+        self.scheduler.add('track_enemy_economy', self.track_enemy_economy, priority=2, budget=0.002)
+        self.scheduler.add('check_detection', self.check_detection, priority=2, budget=0.001)
+        self.scheduler.add('update_threat', self.update_threat, priority=1, budget=0.005)
+        self.scheduler.add('micro', self.micro)
+        self.scheduler.add('manage_bases', self.manage_bases)
+        self.scheduler.add('distribute_workers', self.distribute_workers, priority=2, interval=self.ITERATIONS_PER_MINUTE/4, budget=0.005)
+        self.scheduler.add('idle_workers', self.idle_workers)
+        self.scheduler.add('find_placements', self.find_placements, priority=1, budget=0.01)
+        self.scheduler.add('build_economy', self.build_economy)
+        self.scheduler.add('score_units', self.score_units, priority=1, budget=0.01)
+        self.scheduler.add('production', self.production)
+        self.scheduler.add('update_army_snapshot', self.update_army_snapshot, interval=20)
+        self.scheduler.add('print_debug', self.print_debug, priority=3, interval=self.ITERATIONS_PER_MINUTE)
        
     # Inspired by RoachRush again
+    @timed('better_distribute_workers')
     async def better_distribute_workers(self, resource_ratio = 3):
+        # Sends idle and oversaturated workers to the bases and gas buildings missing harvesters, closest workers first. See workers.py.
+        # Gas is only filled while mineral income is over resource_ratio times gas income, and only emptied below 95% of it, to avoid rubber banding.
         if not self.workers:
             return
-        mineral_income = self.state.score.collection_rate_minerals
-        vespene_income = self.state.score.collection_rate_vespene
-        
-        excess_workers = self.workers.idle    
-        set_rally = []
-        # Find all oversaturated workers and bases 
-        for base in self.townhalls.ready:
-            if base.surplus_harvesters > 0:
-                set_rally.append(base)
-                workers_on_minerals = self.workers.filter(
-                    lambda unit: not unit.is_carrying_resource and unit.order_target in self.mineral_field.tags and unit.distance_to_squared(base) < 100
-                )
-                if workers_on_minerals:
-                    for n in range(base.surplus_harvesters):
-                        # prevent crash by only taking the minimum
-                        worker = workers_on_minerals[min(n, workers_on_minerals.amount) - 1]
-                        excess_workers.append(worker)
-                        
-#        # Oversaturated workers should be on minerals only
-#        for gas in self.gas_buildings.ready:
-#            if gas.surplus_harvesters > 0:
-#                workers_in_gas = self.workers.filter(
-#                    lambda unit: not unit.is_carrying_resource and unit.order_target == gas.tag
-#                )
-#                if workers_in_gas:
-#                    for n in range(gas.surplus_harvesters):
-#                        # prevent crash by only taking the minimum
-#                        worker = workers_in_gas[min(n, workers_in_gas.amount) - 1]
-#                        closest_mineral_patch = self.mineral_field.closest_to(worker)
-#                        worker.gather(closest_mineral_patch)
-                        
-        
-        # Send oversaturated workers to fresh mineral fields
-        for base in self.townhalls.ready:
-            # Negative surplus harvesters indicates not enough workers
-            if base.surplus_harvesters < 0:
-                fresh_mineral_patch = self.mineral_field.closest_to(base)
-                if excess_workers:
-                    for n in range(-base.surplus_harvesters):
-                        worker = excess_workers[min(n, excess_workers.amount) - 1]                        
-                        worker.gather(fresh_mineral_patch)
-                # Rally all saturated bases to this base. If there are multiple unsaturated bases, this will rally them to the last created townhall.
-                for other_bases in set_rally:
-                    other_bases.smart(fresh_mineral_patch)
-                base.smart(fresh_mineral_patch) # Don't forget: unsaturated bases should fill themselves before others!
-            
-        # Check mineral-gas balance
-        if mineral_income/max(vespene_income,1) > resource_ratio:
-            # Not enough gas: Fill gas buildings
-            for gas in self.gas_buildings.ready:
-                # returns negative value if not enough workers
-                if gas.surplus_harvesters < 0:                    
-                    # Prioritize idle or oversaturated workers
-                    if excess_workers:
-                        # Gas should never have oversaturation
-                        for n in range(-gas.surplus_harvesters):
-                            worker = excess_workers[min(n, excess_workers.amount) - 1]
-                            worker.gather(gas)
-                    # If we don't have extra workers, grab some from minerals
-                    else:
-                        workers_on_minerals = self.workers.filter(
-                            lambda unit: not unit.is_carrying_resource and unit.order_target in self.mineral_field.tags
-                        )
-                        if workers_on_minerals:
-                            for n in range(-gas.surplus_harvesters):
-                                # prevent crash by only taking the minimum
-                                worker = workers_on_minerals[min(n, workers_on_minerals.amount) - 1]
-                                worker.gather(gas)
-        # Add hysterisis effect to avoid rubber banding
-        elif mineral_income/max(vespene_income,1) < resource_ratio*0.95: 
-            # Too much gas: Prioritize minerals
-            # TODO: Decide: It won't fill gas if we already have enough gas, even if we have excess workers. Should I send the excess workers to gas?
-            for base in self.townhalls.ready:
-                # returns negative value if not enough workers
-                if base.surplus_harvesters < 0:                    
-                    # Prioritize idle or oversaturated workers
-                    if excess_workers:
-                        # Oversaturation is fine on minerals if we don't have fresh bases
-                        for worker in excess_workers:
-                            fresh_mineral_patch = self.mineral_field.closest_to(base)
-                            worker.gather(fresh_mineral_patch)
-                    # If we don't have extra workers, grab some from minerals
-                    elif self.gas_buildings.ready:
-                        workers_in_gas = self.workers.filter(
-                            lambda unit: not unit.is_carrying_resource and unit.order_target in self.gas_buildings.tags
-                        )
-                        if workers_in_gas:
-                            for n in range(-base.surplus_harvesters):
-                                # prevent crash by only taking the minimum
-                                worker = workers_in_gas[min(n, workers_in_gas.amount) - 1]
-                                fresh_mineral_patch = self.mineral_field.closest_to(base)
-                                worker.gather(fresh_mineral_patch)
+        orders, rallies = self.worker_allocator.plan(resource_ratio)
+        for worker, target in orders:
+            worker.gather(target)
+            self.harvesters.assign(worker.tag, target.tag)
+        # Rally saturated bases to the base missing harvesters. Don't forget: unsaturated bases should fill themselves before others!
+        for townhall, fresh_mineral_patch in rallies:
+            townhall.smart(fresh_mineral_patch)
         
         
 #        # Idle workers should mine minerals, even if its oversaturated.
@@ -332,6 +325,18 @@ class TheUnseenz(sc2.BotAI):
             
         return [time_to_kill, time_to_reach]
         
+    def update_matchups(self):
+        # Rebuilds the time to kill/reach matrices for every own vs enemy unit type pair in one batched pass.
+        # Gives the same results as calling calculate_effective_dps on each pair, which is kept as the single-pair reference.
+        [self.own_time_to_kill, self.own_time_to_reach, self.enemy_time_to_kill, self.enemy_time_to_reach] = \
+            calculate_matchups(self.own_army_race, self.enemy_army_race, self.gas_value)
+        # The threat model holds on to the matchups, so it has to be rebuilt with them.
+        self.threat_model = ThreatModel(self.own_army_race, self.enemy_army_race, self.own_time_to_kill, self.own_time_to_reach,
+                                        self.enemy_time_to_kill, self.enemy_time_to_reach, self.gas_value)
+        self.last_threat_resync = None
+        self.threat_cache.clear()
+        
+    @timed('calculate_threat_level')
     def calculate_threat_level(self, own_army_race, own_units, enemy_army_race, enemy_units, future_own_units = None, future_enemy_units = None):
         # Finds the best units to deal with the known enemy army, and the current threat level represented by our present units vs known enemy units.
         # For better performance, only run this function when either army size changes!
@@ -341,118 +346,51 @@ class TheUnseenz(sc2.BotAI):
         
         # Own_army_race and enemy_army_race are list of units that can be made by us/enemy.
         # Own_units and enemy_units are the units we currently have and we know the enemy currently has.
-        # enemy_units(enemy_army) therefore filters the existing units of the given type of enemy army unit.
         # Future_own_units and future_enemy_units are arrays of extra units we anticipate. Future_own_units[0] will give number of units of unit id 0.
         # To ensure fair comparisons, use number of future units = some_fixed_cost/unit_value_of_unit_id
-        
-        own_effective_dps = np.zeros((len(own_army_race),len(enemy_army_race)))
-        own_effective_hp = np.zeros((len(own_army_race),len(enemy_army_race)))
-        enemy_effective_dps = np.zeros((len(own_army_race),len(enemy_army_race)))
-        enemy_effective_hp = np.zeros((len(own_army_race),len(enemy_army_race)))
-        effective_dps_taken = np.zeros((len(own_army_race),len(enemy_army_race)))
-        effective_dps_dealt = np.zeros((len(own_army_race),len(enemy_army_race)))
-        
-        own_time_to_kill = np.zeros((len(own_army_race),len(enemy_army_race)))
-        enemy_time_to_kill = np.zeros((len(own_army_race),len(enemy_army_race)))
-        
+        # The model itself lives in threat.py and works on whole unit count arrays at once. Compositions we scored before come from the threat cache.
         if future_own_units is None:
             future_own_units = np.zeros(len(own_army_race))
         if future_enemy_units is None:
             future_enemy_units = np.zeros(len(enemy_army_race))
-        i = 0
-        for own_army in own_army_race:
-            j = 0
-            for enemy_army in enemy_army_race:
-                # Add modifier: Number of units in combat
-                # Unit size drop off: Model dps as max efficiency at units that can fit within (2*PI/4)*(range+2), after which you get sharp drop off. (for ground units only)
-                # Too many units: Model excess unit dps as a square root drop off.
-                # Check: Square roots in this function may cause lag. May need to find alternative.
-                # Known issue: If 2 units have the same range, they will be allocated their own optimal units attacking. Similarly, they will not count as tanking for each other.
-                # Conflicting units: Widow mines and marines, marauders and ghosts, thors, unsieged tanks and cyclones, stalkers and immortals, zealot/DT, ravagers and hydras, ling/ultra.
-                
-                # Note: Units we don't own will be registered as the initialized time to kill and dps dealt, which is currently both 0
-                if (own_units(own_army) or future_own_units[i]) and (enemy_units(enemy_army) or future_enemy_units[j]):
-                    optimal_units_attacking = math.floor((math.pi/2)*(max(own_army.range_ground, own_army.range_air) + 2)/own_army.size)
-                    if (own_units(own_army).amount + future_own_units[i]) <= optimal_units_attacking or not own_army.is_ground:
-                        own_time_to_kill[i][j] = self.own_time_to_kill[i][j].copy()\
-                        *((enemy_units(enemy_army).amount + future_enemy_units[j])*(enemy_army.minerals + self.gas_value*enemy_army.vespene)\
-                        /((own_units(own_army).amount + future_own_units[i])*(own_army.minerals + self.gas_value*own_army.vespene)))
-                    else:                    
-                        own_time_to_kill[i][j] = self.own_time_to_kill[i][j].copy()\
-                        *((enemy_units(enemy_army).amount + future_enemy_units[j])*(enemy_army.minerals + self.gas_value*enemy_army.vespene)\
-                        /(optimal_units_attacking + (math.sqrt(own_units(own_army).amount + future_own_units[i] - optimal_units_attacking))*(own_army.minerals + self.gas_value*own_army.vespene)))
-                    
-                    # Effective dps = Time it takes for each unit to reach and kill all units of another type. Weigh this for all units by their total value.
-                    effective_dps_dealt[i][j] = (1/(self.own_time_to_reach[i][j].copy() + own_time_to_kill[i][j].copy()))\
-                        *((enemy_units(enemy_army).amount + future_enemy_units[j])*(enemy_army.minerals + self.gas_value*enemy_army.vespene))
-#                    print("DEBUGGER")
-#                    print(own_army)
-#                    print(enemy_army)
-#                    print(self.own_time_to_reach[i][j].copy())
-#                    print(own_time_to_kill[i][j].copy())
-#                    print("unit value")
-#                    print((enemy_units(enemy_army).amount + future_enemy_units[j])*(enemy_army.minerals + self.gas_value*enemy_army.vespene))
-#                    print((own_units(own_army).amount + future_own_units[i])*(own_army.minerals + self.gas_value*own_army.vespene))
-                    
-                # Calculations for enemy are symmetrical.
-#                if enemy_units(enemy_army) or future_enemy_units[j]:
-                    optimal_units_attacking = math.floor((math.pi/2)*(max(enemy_army.range_ground, enemy_army.range_air) + 2)/enemy_army.size)
-                    if (enemy_units(enemy_army).amount + future_enemy_units[j]) <= optimal_units_attacking or not enemy_army.is_ground:
-                        enemy_time_to_kill[i][j] = self.enemy_time_to_kill[i][j].copy()\
-                        *((own_units(own_army).amount + future_own_units[i])*(own_army.minerals + self.gas_value*own_army.vespene)\
-                        /((enemy_units(enemy_army).amount + future_enemy_units[j])*(enemy_army.minerals + self.gas_value*enemy_army.vespene)))
-                    else:                    
-                        enemy_time_to_kill[i][j] = self.enemy_time_to_kill[i][j].copy()\
-                        *((own_units(own_army).amount + future_own_units[i])*(own_army.minerals + self.gas_value*own_army.vespene)\
-                        /(optimal_units_attacking + (math.sqrt(enemy_units(enemy_army).amount + future_enemy_units[j] - optimal_units_attacking))*(enemy_army.minerals + self.gas_value*enemy_army.vespene)))
-                        
-                    effective_dps_taken[i][j] = (1/(self.enemy_time_to_reach[i][j].copy() + enemy_time_to_kill[i][j].copy()))\
-                        *((own_units(own_army).amount + future_own_units[i])*(own_army.minerals + self.gas_value*own_army.vespene))
-                
-                    
-                j += 1
-            i += 1        
-        
-        # TODO: Effective dps only lasts as long as the unit is alive. This is reflected in our combat score, but does not reflect how effective hp is calculated assuming full effective dps!
-        # Enemies with 0 damage to us are not a threat, we don't need to deal with them! We need to fix this to avoid making phoenix as an air tank against no air units!
-        # Effective hp = 1/time to die
-        # Time to die = num_units*time_to_kill + time_to_reach
-        # num_units reduces over time based on our num_units*time_to_kill + time_to_reach
-        no_threat = 0.01
-        own_effective_dps = np.sum(effective_dps_dealt.copy(),axis=1)
-        own_effective_hp = 1/np.sum(np.clip(effective_dps_taken.copy(),a_min=no_threat, a_max=None),axis=1)
-        enemy_effective_dps = np.sum(effective_dps_taken.copy(),axis=0)
-        enemy_effective_hp = 1/np.sum(np.clip(effective_dps_dealt.copy(), a_min=no_threat, a_max=None),axis=0)
-        
-        # Units tanking for each other: Effective hp of unit is its time to reach + time to kill of all units shorter range than it.
-        # TODO: Also factor in time to kill of other units of the same type, not just shorter ranged units
-        i = 0        
-        for own_army in own_army_race:
-            j = 0
-            for other_own_army in own_army_race:
-                if max(own_army.range_ground, own_army.range_air) > max(other_own_army.range_ground, other_own_army.range_air):
-                    own_effective_hp[i] += np.sum(effective_dps_taken.copy(),axis=1)[j]
-                j += 1
-            i += 1
-        
-        i = 0        
-        for enemy_army in enemy_army_race:
-            j = 0
-            for other_enemy_army in enemy_army_race:
-                if max(enemy_army.range_ground, enemy_army.range_air) > max(other_enemy_army.range_ground, other_enemy_army.range_air):
-                    enemy_effective_hp[i] += np.sum(effective_dps_dealt.copy(),axis=0)[j]
-                j += 1
-            i += 1
-        
-
-        # Combat score = sum of each unit's effective dps* its effective hp.
-        own_combat_score = np.sum(own_effective_dps*own_effective_hp)
-        enemy_combat_score = np.sum(enemy_effective_dps*enemy_effective_hp)
-        # Threat level = our combat score/enemy combat score
-        threat_level = enemy_combat_score/max(own_combat_score,0.0001)
+        own_counts = own_army_race.counts(own_units)
+        enemy_counts = enemy_army_race.counts(enemy_units)
+        key = self.threat_cache.key(own_counts, enemy_counts, future_own_units, future_enemy_units, self.gas_value)
+        threat = self.threat_cache.get(key)
+        if threat is None:
+            threat = threat_level(own_army_race, enemy_army_race, own_counts, enemy_counts,
+                                  np.asarray(future_own_units, dtype=float), np.asarray(future_enemy_units, dtype=float),
+                                  self.own_time_to_kill, self.own_time_to_reach, self.enemy_time_to_kill, self.enemy_time_to_reach, self.gas_value)
+            self.threat_cache.put(key, threat)
+        return threat
+    
+    @timed('calculate_threat_levels')
+    def calculate_threat_levels(self, own_army_race, own_units, enemy_army_race, enemy_units, future_own_units, future_enemy_units = None):
+        # Batched calculate_threat_level: future_own_units is a matrix with one candidate future army per row, and one threat level is returned per row.
+        # Unit counts and matchup terms are shared by all candidates, so this is much cheaper than calling calculate_threat_level once per candidate.
+        # Candidates found in the threat cache are skipped, the rest are evaluated together.
+        if future_enemy_units is None:
+            future_enemy_units = np.zeros(len(enemy_army_race))
+        future_own_units = np.asarray(future_own_units, dtype=float)
+        future_enemy_units = np.asarray(future_enemy_units, dtype=float)
+        own_counts = own_army_race.counts(own_units)
+        enemy_counts = enemy_army_race.counts(enemy_units)
+        keys = [self.threat_cache.key(own_counts, enemy_counts, future, future_enemy_units, self.gas_value) for future in future_own_units]
+        threats = np.zeros(len(keys))
+        misses = []
+        for i, key in enumerate(keys):
+            threat = self.threat_cache.get(key)
+            if threat is None:
+                misses.append(i)
+            else:
+                threats[i] = threat
+        if misses:
+            threats[misses] = threat_levels(own_army_race, enemy_army_race, own_counts, enemy_counts, future_own_units[misses], future_enemy_units,
+                                            self.own_time_to_kill, self.own_time_to_reach, self.enemy_time_to_kill, self.enemy_time_to_reach, self.gas_value)
+            for i in misses:
+                self.threat_cache.put(keys[i], threats[i])
+        return threats
         
-        return threat_level
-                    
     def scout_map(self, priority = 'Enemy'):
         # Assigns the next scouting location when called. This scouting location will change each time it is called, so only call it once for idle units! Spamming this will result in spazzing.
         # Input priority 'Enemy' or 'Map'
@@ -519,15 +457,31 @@ class TheUnseenz(sc2.BotAI):
         
     # Removes destroyed units from known_enemy_units and known_enemy_structures. Seems to work. Will not register units dying in fog as dead, how do we deal with this?
     async def on_unit_destroyed(self, unit_tag):
-        units = self.known_enemy_units.filter(lambda unit: unit.tag == unit_tag)
-        for unit in units:
-#            self.known_enemy_units = self.known_enemy_units.filter(lambda unit: unit.tag != unit_tag)
-            self.known_enemy_units.remove(unit)
-            self.enemy_army_value[0] -= self.calculate_unit_value(unit.type_id).minerals
-            self.enemy_army_value[1] -= self.calculate_unit_value(unit.type_id).vespene
-#        self.known_enemy_structures = self.known_enemy_structures.filter(lambda unit: unit.tag != unit_tag)
-#        print(len(self.known_enemy_units))    
-#        print(len(self.known_enemy_structures))
+        # Our own units are gone from self.units by now, their last state is in the previous step's units.
+        if self.threat_model and unit_tag in self._units_previous_map:
+            self.threat_model.add_own(self._units_previous_map[unit_tag].type_id, -1)
+        unit = self.known_enemy_units.remove(unit_tag)
+        if unit:
+            self.threat_model.add_enemy(unit.type_id, -1)
+            self.enemy_ledger.unit_lost(unit)
+            if unit.type_id in {SCV, PROBE, DRONE}:
+                self.enemy_economy.worker_changed(unit.position)
+        self.known_enemy_structures.remove(unit_tag)
+        self.harvesters.remove(unit_tag)
+        if self.placements:
+            self.placements.structure_removed(unit_tag)
+        if self.expansions and unit_tag in self._structures_previous_map:
+            self.expansions.townhall_lost(unit_tag)
+        
+    async def on_unit_created(self, unit):
+        if self.threat_model:
+            self.threat_model.add_own(unit.type_id)
+            
+    async def on_unit_type_changed(self, unit, previous_type):
+        # Units that morph into another unit type keep their tag, so this is not a created/destroyed pair.
+        if self.threat_model:
+            self.threat_model.add_own(previous_type, -1)
+            self.threat_model.add_own(unit.type_id)
         
     async def on_enemy_unit_entered_vision(self, unit):
         unit.last_update = self.time
@@ -536,6 +490,8 @@ class TheUnseenz(sc2.BotAI):
         if self.known_enemy_units.find_by_tag(unit_tag):
             unit = self.known_enemy_units.find_by_tag(unit_tag)
             unit.last_update = self.time
+            if unit.type_id in {SCV, PROBE, DRONE}:
+                self.enemy_economy.worker_changed(unit.position)
         elif self.known_enemy_structures.find_by_tag(unit_tag):
             unit = self.known_enemy_structures.find_by_tag(unit_tag)
             unit.last_update = self.time
@@ -549,119 +505,87 @@ class TheUnseenz(sc2.BotAI):
         
         if unit in self.gas_buildings:
             await self.better_distribute_workers(self.resource_ratio)
+        
+        if self.placements and unit.type_id == PYLON:
+            self.placements.pylon_completed(unit)
             
     async def on_building_construction_started(self, unit):
-        if unit in self.structures({CYBERNETICSCORE,FLEETBEACON,ROBOTICSBAY,TEMPLARARCHIVE,DARKSHRINE}):
+        if self.placements:
+            self.placements.structure_added(unit)
+        if self.expansions and unit in self.townhalls:
+            self.expansions.townhall_started(unit)
+        if unit.type_id in {CYBERNETICSCORE,FLEETBEACON,ROBOTICSBAY,TEMPLARARCHIVE,DARKSHRINE}:
             await self.better_distribute_workers(self.resource_ratio)
         
+    async def on_end(self, game_result):
+        if self.PROFILE:
+            self.profiler.export(self.PROFILE_OUTPUT)
+        
     async def on_step(self, iteration):
         if iteration == 0:
-            await self.chat_send("(glhf)(protoss)")
-            # Initialize            
-            self.known_enemy_units = self.enemy_units
-            self.known_enemy_structures = self.enemy_structures
-            self.known_minerals = self.mineral_field.closer_than(10,list(self.owned_expansions.keys())[0])
-            self.known_gas = self.vespene_geyser.closer_than(10,list(self.owned_expansions.keys())[0])
-            self.future_enemy_units = self.enemy_units
-            self.enemy_expansions = [self.enemy_start_locations[0]]            
-            for base in self.enemy_expansions:
-                base.last_update = 0
-            # Import unit list
-            unit_list(self)            
+            await self.initialize()
+        await self.scheduler.run(iteration)
         
-            # Check our race
-            if (self.race == Race.Terran):
-                self.own_army_race = self.terran_army
-            if (self.race == Race.Protoss):
-                self.own_army_race = self.protoss_army
-            if (self.race == Race.Zerg):
-                self.own_army_race == self.zerg_army
-            # Check enemy race. TODO: Account for enemy random race and for zerg race-switching
-            if (self.enemy_race == Race.Terran):
-                self.enemy_army_race = self.terran_army  
-            if (self.enemy_race == Race.Protoss):
-                self.enemy_army_race = self.protoss_army
-            if (self.enemy_race == Race.Zerg):
-                self.enemy_army_race = self.zerg_army
-            
-            # Calculate effective dps dealt and taken once on game start as we only need to calculate this once
-            # Also assign each unit type an ID for later reference.
-            self.own_time_to_kill = np.zeros((len(self.own_army_race),len(self.enemy_army_race)))
-            self.own_time_to_reach = np.zeros((len(self.own_army_race),len(self.enemy_army_race)))
-            self.enemy_time_to_kill = np.zeros((len(self.own_army_race),len(self.enemy_army_race)))
-            self.enemy_time_to_reach = np.zeros((len(self.own_army_race),len(self.enemy_army_race)))
-            self.unit_score = np.zeros(len(self.own_army_race))
-            
-#            self.effective_dps_dealt = np.zeros((len(self.own_army_race),len(self.enemy_army_race)))
-#            self.effective_dps_taken = np.zeros((len(self.own_army_race),len(self.enemy_army_race)))
-            i = 0
-            for own_army in self.own_army_race:
-                j = 0
-                own_army.id = i
-                for enemy_army in self.enemy_army_race:
-                    enemy_army.id = j
-                    [self.own_time_to_kill[i][j], self.own_time_to_reach[i][j]] = self.calculate_effective_dps(own_army,enemy_army)
-                    [self.enemy_time_to_kill[i][j], self.enemy_time_to_reach[i][j]] = self.calculate_effective_dps(enemy_army,own_army)
-                    
-#                    self.effective_dps_dealt[i][j] = 1/(self.own_time_to_kill[i][j] + self.own_time_to_reach[i][j])
-#                    self.effective_dps_taken[i][j] = 1/(self.enemy_time_to_kill[i][j] + self.enemy_time_to_reach[i][j])
-#                    print(own_army)
-#                    print(enemy_army)
-#                    print('Dps dealt:')
-#                    print(self.effective_dps_dealt[i][j])
-#                    print(self.own_time_to_kill[i][j])
-#                    print(self.own_time_to_reach[i][j])
-#                    print('Dps taken:')
-#                    print(self.effective_dps_taken[i][j])
-#                    print(self.enemy_time_to_kill[i][j])
-#                    print(self.enemy_time_to_reach[i][j])
-                    
-                    j += 1
-                i += 1
-#            print('Statistics time!')
-#            print('Totals:')
-#            print(np.sum(self.effective_dps_dealt))
-#            print(np.sum(self.effective_dps_taken))
-#            print('By row:')
-#            print(np.sum(self.effective_dps_dealt,axis=1))
-#            print(np.sum(self.effective_dps_taken,axis=1))
-#            print((np.sum(self.effective_dps_taken,axis=1))/(np.sum(self.effective_dps_dealt,axis=1)))
+    async def initialize(self):
+        # Runs on the first step, before the scheduled tasks. benchmark.py calls it directly.
+        await self.chat_send("(glhf)(protoss)")
+        # Initialize            
+        self.known_enemy_units = KnownUnits(self, self.enemy_units)
+        self.known_enemy_structures = KnownUnits(self, self.enemy_structures)
+        # Resources don't move, so find which resources belong to which expansion once.
+        self.expansion_resources = ExpansionResources(self, self.expansion_locations_dict)
+        # Expansions are ordered once per map, then our bases are tracked from townhall events.
+        self.expansions = ExpansionManager(self)
+        await self.expansions.measure_paths()
+        for townhall in self.townhalls:
+            self.expansions.townhall_started(townhall)
+        self.placements = PlacementCache(self)
+        # Import unit list
+        unit_list(self)            
         
+        # Check our race
+        if (self.race == Race.Terran):
+            self.own_army_race = self.terran_army
+        if (self.race == Race.Protoss):
+            self.own_army_race = self.protoss_army
+        if (self.race == Race.Zerg):
+            self.own_army_race == self.zerg_army
+        # Check enemy race. TODO: Account for enemy random race and for zerg race-switching
+        if (self.enemy_race == Race.Terran):
+            self.enemy_army_race = self.terran_army  
+        if (self.enemy_race == Race.Protoss):
+            self.enemy_army_race = self.protoss_army
+        if (self.enemy_race == Race.Zerg):
+            self.enemy_army_race = self.zerg_army
         
+        # Unit types are referred to by their id in the race's stat table.
+        self.best_unit = self.unit_stats[STALKER]
+        self.best_stargate_unit = self.unit_stats[VOIDRAY]
+        self.best_robo_unit = self.unit_stats[IMMORTAL]
+        self.best_warpgate_unit = self.unit_stats[STALKER]
+        self.unit_score = np.zeros(len(self.own_army_race))
+        self.future_enemy_units = np.zeros(len(self.enemy_army_race))
+        # Calculate effective dps dealt and taken once on game start. Call update_matchups again if unit stats change.
+        self.update_matchups()
+        
+    async def track_expansions(self, iteration):
         # Lists out the expansions on the map. Ordered expansions shows expansions that have not yet been taken (or are taken by enemy but we don't know yet)
-        # Enemy expansions are all expansions we know the enemy has.
+        # Enemy expansions are all expansions we know the enemy has, closest to the enemy main first.
         # Hotfix until I work out proper micro: enemy owned bases are included in scouting locations. This is not ideal because we will keep running our army into the enemy.
-#        self.ordered_expansions = list(self.expansion_locations_list - self.owned_expansions.keys() - set(self.enemy_expansions)) 
-        self.ordered_expansions = list(self.expansion_locations_list - self.owned_expansions.keys())
-        self.ordered_expansions = sorted(
-            self.ordered_expansions, key=lambda expansion: expansion.distance_to(self.start_location) 
-        )
-
-        for base in self.ordered_expansions:
-            townhalls = {NEXUS, COMMANDCENTER, COMMANDCENTERFLYING, ORBITALCOMMAND, ORBITALCOMMANDFLYING, PLANETARYFORTRESS, HATCHERY, LAIR, HIVE}
-            if self.enemy_structures(townhalls).closer_than(5, base):
-                if base not in self.enemy_expansions:
-                    self.enemy_expansions.append(base)
-                    # ETA = estimated completion time of base
-                    eta = (1 - self.enemy_structures(townhalls).closest_to(base).build_progress)*71
-                    base.last_update = self.time + eta
-            else:
-                if base in self.enemy_expansions and self.is_visible(base):
-                    self.enemy_expansions.remove(base)
-
-        self.ordered_expansions_enemy = sorted(
-            self.enemy_expansions, key=lambda expansion: expansion.distance_to(self.enemy_start_locations[0]) 
-        )
-        
+        self.expansions.update()
+        self.ordered_expansions = self.expansions.not_owned
+        self.enemy_expansions = self.expansions.enemy_bases
+        self.ordered_expansions_enemy = self.enemy_expansions
         
+    async def update_state(self, iteration):
         # State management        
         # Mineral and vespene rates are per minute, supply rates are per second
         mineral_income = self.state.score.collection_rate_minerals
         vespene_income = self.state.score.collection_rate_vespene
         
-        num_warpgates = (self.structures(WARPGATE).amount + self.structures(GATEWAY).ready.amount + self.already_pending(GATEWAY))
-        num_stargates = (self.structures(STARGATE).ready.amount + self.already_pending(STARGATE))
-        num_robos = (self.structures(ROBOTICSFACILITY).ready.amount + self.already_pending(ROBOTICSFACILITY))
+        num_warpgates = (self.own(WARPGATE).amount + self.own.ready(GATEWAY).amount + self.already_pending(GATEWAY))
+        num_stargates = (self.own.ready(STARGATE).amount + self.already_pending(STARGATE))
+        num_robos = (self.own.ready(ROBOTICSFACILITY).amount + self.already_pending(ROBOTICSFACILITY))
         num_production = num_warpgates + num_stargates + num_robos
         
         # Once we are nearing worker cap, remove them from the resource consumption rate.
@@ -670,264 +594,77 @@ class TheUnseenz(sc2.BotAI):
             mineral_rate = (num_warpgates*self.WARPGATE_MINERAL_RATE + num_stargates*self.STARGATE_MINERAL_RATE + num_robos*self.ROBO_MINERAL_RATE + supply_rate*100/8)*60            
         else:    
             supply_rate = num_warpgates*self.WARPGATE_SUPPLY_RATE + num_stargates*self.STARGATE_SUPPLY_RATE + num_robos*self.ROBO_SUPPLY_RATE\
-            + len(self.structures(NEXUS).ready)*self.NEXUS_SUPPLY_RATE
+            + len(self.own.ready(NEXUS))*self.NEXUS_SUPPLY_RATE
             mineral_rate = (num_warpgates*self.WARPGATE_MINERAL_RATE + num_stargates*self.STARGATE_MINERAL_RATE + num_robos*self.ROBO_MINERAL_RATE \
-            + len(self.structures(NEXUS).ready)*self.NEXUS_MINERAL_RATE + supply_rate*100/8)*60
+            + len(self.own.ready(NEXUS))*self.NEXUS_MINERAL_RATE + supply_rate*100/8)*60
         vespene_rate = (num_warpgates*self.WARPGATE_VESPENE_RATE + num_stargates*self.STARGATE_VESPENE_RATE + num_robos*self.ROBO_VESPENE_RATE)*60
         ideal_gas_buildings = math.floor(vespene_rate/160) + 1
-        save_resources = 0
         
+        # Track our units
+        self.all_army = self.units - self.own(PROBE) - self.own(INTERCEPTOR) - self.own(HIGHTEMPLAR)# Don't touch HTs until they morph archons/I make logic for spellcasting!        
+        # Assumes we actually have the resources to afford these units
+        defender_advantage = 60 # Amount of extra production time's worth of units we make while enemy is on the way to our base
+        pending_units = np.zeros(len(self.own_army_race))
+        pending_units[self.best_stargate_unit.id] = num_stargates*defender_advantage/self.best_stargate_unit.build_time
+        pending_units[self.best_robo_unit.id] = num_robos*defender_advantage/self.best_robo_unit.build_time
+        pending_units[self.best_warpgate_unit.id] = num_warpgates*defender_advantage/self.best_warpgate_unit.build_time
+        self.pending_units = pending_units
+        self.mineral_income, self.vespene_income, self.num_warpgates, self.num_stargates, self.num_robos, self.num_production, self.supply_rate, self.mineral_rate, self.vespene_rate, self.ideal_gas_buildings = mineral_income, vespene_income, num_warpgates, num_stargates, num_robos, num_production, supply_rate, mineral_rate, vespene_rate, ideal_gas_buildings
+        
+    async def track_enemy_units(self, iteration):
         # Count enemy expenditure. As we aren't given any information on enemy upgrades, the cost of upgrades will be ignored.
-        for unit in self.enemy_units.filter(lambda unit: unit not in self.known_enemy_units and not unit.is_snapshot):
-            # First 12 workers and zerg's first overlord are free.
+        # First 12 workers, zerg's first overlord and the first townhall are free, see enemy_ledger.py.
+        new_enemy_units = self.known_enemy_units.new(self.enemy_units)
+        new_enemy_structures = self.known_enemy_structures.new(self.enemy_structures)
+        for unit in new_enemy_units:
             unit.last_update = self.time
-            if not ((unit in self.enemy_units({SCV, PROBE, DRONE}) and self.known_enemy_units({SCV, PROBE, DRONE}).amount <= 12) or \
-                    (unit in self.enemy_units(OVERLORD) and self.known_enemy_units(OVERLORD).amount < 1)):
-                self.enemy_minerals_spent += self.calculate_unit_value(unit.type_id).minerals
-                self.enemy_vespene_spent += self.calculate_unit_value(unit.type_id).vespene
-            if unit not in self.enemy_units({SCV, PROBE, DRONE, OVERLORD}):
-                self.enemy_army_value[0] += self.calculate_unit_value(unit.type_id).minerals
-                self.enemy_army_value[1] += self.calculate_unit_value(unit.type_id).vespene
-        for structure in self.enemy_structures.filter(lambda unit: unit not in self.known_enemy_structures and not unit.is_snapshot):
-            # First townhall is free
+            self.enemy_ledger.unit_seen(unit)
+        for structure in new_enemy_structures:
             structure.last_update = self.time
-            if not (structure in self.enemy_structures({NEXUS, COMMANDCENTER, HATCHERY}) and self.enemy_structures({NEXUS, COMMANDCENTER, HATCHERY}).amount <= 1):
-                self.enemy_minerals_spent += self.calculate_unit_value(structure.type_id).minerals
-                self.enemy_vespene_spent += self.calculate_unit_value(structure.type_id).vespene
+            self.enemy_ledger.structure_seen(structure)
+            self.placements.structure_added(structure)
         # Track known enemy units and structures. Updated whenever we see new units and removed whenever they die in vision. 
         # TODO: Should snapshots be included? On one hand, we get too many snapshots. On the other hand, how else will we detect siege tanks on the highground?
-        self.known_enemy_units += self.enemy_units.filter(lambda unit: unit not in self.known_enemy_units and not unit.is_snapshot)
+        self.known_enemy_units.add_new(new_enemy_units)
+        for unit in new_enemy_units:
+            self.threat_model.add_enemy(unit.type_id)
+            if unit.type_id in {SCV, PROBE, DRONE}:
+                self.enemy_economy.worker_changed(unit.position)
         # Known enemy structures will get clogged up with snapshots which have different unit tags, just remove the snapshots as we don't need them (since we already save the original)
         # Turns out self.enemy_structures already contains snapshots of buildings if we don't have vision of them...
-        for mineral in self.mineral_field.filter(lambda mineral: mineral not in self.known_minerals and not mineral.is_snapshot):
-            mineral.last_update = self.time
-        self.known_minerals += self.mineral_field.filter(lambda mineral: mineral not in self.known_minerals and not mineral.is_snapshot)
-        self.known_gas += self.vespene_geyser.filter(lambda gas: gas not in self.known_gas and not gas.is_snapshot)
-        self.known_enemy_structures += self.enemy_structures.filter(lambda unit: unit not in self.known_enemy_structures and not unit.is_snapshot)
+        self.known_enemy_structures.add_new(new_enemy_structures)
 #        self.known_enemy_structures = self.known_enemy_structures.filter(lambda unit: not unit.is_snapshot)
 #        for unit in self.known_enemy_units: # Should not be necessary since it's already in on_unit_entered_vision?
 #            if self.is_visible(unit.position):
 #                unit.last_update = self.time
         
-        # Track enemy resources
-        # Will not include the cost of the drone for zerg buildings (we might not see the worker that was used)
-        # Will only recognize lost mining time after seeing the mineral fields (especially relevant vs terran)
-        # Will not model mule mining rate, but upon seeing more minerals being mined from the mineral patch, will retroactively add that in.
-        townhalls = {NEXUS, COMMANDCENTER, COMMANDCENTERFLYING, ORBITALCOMMAND, ORBITALCOMMANDFLYING, PLANETARYFORTRESS, HATCHERY, LAIR, HIVE}
-        num_townhalls = max(len(self.enemy_structures(townhalls)),1)
-        self.enemy_minerals_mined = 50 # Initial base which will be deducted later.
-        self.enemy_vespene_mined = 0
-        for base in self.enemy_expansions:
-            # Initialize each base to have available resources equal to the snapshots of the known resources nearby. 
-            # If we see that the resources have been mined out before we see the expansion location, it will count the resources incorrectly and think much less resources were mined.
-            try:
-                base.minerals_available
-                base.vespene_available
-                base.saturated_mineral_time
-                base.saturated_vespene_time
-            except:
-                base.minerals_available = len(self.mineral_field.closer_than(10,base))*1350 # Each base has half 900, half 1800 mineral fields. Regular has 8 mineral fields, gold bases have 6.
-                base.vespene_available = len(self.vespene_geyser.closer_than(10,base))*2250                
-                base.saturated_mineral_time = 0
-                base.saturated_vespene_time = 0
-            # Update our last seen time of the enemy base. If it is under construction, instead use the estimated completion time. 
-            # If terran floats a CC into the expansion, it will only register the base as taken upon seeing the CC in the expansion (generally acceptable, as it may be a long while).
-            if self.is_visible(base):
-                eta = (1 - self.enemy_structures(townhalls).closest_to(base).build_progress)*71
-                base.last_update = self.time + eta
-            # Ignore bases that aren't complete yet
-            if base.last_update > self.time:
-                continue
-            mineral_fields = self.mineral_field.closer_than(10,base)
-            vespene_geysers = self.vespene_geyser.closer_than(10,base)
-            known_mineral_fields = self.known_minerals.closer_than(10,base)
-            known_vespene_geysers = self.known_gas.closer_than(10,base)
-            # TODO: If we scout that they have less workers than we anticipated, lower the resource mined value retroactively.
-            max_workers_minerals = len(mineral_fields)*2
-            max_workers_vespene = len(vespene_geysers)*3
-            max_workers = max_workers_minerals + max_workers_vespene
-            # TODO: What if we scout 1 worker of a fully saturated base, then our scout dies before seeing the rest?
-            if self.known_enemy_units({SCV, PROBE, DRONE}):
-                known_workers_mining = (self.known_enemy_units({SCV, PROBE, DRONE}).closer_than(10,base))
-                num_known_workers_mining = len(known_workers_mining)
-                # TODO: Townhalls in progress do not yet contribute to worker production. If many bases are unsaturated, they should be filled evenly (currently n times too fast)
-                # TODO: Cleanup this mess of a function. 12 workers + enemy town halls, but assume minimum 1 (initial base)*elapsed time/worker build rate.
-                # Base.last_update can be negative (not completed). Cap at max workers.                 
-                if (known_workers_mining):
-                    random_worker = known_workers_mining.random
-                    num_workers_mining = math.floor(min(num_known_workers_mining + num_townhalls*(self.time-random_worker.last_update)/12,max_workers))
-                else:
-                    num_workers_mining = math.floor(min(num_townhalls*(self.time-base.last_update)/12,max_workers))
-            # Assume constant worker production from all bases (includes macro hatches/orbitals) until saturation.
-            elif base in self.enemy_start_locations:
-                num_known_workers_mining = 12 # Starting worker count
-                num_workers_mining = math.floor(min((12 + num_townhalls*(self.time-base.last_update)/12),max_workers))
-            else:
-                num_known_workers_mining = 0 # We somehow saw an expansion but no workers, so assume this expansions is empty.
-                num_workers_mining = math.floor(min((num_townhalls*(self.time-base.last_update)/12),max_workers))
-                
-            # Estimate time to saturate
-            if num_workers_mining < max_workers_minerals:  
-                worker_deficit = max_workers_minerals - num_workers_mining
-                base.saturated_mineral_time = self.time + worker_deficit*12/num_townhalls
-                
-            if num_workers_mining < max_workers_minerals + max_workers_vespene:
-                worker_deficit = max_workers_minerals + max_workers_vespene - num_workers_mining
-                base.saturated_vespene_time = self.time + worker_deficit*12/num_townhalls
-            # Making workers costs money, deduct their presume spent money on workers. 
-            self.enemy_minerals_mined -= (num_workers_mining - num_known_workers_mining)*50
-            # Estimate mining rate. Assume minerals are filled, then gas following what most people do.
-            mineral_mining_rate = (660/8)/60 # Mining rate per mineral patch. x1.4 for gold.
-            vespene_mining_rate = 114/60 # Mineral rate per gas. x2 for purple.
-            average_workers_minerals = (min(num_known_workers_mining, max_workers_minerals) + min(num_workers_mining, max_workers_minerals))/2
-            average_workers_vespene = (min(max(num_known_workers_mining - max_workers_minerals,0),max_workers_vespene)\
-                                       + min(max(num_workers_mining - max_workers_minerals,0),max_workers_vespene))/2
-
-            # Mineral mining
-            i = 0
-            self.enemy_minerals_mined += base.minerals_available            
-            small_minerals = 0
-            large_minerals = 0
-            for mineral in mineral_fields:
-                # If we have seen it before, use last known mineral count.
-                try: # We have seen the mineral field before
-                    # Update the last time we saw the mineral field                    
-                    if self.is_visible(known_mineral_fields[i].position):
-                        self.known_minerals.remove(known_mineral_fields[i])
-                        for mineral in self.mineral_field.filter(lambda mineral: mineral not in self.known_minerals and not mineral.is_snapshot):
-                            mineral.last_update = self.time
-                        self.known_minerals += self.mineral_field.filter(lambda mineral: mineral not in self.known_minerals and not mineral.is_snapshot)                    
-                    # Last known mined contents
-                    self.enemy_minerals_mined -= known_mineral_fields[i].mineral_contents
-                    # NOTE: If minerals mined goes negative by thousands, it means the code crashed somewhere below this line.
-                    # Estimated further contents mined. Using trapezoidal rule
-                    if base.saturated_mineral_time > self.time:
-                        estimated_enemy_minerals_mined = (self.time - known_mineral_fields[i].last_update)\
-                        *mineral_mining_rate*average_workers_minerals/max_workers_minerals
-                    else:
-                        estimated_enemy_minerals_mined = (base.saturated_mineral_time - known_mineral_fields[i].last_update)\
-                        *mineral_mining_rate*average_workers_minerals/max_workers_minerals
-                        estimated_enemy_minerals_mined += (self.time - base.saturated_mineral_time)*mineral_mining_rate
-                        
-                        
-                    # Gold bases mine minerals 1.4x faster
-                    if known_mineral_fields[i].name.find('Rich') == -1:
-                        self.enemy_minerals_mined += estimated_enemy_minerals_mined
-                    else:
-                        self.enemy_minerals_mined += 1.4*estimated_enemy_minerals_mined
-                    
-                    # Count no. of small and large minerals
-                    # Small mineral fields have "750" in their name despite holding 900 because Blizzard
-                    if known_mineral_fields[i].name.find('750') == -1: 
-                        large_minerals += 1
-                    else:
-                        small_minerals += 1
-                except: # We have never seen the mineral field
-                    # Assume the mineral is being mined since the base creation.
-                    if large_minerals < small_minerals:
-                        self.enemy_minerals_mined -= 1800 # Large mineral fields hold 1800.
-                        large_minerals += 1
-                    else:
-                        self.enemy_minerals_mined -= 900 # Small mineral fields hold 900.
-                        small_minerals += 1
-                        
-                    # Estimated further contents mined. Using trapezoidal rule
-                    if base.saturated_mineral_time > self.time:
-                        estimated_enemy_minerals_mined = (self.time - base.last_update)*mineral_mining_rate*average_workers_minerals/max_workers_minerals
-                    else:
-                        estimated_enemy_minerals_mined = (base.saturated_mineral_time - base.last_update)*mineral_mining_rate*average_workers_minerals/max_workers_minerals
-                        estimated_enemy_minerals_mined += (self.time - base.saturated_mineral_time)*mineral_mining_rate
-                        
-                    # Gold bases mine minerals 1.4x faster
-                    if mineral.name.find('Rich') == -1:
-                        self.enemy_minerals_mined += estimated_enemy_minerals_mined
-                    else:
-                        self.enemy_minerals_mined += 1.4*estimated_enemy_minerals_mined
-                finally:
-                    i += 1
-                    
-            # Gas mining        
-            i = 0
-            self.enemy_vespene_mined += base.vespene_available            
-            for vespene in vespene_geysers:
-                # If we have seen it before, use last known gas count. 
-                try: # We have seen the vespene geyser before
-                    # Update the last time we saw the geyser
-                    if self.is_visible(known_vespene_geysers[i].position):
-                        self.known_gas.remove(known_vespene_geysers[i])
-                        for gas in self.vespene_geyser.filter(lambda gas: gas not in self.known_gas and not gas.is_snapshot):
-                            gas.last_update = self.time
-                        self.known_gas += self.vespene_geyser.filter(lambda gas: gas not in self.known_gas and not gas.is_snapshot)
-                    # Last known mined contents
-                    self.enemy_vespene_mined -= known_vespene_geysers[i].vespene_contents
-                    # NOTE: If vespene mined goes negative by a few thousand, it means the code crashed somewhere below this line.
-                    # Estimated further contents mined. Using trapezoidal rule
-                    if base.saturated_vespene_time > self.time:
-                        estimated_enemy_vespene_mined = (self.time - known_vespene_geysers[i].last_update)\
-                        *vespene_mining_rate*average_workers_vespene/max_workers_vespene
-                    else:
-                        estimated_enemy_vespene_mined = (base.saturated_vespene_time - known_vespene_geysers[i].last_update)\
-                        *vespene_mining_rate*average_workers_vespene/max_workers_vespene
-                        estimated_enemy_vespene_mined += (self.time - base.saturated_vespene_time)*vespene_mining_rate
-                        
-                    # Gold bases mine gas 2x faster
-                    if known_vespene_geysers[i].name.find('Rich') == -1:
-                        self.enemy_vespene_mined += estimated_enemy_vespene_mined
-                    else:
-                        self.enemy_vespene_mined += 2*estimated_enemy_vespene_mined
-                    
-                except: # We have never seen the vespene geyser
-                    # Assume gas is mined only after mineral saturation, following what most players do.
-                    self.enemy_vespene_mined -= 2250
-                        
-                    # Estimated further contents mined. Using trapezoidal rule
-                    if base.saturated_vespene_time > self.time:
-                        estimated_enemy_vespene_mined = (self.time - base.last_update)*vespene_mining_rate\
-                        *vespene_mining_rate*average_workers_vespene/max_workers_vespene
-                    else:
-                        estimated_enemy_vespene_mined = (base.saturated_vespene_time - base.last_update)*vespene_mining_rate\
-                        *vespene_mining_rate*average_workers_vespene/max_workers_vespene
-                        estimated_enemy_vespene_mined += (self.time - base.saturated_vespene_time)*vespene_mining_rate
-                        
-                    # Gold bases mine gas 2x faster
-                    if mineral.name.find('Rich') == -1:
-                        self.enemy_vespene_mined += estimated_enemy_vespene_mined
-                    else:
-                        self.enemy_vespene_mined += 2*estimated_enemy_vespene_mined
-                finally:
-                    i += 1                    
-        self.enemy_minerals = self.enemy_minerals_mined - self.enemy_minerals_spent
-        self.enemy_vespene = self.enemy_vespene_mined - self.enemy_vespene_spent
-                    
+    async def track_enemy_economy(self, iteration):
+        # Track enemy resources. The mining model of each enemy base is only recomputed when we observe something there, see economy.py.
+        self.expansion_resources.update(self.mineral_field, self.vespene_geyser)
+        self.enemy_minerals_mined, self.enemy_vespene_mined = self.enemy_economy.update(self, self.expansion_resources)
+        self.enemy_minerals = self.enemy_minerals_mined - self.enemy_ledger.minerals_spent
+        self.enemy_vespene = self.enemy_vespene_mined - self.enemy_ledger.vespene_spent
+        
+    async def check_detection(self, iteration):
         # Determine if we need detection for enemy cloaked/burrowed units
         # DECIDE: What about burrow roaches? Baneling bombs? Should we preemptively build detection for tech lab starports? What about for clearing creep?
-        if self.enemy_structures.of_type(STARPORT):
-            for starport in self.enemy_structures.of_type(STARPORT):
+        if self.enemy_types(STARPORT):
+            for starport in self.enemy_types(STARPORT):
                 if starport.has_techlab:
                     self.need_detection = True
                     return
         if self.known_enemy_units.of_type({WIDOWMINE, GHOST, BANSHEE, DARKTEMPLAR, MOTHERSHIP, LURKERMP, INFESTOR}) \
-        or self.enemy_structures.of_type({GHOSTACADEMY, DARKSHRINE, LURKERDEN}):
+        or self.enemy_types({GHOSTACADEMY, DARKSHRINE, LURKERDEN}):
             self.need_detection = True
-        if self.units(OBSERVER):
+        if self.own(OBSERVER):
             self.have_detection = True
         else:
             self.have_detection = False           
         
-        # Track our units
-        self.all_army = self.units - self.units(PROBE) - self.units(INTERCEPTOR) - self.units(HIGHTEMPLAR)# Don't touch HTs until they morph archons/I make logic for spellcasting!        
-        # Assumes we actually have the resources to afford these units
-        defender_advantage = 60 # Amount of extra production time's worth of units we make while enemy is on the way to our base
-        pending_units = np.zeros(len(self.own_army_race))
-        pending_units[self.best_stargate_unit.id] = num_stargates*defender_advantage/self.best_stargate_unit.build_time
-        pending_units[self.best_robo_unit.id] = num_robos*defender_advantage/self.best_robo_unit.build_time
-        pending_units[self.best_warpgate_unit.id] = num_warpgates*defender_advantage/self.best_warpgate_unit.build_time
-        future_own_units = pending_units
-        
-        
+    async def update_threat(self, iteration):
         # Calculate which unit is most effective vs the enemy current and future units
-        # Only recalculate threat level if either army has changed to avoid unnecessary calculations.
-        if not self.last_army_supply == self.supply_army or not self.last_known_enemy_amount == len(self.known_enemy_units):
+        # Only re-estimate future enemy units if either army has changed to avoid unnecessary calculations.
+        if self.army_changed('update_threat'):
             # TODO: Implement self.future_enemy_units. Calculates how many and of what type of units we may face in the future. 
             # How many: Each time we see their bases, count their workers and bases. We can assume that they will fill up inner bases before outer bases.
             # Assume that they constantly produce workers up to the number of bases we last saw, and mine 6 gas for every 16 minerals in that ratio, regardless of worker count.
@@ -949,18 +686,26 @@ class TheUnseenz(sc2.BotAI):
             # Also: mineral-gas ratios should be considered, but how?
             
             # What type: Based on the tech and production we see, calculate possible tech switches and amount of units in the future. More likely to see units we already see and new tech that was added.
-            total_unit_value = self.enemy_army_value[0] + self.gas_value*self.enemy_army_value[1]
+            total_unit_value = self.enemy_ledger.army_value[0] + self.gas_value*self.enemy_ledger.army_value[1]
             current_future_unit_ratio = 0.75 # Ratio of assuming enemy will make more of what they currently have vs tech switching. Higher ratio = harder counters, lower ratio = more generalist approach
             future_enemy_units = np.zeros(len(self.enemy_army_race))
             for enemy_army in self.enemy_army_race:
                 # Current_future_unit_ratio = % of army of that unit type
                 # Unit_ratio = 
-                unit_ratio = (self.known_enemy_units(enemy_army).amount*enemy_army.minerals + self.gas_value*self.known_enemy_units(enemy_army).amount*enemy_army.vespene)/max(total_unit_value,50)
+                unit_ratio = (self.known_enemy_units.amount_of(enemy_army.type_id)*enemy_army.minerals + self.gas_value*self.known_enemy_units.amount_of(enemy_army.type_id)*enemy_army.vespene)/max(total_unit_value,50)
                 unit_ratio = unit_ratio*current_future_unit_ratio + (1-current_future_unit_ratio)/len(self.enemy_army_race)
                 future_enemy_units[enemy_army.id] += unit_ratio*future_unit_value/(enemy_army.minerals + self.gas_value*enemy_army.vespene)
                 
-            self.threat_level = self.calculate_threat_level(self.own_army_race, self.all_army, self.enemy_army_race, self.known_enemy_units, future_own_units, future_enemy_units)
+            self.future_enemy_units = future_enemy_units
+            
+        # The threat model only recomputes the unit types whose counts or future units changed, so the threat level can be kept fresh every step.
+        if self.last_threat_resync is None or self.time - self.last_threat_resync > self.THREAT_RESYNC_TIME:
+            self.threat_model.resync(self.all_army, self.known_enemy_units)
+            self.last_threat_resync = self.time
+        self.threat_model.set_future(self.pending_units, self.future_enemy_units)
+        self.threat_level = self.threat_model.threat_level()
         
+    async def micro(self, iteration):
         # Micro  
         # Self.all_army = F2 
         # If we are close to max supply, attack closes enemy unit/building, or if none is visible: attack move towards enemy spawn
@@ -973,16 +718,19 @@ class TheUnseenz(sc2.BotAI):
         # TODO: How to deal with high ground vision and choke points?
         # Don't repeat the same command on every frame, it's unnecessary apm and causes lag!
         # Choose target and attack, filter out invisible targets
-        targets = (self.enemy_units | self.enemy_structures).filter(lambda unit: unit.can_be_attacked and not self.units({LARVA, EGG, INTERCEPTOR}))
-        defenceless_targets = self.enemy_units.of_type({SCV, PROBE, DRONE, OVERLORD, OVERSEER})\
+        targets = (self.enemy_units | self.enemy_structures).filter(lambda unit: unit.can_be_attacked and unit.type_id not in {LARVA, EGG, INTERCEPTOR})
+        defenceless_targets = self.enemy_types({SCV, PROBE, DRONE, OVERLORD, OVERSEER})\
         | self.enemy_structures.exclude_type({MISSILETURRET, PLANETARYFORTRESS, PHOTONCANNON, SPINECRAWLER, SPORECRAWLER})
         if self.all_army:
             army_center = self.all_army.center
+            # Closest target of every army unit, found for the whole army at once.
+            closest_targets = dict(zip([army.tag for army in self.all_army], NearestUnits(targets).closest(self.all_army)))
+            army_center_distances = self.distances.squared_to(self.all_army, army_center)
             
             
         # Worker scout on pylon start. Helps a lot in detecting early rushes, especially 1-base all-ins!
-        if self.structures(PYLON) and not self.worker_scout:
-            self.worker_scout = self.units(PROBE).closest_to(self.enemy_start_locations[0])
+        if self.own(PYLON) and not self.worker_scout:
+            self.worker_scout = self.own(PROBE).closest_to(self.enemy_start_locations[0])
             
         elif self.worker_scout:
             self.send_scout(self.worker_scout)
@@ -992,24 +740,24 @@ class TheUnseenz(sc2.BotAI):
             if targets:
                 # If the enemy is not a threat, group up all army to attack together.
                 if True: #min(threat_level) < 1:
-                    target = targets.closest_to(army)
+                    target = closest_targets[army.tag]
                     # Unit has no attack, stay near other army units
                     if not army.can_attack and not army.is_moving:
-                        army.move(self.all_army.closest_to(army))
+                        army.move(self.distances.closest_to(self.all_army, army, self.all_army))
                     # Attack: If unit has attack ready and enemy is in range/are near enough for us to hit without overextending 
                     elif army.weapon_ready and \
                     (army.target_in_range(target) or (army.target_in_range(target, bonus_distance = self.kite_distance) and target.movement_speed < army.movement_speed)):
                         army.attack(target)
-                        if army in self.units(VOIDRAY) and target.is_armored:
+                        if army.type_id == VOIDRAY and target.is_armored:
                             army(EFFECT_VOIDRAYPRISMATICALIGNMENT)
                     # Unit has just attacked, stutter step while waiting for attack cooldown
                     elif army.target_in_range(target, bonus_distance = army.distance_to_weapon_ready):
                         kite_pos = army.position.towards(target.position, -10)
                         army.move(kite_pos)
                     # Attack: Agressor
-                    elif not (targets not in defenceless_targets) or army.distance_to_squared(army_center) < 225:
+                    elif not (targets not in defenceless_targets) or army_center_distances[self.distances.index(self.all_army, army)] < 225:
                         army.attack(target)
-                        if army in self.units(VOIDRAY) and target.is_armored:
+                        if army.type_id == VOIDRAY and target.is_armored:
                             army(EFFECT_VOIDRAYPRISMATICALIGNMENT)
                     # Regroup
                     else:
@@ -1083,9 +831,9 @@ class TheUnseenz(sc2.BotAI):
         
                     
         # Morph archons            
-        if self.units(HIGHTEMPLAR).idle.ready.amount >= 2:
-            ht1 = self.units(HIGHTEMPLAR).idle.ready.random
-            ht2 = next((ht for ht in self.units(HIGHTEMPLAR).idle.ready if ht.tag != ht1.tag), None)
+        if self.own.idle(HIGHTEMPLAR).ready.amount >= 2:
+            ht1 = self.own.idle(HIGHTEMPLAR).ready.random
+            ht2 = next((ht for ht in self.own.idle(HIGHTEMPLAR).ready if ht.tag != ht1.tag), None)
             from s2clientprotocol import raw_pb2 as raw_pb
             from s2clientprotocol import sc2api_pb2 as sc_pb
             command = raw_pb.ActionRawUnitCommand(
@@ -1098,6 +846,7 @@ class TheUnseenz(sc2.BotAI):
                     actions=[sc_pb.Action(action_raw=action)]
                 ))
         
+    async def manage_bases(self, iteration):
         #Find the buildings that are building, and have low health. Low health = less than 10% total hp
         for building in self.structures.filter(lambda x: x.build_progress < 1 and (x.health + x.shield)/(x.health_max + x.shield_max) < 0.1):
             building(CANCEL)
@@ -1107,106 +856,117 @@ class TheUnseenz(sc2.BotAI):
             # Attack with all workers if we don't have any nexuses left, attack-move on enemy spawn (doesn't work on 4 player map) so that probes auto attack on the way
             for worker in self.workers:
                 worker.attack(self.enemy_start_locations[0])
-            return
+            return False
         else:
-            nexus = self.townhalls.ready.random
+            nexus = self.nexus = self.townhalls.ready.random
 
 
         # If this random nexus is not idle and has not chrono buff, chrono it with one of the nexuses we have. If we are near saturation, save the chrono.
         # TODO: Chrono important units (i.e. first 2 colossus, or tempest vs brood lords) or upgrades
         if not nexus.is_idle and not nexus.has_buff(CHRONOBOOSTENERGYCOST) and self.supply_workers < self.MAX_WORKERS - 25:
-            nexuses = self.structures(NEXUS)
-            abilities = await self.get_available_abilities(nexuses)
-            for loop_nexus, abilities_nexus in zip(nexuses, abilities):
-                if EFFECT_CHRONOBOOSTENERGYCOST in abilities_nexus:
-                    loop_nexus(EFFECT_CHRONOBOOSTENERGYCOST, nexus)
-                    break
-                
+            with self.profiler.section('chronoboost'):
+                nexuses = self.own(NEXUS)
+                abilities = await self.ability_cache.of_units(nexuses)
+                for loop_nexus, abilities_nexus in zip(nexuses, abilities):
+                    if EFFECT_CHRONOBOOSTENERGYCOST in abilities_nexus:
+                        loop_nexus(EFFECT_CHRONOBOOSTENERGYCOST, nexus)
+                        break
+        
+    async def distribute_workers(self, iteration):
+        mineral_rate, vespene_rate = self.mineral_rate, self.vespene_rate
         # Distribute workers in gas and across bases. Takes into account our mineral-gas expenditure ratio.
         # We don't need to check for oversaturation so often.
-        if iteration%(self.ITERATIONS_PER_MINUTE/4) == 0:
-            if vespene_rate:
-                self.resource_ratio = mineral_rate/vespene_rate
-            else:
-                self.resource_ratio = 4            
-            await self.better_distribute_workers(self.resource_ratio)
+        if vespene_rate:
+            self.resource_ratio = mineral_rate/vespene_rate
+        else:
+            self.resource_ratio = 4            
+        # Catch up with the orders the game gave on its own, e.g. rallied workers and workers done building.
+        self.harvesters.sync(self.workers, self.mineral_field.tags | self.gas_buildings.tags)
+        await self.better_distribute_workers(self.resource_ratio)
+        
+    async def idle_workers(self, iteration):
         # Idle workers should mine minerals, even if its oversaturated.
         # We do need to check for idle workers frequently. Workers that we need for other purposes should be kept moving or patroling to avoid pulling them to mine.
         for worker in self.workers.idle:
             closest_mineral_patch = self.mineral_field.closest_to(self.townhalls.closest_to(worker))
             worker.gather(closest_mineral_patch)
+            self.harvesters.assign(worker.tag, closest_mineral_patch.tag)
         
-
+    async def find_placements(self, iteration):
         # Choose building placement
         # Pylon positions = Walling placement, then next to unpowered buildings, then next to nexus without pylons, then next to other buildings. 
         # Pylons have a power field of radius 6.5
         # TODO: Avoid mineral line and walling our stuff in (still happens sometimes)
         # TODO: Spotter pylons
+        # Placements are kept while they are still free and wanted for the same reason, and checked on our own copy of the
+        # placement grid. Only new placements are confirmed by the game, all in one query (see placement.py).
+        placements = self.placements
+        wall_pylon = self.main_base_ramp.protoss_wall_pylon
         
-        if await self.can_place(PYLON, self.main_base_ramp.protoss_wall_pylon):
-            pylon_placement = self.main_base_ramp.protoss_wall_pylon
+        if placements.is_free(PYLON, wall_pylon):
+            placements.want('pylon', PYLON, wall_pylon, max_distance=0, key='wall')
         else:
             # Prioritize putting pylons near each nexus for warp-in and static defense access. We only need about 3 at most per nexus.
             pylons_near_nexus = []
-            for nexus in self.structures(NEXUS):
-                pylons_near_nexus.append(self.structures(PYLON).closer_than(6.5, nexus).amount)
-            if min(pylons_near_nexus) < 3: 
-                nexus_fewest_pylons = self.structures(NEXUS)[np.argmin(pylons_near_nexus)]
-                pylon_placement = await self.find_placement(PYLON, near=nexus_fewest_pylons.position.towards(self.game_info.map_center,5), placement_step=5)
+            for nexus in self.own(NEXUS):
+                pylons_near_nexus.append(self.own(PYLON).closer_than(6.5, nexus).amount)
+            if pylons_near_nexus and min(pylons_near_nexus) < 3: 
+                nexus_fewest_pylons = self.own(NEXUS)[np.argmin(pylons_near_nexus)]
+                placements.want('pylon', PYLON, nexus_fewest_pylons.position.towards(self.game_info.map_center,5), placement_step=5, key=nexus_fewest_pylons.tag)
             else:
                 # We already have our minimum pylons per base. 
-                random_building = self.structures.exclude_type({NEXUS, ASSIMILATOR, PYLON}).random
-                if random_building is None:
-                    random_building = self.structures.random
-                pylon_placement = await self.find_placement(PYLON, near=random_building.position.towards(self.game_info.map_center,5), placement_step=5)
+                def near_random_building():
+                    random_building = self.structures.exclude_type({NEXUS, ASSIMILATOR, PYLON}).random_or(None)
+                    if random_building is None:
+                        random_building = self.structures.random
+                    return random_building.position.towards(self.game_info.map_center,5)
+                placements.want('pylon', PYLON, near_random_building, placement_step=5, key='building')
                 
 #            pylon_placement = await self.find_placement(PYLON, near=nexus.position.towards(self.game_info.map_center, 5))
             
         # Building placement = Walling placement, then ... next to any pylon? 
         # Production -> Any pylon, Tech -> Furthest from enemy base, defence structures -> Nearest to enemy base. Prioritize plugging the wall, but not with defences        
-        if self.structures(PYLON).ready:
-            pylon = self.structures(PYLON).ready.random
-            proxy = self.structures(PYLON).closest_to(self.enemy_start_locations[0])
-            hidden = self.structures(PYLON).furthest_to(self.enemy_start_locations[0])
+        if self.own.ready(PYLON):
+            proxy = self.own(PYLON).closest_to(self.enemy_start_locations[0])
+            hidden = self.own(PYLON).furthest_to(self.enemy_start_locations[0])
+            
+            def near_random_pylon(distance=0):
+                return lambda: self.own.ready(PYLON).random.position.towards(self.game_info.map_center, distance)
             
             # Build the wall!
-            if await self.can_place(GATEWAY, self.main_base_ramp.protoss_wall_buildings[0]):
-                building_placement = self.main_base_ramp.protoss_wall_buildings[0]
-                tech_placement = self.main_base_ramp.protoss_wall_buildings[0]
-            elif await self.can_place(GATEWAY, self.main_base_ramp.protoss_wall_buildings[1]):
-                building_placement = self.main_base_ramp.protoss_wall_buildings[1]
-                tech_placement = self.main_base_ramp.protoss_wall_buildings[1]                
+            found = {}
+            wall = [position for position in self.main_base_ramp.protoss_wall_buildings if placements.is_free(GATEWAY, position)]
+            if wall:
+                found['building'] = placements.want('building', GATEWAY, wall[0], max_distance=0, key=wall[0])
+                found['tech'] = placements.want('tech', CYBERNETICSCORE, wall[0], max_distance=0, key=wall[0])
             else:
                 # We already have the wall. Put our buildings ... anywhere?
-                building_placement = await self.find_placement(GATEWAY, near=pylon.position.towards(self.game_info.map_center,3), placement_step = 3)
-                tech_placement = await self.find_placement(CYBERNETICSCORE, near=hidden.position.towards(self.game_info.map_center, -3), placement_step = 3)
+                found['building'] = placements.want('building', GATEWAY, near_random_pylon(3), placement_step=3, key='pylon')
+                found['tech'] = placements.want('tech', CYBERNETICSCORE, hidden.position.towards(self.game_info.map_center, -3), placement_step=3, key=hidden.tag)
             
-            defence_placement_small = await self.find_placement(SHIELDBATTERY, near=proxy.position)
-            tech_placement_small = await self.find_placement(DARKSHRINE, near=hidden.position)
-            warpin_placement = await self.find_placement(WARPGATETRAIN_STALKER, near=proxy.position.to2.random_on_distance(4), placement_step = 1)
+            found['defence_small'] = placements.want('defence_small', SHIELDBATTERY, proxy.position, key=proxy.tag)
+            found['tech_small'] = placements.want('tech_small', DARKSHRINE, hidden.position, key=hidden.tag)
+            found['warpin'] = placements.want('warpin', WARPGATETRAIN_STALKER, lambda: proxy.position.to2.random_on_distance(4), placement_step=1, key=proxy.tag)
             # Can't find placement, place randomly
-            while building_placement is None:
-                pylon = self.structures(PYLON).ready.random
-                building_placement = await self.find_placement(GATEWAY, near=pylon.position)
-            while tech_placement is None:
-                pylon = self.structures(PYLON).ready.random
-                tech_placement = await self.find_placement(CYBERNETICSCORE, near=pylon.position)
-            while defence_placement_small is None:
-                pylon = self.structures(PYLON).ready.random
-                defence_placement_small = await self.find_placement(SHIELDBATTERY, near=pylon.position) 
-            while tech_placement_small is None:
-                pylon = self.structures(PYLON).ready.random
-                tech_placement_small = await self.find_placement(DARKSHRINE, near=pylon.position) 
-            while warpin_placement is None:
-                pylon = self.structures(PYLON).ready.random
-                warpin_placement = await self.find_placement(WARPGATETRAIN_STALKER, near=pylon.position, placement_step=1)
+            for name, unit_type, placement_step in (('building', GATEWAY, 2), ('tech', CYBERNETICSCORE, 2), ('defence_small', SHIELDBATTERY, 2),
+                                                    ('tech_small', DARKSHRINE, 2), ('warpin', WARPGATETRAIN_STALKER, 1)):
+                if not found[name]:
+                    placements.want(name, unit_type, near_random_pylon(), placement_step=placement_step, key='random')
+        await placements.resolve()
         
-
+        self.pylon_placement = placements['pylon']
+        self.building_placement, self.tech_placement, self.tech_placement_small = placements['building'], placements['tech'], placements['tech_small']
+        self.defence_placement_small, self.warpin_placement = placements['defence_small'], placements['warpin']
+        
+    async def build_economy(self, iteration):
+        supply_rate, ideal_gas_buildings, num_production = self.supply_rate, self.ideal_gas_buildings, self.num_production
+        nexus, pylon_placement = self.nexus, self.pylon_placement
+        save_resources = 0
         # Calculate rate of supply consumption to supply remaining and preemptively build a dynamic amount of supply. Stop once we reach the 200 supply cap.
         # TODO: Include pending supply from town halls into supply calculations.
         if (self.supply_left + self.already_pending(PYLON)*8) < supply_rate*self.SUPPLY_BUILD_TIME and (self.supply_cap + self.already_pending(PYLON)*8) <200:
             # Always check if you can afford something before you build it
-            if self.can_afford(PYLON):
+            if self.can_afford(PYLON) and pylon_placement is not None:
                 await self.build(PYLON, near=pylon_placement)
 
         # Train probe on nexuses that are undersaturated until worker cap 
@@ -1219,16 +979,16 @@ class TheUnseenz(sc2.BotAI):
         if self.supply_workers + self.NEXUS_SUPPLY_RATE*self.NEXUS_BUILD_TIME >= \
         (self.townhalls.ready.amount + self.already_pending(NEXUS))*16 + min(ideal_gas_buildings, self.townhalls.amount*2)*3 and self.threat_level < 2:
             if self.can_afford(NEXUS):
-                await self.expand_now(max_distance = 0)
+                await self.expand_now(max_distance = 0, location=self.expansions.next_free())
             # If we need an expansion but don't have resources, save for it unless we are in danger
             elif self.threat_level < 2:
                 save_resources = 1
         # If we have reached max workers and have a lot more minerals than gas, expand for more gas.
         elif self.supply_workers > self.MAX_WORKERS-10 and self.minerals > 1000 and ideal_gas_buildings > self.townhalls.amount*2 and self.already_pending(NEXUS) == 0:
-            await self.expand_now(max_distance = 0)
+            await self.expand_now(max_distance = 0, location=self.expansions.next_free())
             
         # Build gas near completed nexuses, dynamically adjusted for how much gas we need for the units we want to make.        
-        if (self.structures(ASSIMILATOR).ready.amount + self.already_pending(ASSIMILATOR)) < ideal_gas_buildings and num_production:
+        if (self.own.ready(ASSIMILATOR).amount + self.already_pending(ASSIMILATOR)) < ideal_gas_buildings and num_production:
             for nexus in self.townhalls.ready:
                 vgs = self.vespene_geyser.closer_than(10, nexus)                
                 for vg in vgs:
@@ -1242,143 +1002,147 @@ class TheUnseenz(sc2.BotAI):
                         worker.stop(queue=True)
                         break
 #                        
-
-                
+        self.save_resources = save_resources
+        
+    async def score_units(self, iteration):
+        mineral_rate, vespene_rate = self.mineral_rate, self.vespene_rate
         # Calculate best unit to make. Only recalculate if either army has changed to avoid unnecessary calculations.
-        if not self.last_army_supply == self.supply_army or not self.last_known_enemy_amount == len(self.known_enemy_units):            
+        if self.army_changed('score_units'):
+            # Score every unit we can make in one batch: candidate i is our pending units plus a minute of mining spent on unit id i.
+            # Future unit value: Resources mined in 1 minute
+            future_unit_value = np.full(len(self.own_army_race), mineral_rate + self.gas_value*vespene_rate)
+            # Teching up costs money!
+            for tech_building, tech_units in self.tech_requirements.items():
+                if not self.own(tech_building):
+                    tech_cost = self.calculate_unit_value(tech_building)
+                    for tech_unit in tech_units:
+                        if tech_unit in self.own_army_race:
+                            future_unit_value[self.own_army_race[tech_unit].id] -= (tech_cost.minerals + self.gas_value*tech_cost.vespene)
+            # If teching up is somehow more expensive than we have money, don't even bother calculating. These units keep a score of 0.
+            candidates = np.flatnonzero(future_unit_value >= 0)
+            future_own_units = np.tile(self.pending_units, (len(candidates), 1))
+            future_own_units[np.arange(len(candidates)), candidates] += future_unit_value[candidates]\
+                /(self.own_army_race.minerals[candidates] + self.gas_value*self.own_army_race.vespene[candidates])
             self.unit_score = np.zeros(len(self.own_army_race))
-            i = 0
-            for own_army in self.own_army_race:
-                # Future unit value: Resources mined in 1 minute
-                future_unit_value = (mineral_rate + self.gas_value*vespene_rate)
-                future_own_units = pending_units.copy()
-                # Teching up costs money!
-                if own_army in [TEMPEST, CARRIER, MOTHERSHIP] and not self.structures(FLEETBEACON):
-                    future_unit_value -= (self.calculate_unit_value(FLEETBEACON).minerals + self.gas_value*self.calculate_unit_value(FLEETBEACON).vespene)
-                if own_army in [COLOSSUS, DISRUPTOR] and not self.structures(ROBOTICSBAY):
-                    future_unit_value -= (self.calculate_unit_value(ROBOTICSBAY).minerals + self.gas_value*self.calculate_unit_value(ROBOTICSBAY).vespene)
-                if own_army in [ARCHON] and not self.structures(TEMPLARARCHIVE):
-                    future_unit_value -= (self.calculate_unit_value(TEMPLARARCHIVE).minerals + self.gas_value*self.calculate_unit_value(TEMPLARARCHIVE).vespene)
-                if own_army in [DARKTEMPLAR] and not self.structures(DARKSHRINE):
-                    future_unit_value -= (self.calculate_unit_value(DARKSHRINE).minerals + self.gas_value*self.calculate_unit_value(DARKSHRINE).vespene)
-                # If teching up is somehow more expensive than we have money, don't even bother calculating.
-                if future_unit_value < 0:
-                    continue
-                future_own_units[i] += future_unit_value/(own_army.minerals + self.gas_value*own_army.vespene)
-                self.unit_score[own_army.id] = self.calculate_threat_level(self.own_army_race, self.all_army, self.enemy_army_race, self.known_enemy_units, future_own_units, future_enemy_units)
-                i += 1
-
+            if len(candidates):
+                self.unit_score[candidates] = self.calculate_threat_levels(self.own_army_race, self.all_army, self.enemy_army_race, self.known_enemy_units, future_own_units, self.future_enemy_units)
+        
+    async def production(self, iteration):
+        mineral_income, mineral_rate = self.mineral_income, self.mineral_rate
+        save_resources = self.save_resources
+        building_placement, tech_placement, tech_placement_small = self.building_placement, self.tech_placement, self.tech_placement_small
+        defence_placement_small, warpin_placement = self.defence_placement_small, self.warpin_placement
         # Tech up
         # TODO: If we need a high-tech unit more quickly, have a weightage for tech-rushing that unit
         # TODO: Consider how much army we currently have to determine if it is safe to tech up.
         # TODO: Include every upgrade in the game, and consider how many of the unit we plan to use in the future (i.e. start charge before we have zealots if we want them soon)
-        warpgate_tech = [ARCHON.id] # Disabled dark templars until I figure out a fix for threat level!
-        stargate_tech = [TEMPEST.id] # Carriers bugged, take them out!
-        robo_tech = [COLOSSUS.id]
+        warpgate_tech = [self.unit_stats[ARCHON].id] # Disabled dark templars until I figure out a fix for threat level!
+        stargate_tech = [self.unit_stats[TEMPEST].id] # Carriers bugged, take them out!
+        robo_tech = [self.unit_stats[COLOSSUS].id]
         self.best_unit = np.argmin(self.unit_score)
         
-        if self.structures(PYLON).ready:
+        if self.own.ready(PYLON) and building_placement is not None:
             # If we have a gateway completed, build cyber core
-            if self.structures(GATEWAY).ready or self.structures(WARPGATE):
-                if not self.structures(CYBERNETICSCORE):
+            if self.own.ready(GATEWAY) or self.own(WARPGATE):
+                if not self.own(CYBERNETICSCORE):
                     if self.can_afford(CYBERNETICSCORE) and self.already_pending(CYBERNETICSCORE) == 0:
                         await self.build(CYBERNETICSCORE, near=tech_placement)
                 else:
                     # If cybercore is ready, research warpgate
                     if (
-                            self.structures(CYBERNETICSCORE).ready
+                            self.own.ready(CYBERNETICSCORE)
                             and self.can_afford(RESEARCH_WARPGATE)
                             and self.already_pending_upgrade(WARPGATERESEARCH) == 0
                     ):
-                        ccore = self.structures(CYBERNETICSCORE).ready.first
+                        ccore = self.own.ready(CYBERNETICSCORE).first
                         ccore(RESEARCH_WARPGATE)
             
             # If we have no gateway, build gateway
-            elif self.can_afford(GATEWAY) and self.structures(GATEWAY).amount == 0:
+            elif self.can_afford(GATEWAY) and self.own(GATEWAY).amount == 0:
                 await self.build(GATEWAY, near=building_placement)
             
             # Tech up. Don't tech up if threat level is too high! Exception: Making detection
             if self.threat_level < 2:
                 # Tech: Upgrade warpgate units                        
-                if self.best_unit in warpgate_tech or len(self.units(ZEALOT)) > 5 or len(self.units(STALKER)) > 10 or len(self.units(ADEPT)) > 10:
-                    if self.structures(CYBERNETICSCORE).ready:
-                        if not self.structures(TWILIGHTCOUNCIL):
+                if self.best_unit in warpgate_tech or len(self.own(ZEALOT)) > 5 or len(self.own(STALKER)) > 10 or len(self.own(ADEPT)) > 10:
+                    if self.own.ready(CYBERNETICSCORE):
+                        if not self.own(TWILIGHTCOUNCIL):
                             if self.can_afford(TWILIGHTCOUNCIL) and self.already_pending(TWILIGHTCOUNCIL) == 0:
                                 await self.build(TWILIGHTCOUNCIL, near=tech_placement)
                                 
                         else:
-                            if self.structures(TWILIGHTCOUNCIL).ready:
-                                twilight = self.structures(TWILIGHTCOUNCIL).ready.first
+                            if self.own.ready(TWILIGHTCOUNCIL):
+                                twilight = self.own.ready(TWILIGHTCOUNCIL).first
                                 # If we have lots of zealot/stalker/adept, research charge/blink/glaives
-                                if self.units(ZEALOT).amount > 5:
+                                if self.own(ZEALOT).amount > 5:
                                     if self.can_afford(RESEARCH_CHARGE) and self.already_pending_upgrade(CHARGE) == 0:
                                         twilight.research(CHARGE)
                                     elif not self.can_afford(RESEARCH_CHARGE):
                                         save_resources = 1
-                                if self.units(STALKER).amount > 10:
+                                if self.own(STALKER).amount > 10:
                                     if self.can_afford(RESEARCH_BLINK) and self.already_pending_upgrade(BLINKTECH) == 0:
                                         twilight.research(BLINKTECH)
                                     elif not self.can_afford(RESEARCH_BLINK):
                                         save_resources = 1
-                                if self.units(ADEPT).amount > 10:
+                                if self.own(ADEPT).amount > 10:
                                     if self.can_afford(RESEARCH_ADEPTRESONATINGGLAIVES) and self.already_pending_upgrade(ADEPTPIERCINGATTACK) == 0:
                                         twilight.research(ADEPTPIERCINGATTACK)
                                     elif not self.can_afford(RESEARCH_ADEPTRESONATINGGLAIVES):
                                         save_resources = 1
                                         
                                 # If we want archons, build templar archives
-                                if self.best_unit == ARCHON.id and self.structures(TWILIGHTCOUNCIL).ready:
-                                    if not self.structures(TEMPLARARCHIVE):
+                                if self.best_unit == self.unit_stats[ARCHON].id and self.own.ready(TWILIGHTCOUNCIL):
+                                    if not self.own(TEMPLARARCHIVE):
                                         if self.can_afford(TEMPLARARCHIVE) and self.already_pending(TEMPLARARCHIVE) == 0:
                                             await self.build(TEMPLARARCHIVE, near=tech_placement)
                                             
                                 # If we want DTs, build dark shrine
                                 # TODO: Or if we are maxed out or if they have no detection
-                                if self.best_unit == DARKTEMPLAR.id and self.structures(TWILIGHTCOUNCIL).ready:
-                                    if not self.structures(DARKSHRINE):
+                                if self.best_unit == self.unit_stats[DARKTEMPLAR].id and self.own.ready(TWILIGHTCOUNCIL):
+                                    if not self.own(DARKSHRINE):
                                         if self.can_afford(DARKSHRINE) and self.already_pending(DARKSHRINE) == 0:
                                             await self.build(DARKSHRINE, near=tech_placement_small)
                 
                     # Tech: T3 stargate                                        
                     if self.best_unit in stargate_tech:
-                        if self.structures(STARGATE).ready:
-                            if not self.structures(FLEETBEACON):
+                        if self.own.ready(STARGATE):
+                            if not self.own(FLEETBEACON):
                                 if self.can_afford(FLEETBEACON) and self.already_pending(FLEETBEACON) == 0:
                                     await self.build(FLEETBEACON, near=tech_placement)
                                 elif not self.can_afford(FLEETBEACON):
                                     save_resources = 1
                         # If we have no stargate, make one
-                        elif not self.structures(STARGATE):
+                        elif not self.own(STARGATE):
                             if self.can_afford(STARGATE) and self.already_pending(STARGATE) == 0:
                                 await self.build(STARGATE, near=building_placement)
                                 
                     # Tech: T3 robo    
                     if self.best_unit in robo_tech:                
-                        if self.structures(ROBOTICSFACILITY).ready:
-                            if not self.structures(ROBOTICSBAY):
+                        if self.own.ready(ROBOTICSFACILITY):
+                            if not self.own(ROBOTICSBAY):
                                 if self.can_afford(ROBOTICSBAY) and self.already_pending(ROBOTICSBAY) == 0:
                                     await self.build(ROBOTICSBAY, near=tech_placement)
                                 elif not self.can_afford(ROBOTICSBAY):
                                     save_resources = 1
                             # Research thermal lance        
-                            elif self.structures(ROBOTICSBAY).ready:
-                                robobay = self.structures(ROBOTICSBAY).ready.first
+                            elif self.own.ready(ROBOTICSBAY):
+                                robobay = self.own.ready(ROBOTICSBAY).first
                                 if self.can_afford(RESEARCH_EXTENDEDTHERMALLANCE) and self.already_pending_upgrade(EXTENDEDTHERMALLANCE) == 0:
                                     robobay.research(EXTENDEDTHERMALLANCE)
                         # If we have no robo facility, make one
-                        elif not self.structures(ROBOTICSFACILITY):
+                        elif not self.own(ROBOTICSFACILITY):
                             if self.can_afford(ROBOTICSFACILITY) and self.already_pending(ROBOTICSFACILITY) == 0:
                                 await self.build(ROBOTICSFACILITY, near=building_placement)
                 
             # Make detection if needed
             if self.need_detection and not self.have_detection and not self.already_pending(OBSERVER):
-                if self.structures(ROBOTICSFACILITY).ready:
-                    for rb in self.structures(ROBOTICSFACILITY).idle:
+                if self.own.ready(ROBOTICSFACILITY):
+                    for rb in self.own.idle(ROBOTICSFACILITY):
                         if self.can_afford(OBSERVER):
                             rb.train(OBSERVER)
                         elif not self.can_afford(OBSERVER):
                             save_resources = 1
-                elif not self.structures(ROBOTICSFACILITY):
+                elif not self.own(ROBOTICSFACILITY):
                     if self.can_afford(ROBOTICSFACILITY) and self.already_pending(ROBOTICSFACILITY) == 0:
                         await self.build(ROBOTICSFACILITY, near=building_placement)
                     elif not self.can_afford(ROBOTICSFACILITY):
@@ -1390,71 +1154,73 @@ class TheUnseenz(sc2.BotAI):
             if (save_resources == 0 or self.minerals > 450): # Be careful to make sure that save_resources is only asserted when we cannot afford something!
                 # Run through all our production buildings and make sure they are being used
                 # Stargate units
-                if self.structures(FLEETBEACON).ready: #Taking out oracles until I figure out logic for their energy management
-                    available_stargate_units = [PHOENIX.id, VOIDRAY.id, TEMPEST.id] # Carriers bugged, taking them out!
+                if self.own.ready(FLEETBEACON): #Taking out oracles until I figure out logic for their energy management
+                    available_stargate_units = [self.unit_stats[PHOENIX].id, self.unit_stats[VOIDRAY].id, self.unit_stats[TEMPEST].id] # Carriers bugged, taking them out!
                 else:
-                    available_stargate_units = [PHOENIX.id, VOIDRAY.id]
+                    available_stargate_units = [self.unit_stats[PHOENIX].id, self.unit_stats[VOIDRAY].id]
                 self.best_stargate_unit = self.own_army_race[available_stargate_units[np.argmin(self.unit_score[available_stargate_units])]]
-                for sg in self.structures(STARGATE).idle:
-                    if self.can_afford(self.best_stargate_unit):
-                        sg.train(self.best_stargate_unit)
+                for sg in self.own.idle(STARGATE):
+                    if self.can_afford(self.best_stargate_unit.type_id):
+                        sg.train(self.best_stargate_unit.type_id)
                 
                 # Robo units. TODO: Flag to produce observers and warp prism
-                if self.structures(ROBOTICSBAY).ready:
-                    available_robo_units = [IMMORTAL.id, COLOSSUS.id] # No logic for disruptors yet!
+                if self.own.ready(ROBOTICSBAY):
+                    available_robo_units = [self.unit_stats[IMMORTAL].id, self.unit_stats[COLOSSUS].id] # No logic for disruptors yet!
                     self.best_robo_unit = self.own_army_race[available_robo_units[np.argmin(self.unit_score[available_robo_units])]]
                 else:
-                    available_robo_units = [IMMORTAL.id]
-                    self.best_robo_unit = IMMORTAL
+                    available_robo_units = [self.unit_stats[IMMORTAL].id]
+                    self.best_robo_unit = self.unit_stats[IMMORTAL]
                 
-                for rb in self.structures(ROBOTICSFACILITY).idle:
-                    if self.can_afford(self.best_robo_unit):
-                        rb.train(self.best_robo_unit)
+                for rb in self.own.idle(ROBOTICSFACILITY):
+                    if self.can_afford(self.best_robo_unit.type_id):
+                        rb.train(self.best_robo_unit.type_id)
                 
                 # Warpgate units. Prioritize robo and stargate units.
-                available_warpgate_units = [ZEALOT.id]
-                if self.structures(CYBERNETICSCORE).ready:
-                    available_warpgate_units.append(STALKER.id)
+                available_warpgate_units = [self.unit_stats[ZEALOT].id]
+                if self.own.ready(CYBERNETICSCORE):
+                    available_warpgate_units.append(self.unit_stats[STALKER].id)
 #                    available_warpgate_units.append(SENTRY.id) # Disabled sentries until I figure out a fix for threat level
-                    available_warpgate_units.append(ADEPT.id)
-                if self.structures(TEMPLARARCHIVE).ready:
-                    available_warpgate_units.append(ARCHON.id)
-                if self.structures(DARKSHRINE).ready:
-                    available_warpgate_units.append(DARKTEMPLAR.id)
+                    available_warpgate_units.append(self.unit_stats[ADEPT].id)
+                if self.own.ready(TEMPLARARCHIVE):
+                    available_warpgate_units.append(self.unit_stats[ARCHON].id)
+                if self.own.ready(DARKSHRINE):
+                    available_warpgate_units.append(self.unit_stats[DARKTEMPLAR].id)
                 self.best_warpgate_unit = self.own_army_race[available_warpgate_units[np.argmin(self.unit_score[available_warpgate_units])]]
                 
-                if not self.structures(STARGATE).ready.idle and not self.structures(ROBOTICSFACILITY).ready.idle:
+                if not self.own.ready(STARGATE).idle and not self.own.ready(ROBOTICSFACILITY).idle:
                     # TODO: Warp-in at power field closest to enemy, but at a minimum distance away. Include warp prism power fields.
                     warp_ready = 0
-                    for wg in self.structures(WARPGATE).ready:
-                        abilities = await self.get_available_abilities(wg)
-                        if WARPGATETRAIN_ZEALOT in abilities:                            
+                    for wg in self.own.ready(WARPGATE):
+                        abilities = await self.ability_cache.of(wg)
+                        if WARPGATETRAIN_ZEALOT in abilities and warpin_placement is not None:                            
                             # If we have an odd number of high templars, add another to make a complete archon (since we don't have spellcasting logic yet)
-                            if (self.best_warpgate_unit == ARCHON or self.units(HIGHTEMPLAR).amount%2 == 1) and self.can_afford(HIGHTEMPLAR):
+                            if (self.best_warpgate_unit.type_id == ARCHON or self.own(HIGHTEMPLAR).amount%2 == 1) and self.can_afford(HIGHTEMPLAR):
                                 wg.warp_in(HIGHTEMPLAR, warpin_placement)
-                            elif self.can_afford(self.best_warpgate_unit):
-                                wg.warp_in(self.best_warpgate_unit, warpin_placement)
+                                self.placements.forget('warpin')
+                            elif self.can_afford(self.best_warpgate_unit.type_id):
+                                wg.warp_in(self.best_warpgate_unit.type_id, warpin_placement)
+                                self.placements.forget('warpin')
                             else:
                                 warp_ready += 1
                                 
                     # If warp gate is not yet researched, use gateways. Warp gate research takes 100s, gateway units take ~30s to build, already_pending returns % completion, with 1 on completion
                     if self.already_pending_upgrade(WARPGATERESEARCH) < 0.75 :
-                        for gw in self.structures(GATEWAY).idle:
+                        for gw in self.own.idle(GATEWAY):
                             if self.can_afford(STALKER):
                                 gw.train(STALKER)
                     # If all our production is not idle and we have more income than expenditure, add more production buildings. If we are supply capped, add production up to ~2x income rate                
                     # TODO: We need to scout our opponent to decide how early we need defences.
                     # Currently: Gateway->Nexus->Cyber->Stargate->Shield batteries
                     # If we let the bot build production before cyber is started, it goes gateway->gateway->cyber->nexus->stargate and doesn't get shield batteries
-                    if not self.structures(GATEWAY).ready.idle and not warp_ready:# and self.structures(CYBERNETICSCORE):
-                        if not self.structures(CYBERNETICSCORE).ready:                            
-                            available_warpgate_units.append(STALKER.id)
-                            available_warpgate_units.append(SENTRY.id)
-                            available_warpgate_units.append(ADEPT.id)
-                        if self.structures(FLEETBEACON):
-                            available_stargate_units = [PHOENIX.id, VOIDRAY.id, TEMPEST.id]
-                        if self.structures(ROBOTICSBAY):
-                            available_robo_units = [IMMORTAL.id, COLOSSUS.id]
+                    if not self.own.ready(GATEWAY).idle and not warp_ready:# and self.structures(CYBERNETICSCORE):
+                        if not self.own.ready(CYBERNETICSCORE):                            
+                            available_warpgate_units.append(self.unit_stats[STALKER].id)
+                            available_warpgate_units.append(self.unit_stats[SENTRY].id)
+                            available_warpgate_units.append(self.unit_stats[ADEPT].id)
+                        if self.own(FLEETBEACON):
+                            available_stargate_units = [self.unit_stats[PHOENIX].id, self.unit_stats[VOIDRAY].id, self.unit_stats[TEMPEST].id]
+                        if self.own(ROBOTICSBAY):
+                            available_robo_units = [self.unit_stats[IMMORTAL].id, self.unit_stats[COLOSSUS].id]
                         
                         # Update resource spending rate to be based on what units we are making
                         # Stargate:
@@ -1474,7 +1240,7 @@ class TheUnseenz(sc2.BotAI):
                         self.WARPGATE_SUPPLY_RATE = self.best_warpgate_unit.supply/self.best_warpgate_unit.build_time
                                 
                         available_units = available_warpgate_units                            
-                        if self.structures(CYBERNETICSCORE).ready:
+                        if self.own.ready(CYBERNETICSCORE):
                             for unit in available_robo_units:
                                 available_units.append(unit)
                             for unit in available_stargate_units:
@@ -1495,27 +1261,41 @@ class TheUnseenz(sc2.BotAI):
                                     await self.build(STARGATE, near=building_placement)
                         # We've already added extra production and are using them, but they still have an advantage.                                
                         elif self.threat_level > 2: # 1 extra shield battery for every 2 threat level advantage they have (2, 4...)
-                            if (self.structures(SHIELDBATTERY).amount + self.already_pending(SHIELDBATTERY)) < min(((self.threat_level/2)), 5):
+                            if (self.own(SHIELDBATTERY).amount + self.already_pending(SHIELDBATTERY)) < min(((self.threat_level/2)), 5):
                                 if self.can_afford(SHIELDBATTERY):
                                     await self.build(SHIELDBATTERY, near=defence_placement_small)
         
-        # Update frequency for threat level and ideal unit calculations
-        if iteration%20 == 0:
-            self.last_army_supply = self.supply_army
-            self.last_known_enemy_amount = len(self.known_enemy_units)
+    def army_changed(self, task):
+        # Whether either army changed since the last snapshot of task. Call only when task is about to recompute.
+        army = (self.supply_army, len(self.known_enemy_units))
+        self.army_seen[task] = army
+        return army != self.army_snapshot[task]
+        
+    async def update_army_snapshot(self, iteration):
+        # Update frequency for threat level and ideal unit calculations. Snapshots only take the armies their task has
+        # run with, so a change that happened while the task was deferred is still recomputed.
+        self.army_snapshot.update(self.army_seen)
+        
+    async def print_debug(self, iteration):
+        mineral_income, vespene_income, mineral_rate, vespene_rate, num_warpgates, num_stargates, num_robos = self.mineral_income, self.vespene_income, self.mineral_rate, self.vespene_rate, self.num_warpgates, self.num_stargates, self.num_robos
         # Debug info, print every minute
-        if iteration%self.ITERATIONS_PER_MINUTE == 0:
-            print("Mineral income: " + str('%.1f'%(mineral_income)) + "Gas income: " + str('%.1f'%(vespene_income)))
-            print("Mineral expense: " + str('%.1f'%(mineral_rate)) + "Gas expense: " + str('%.1f'%(vespene_rate)))
-            print("Resource ratio:" + str('%.3f'%(self.resource_ratio)))
-            print(num_warpgates)
-            print(num_stargates)
-            print(num_robos)
-            print("Threat level")
-            print(self.threat_level)
-            await self.chat_send("Threat level: " + str('%.3f'%(self.threat_level)))
-            await self.chat_send("Estimated enemy resources: Minerals: " + str('%.0f'%(self.enemy_minerals)) + " Gas: " + str('%.0f'%(self.enemy_vespene)))
-
+        print("Mineral income: " + str('%.1f'%(mineral_income)) + "Gas income: " + str('%.1f'%(vespene_income)))
+        print("Mineral expense: " + str('%.1f'%(mineral_rate)) + "Gas expense: " + str('%.1f'%(vespene_rate)))
+        print("Resource ratio:" + str('%.3f'%(self.resource_ratio)))
+        print(num_warpgates)
+        print(num_stargates)
+        print(num_robos)
+        print("Threat level")
+        print(self.threat_level)
+        print("Threat cache hits: " + str(self.threat_cache.hits) + " misses: " + str(self.threat_cache.misses) + " hit rate: " + str('%.3f'%(self.threat_cache.hit_rate())))
+        for base, (minerals, vespene) in self.enemy_economy.breakdown().items():
+            print("Enemy base " + str(base) + " mined: Minerals: " + str('%.0f'%(minerals)) + " Gas: " + str('%.0f'%(vespene)))
+        await self.chat_send("Threat level: " + str('%.3f'%(self.threat_level)))
+        await self.chat_send("Estimated enemy resources: Minerals: " + str('%.0f'%(self.enemy_minerals)) + " Gas: " + str('%.0f'%(self.enemy_vespene)))
+        for line in self.scheduler.summary():
+            print(line)
+        print("Ability queries: " + str(self.ability_cache.queries))
+        
             
      
             
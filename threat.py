@@ -0,0 +1,237 @@
+"""
+Vectorized threat level model.
+
+Takes per-type unit counts of both armies and the matchup matrices from matchup.py, and works out the threat level
+with broadcasted matrix operations instead of looping over every own/enemy unit type pair. Several candidate futures
+can be scored in one call, which is how unit scores for every unit we can build are worked out.
+
+ThreatModel keeps the per-pair effective dps matrices between calls and only recomputes the rows and columns of unit
+types whose counts changed, so it can be kept up to date from unit events. ThreatCache remembers threat levels of army
+compositions we have already scored.
+"""
+from collections import OrderedDict
+import numpy as np
+
+
+# Effective dps taken below this is clipped so units that cannot be hurt don't get infinite effective hp.
+NO_THREAT = 0.01
+
+
+class ArmyTerms:
+    # Per unit id terms of one army's StatTable that the threat model needs, worked out once.
+    def __init__(self, stats, gas_value, unit_ids=None):
+        if unit_ids is None:
+            unit_ids = np.arange(len(stats))
+        self.unit_value = (stats.minerals + gas_value*stats.vespene)[unit_ids]
+        # Unit size drop off: Model dps as max efficiency at units that can fit within (2*PI/4)*(range+2), after which you get sharp drop off. (for ground units only)
+        self.range = np.maximum(stats.range_ground, stats.range_air)[unit_ids]
+        self.optimal_units = np.floor((np.pi/2)*(self.range + 2)/stats.size[unit_ids])
+        self.is_ground = stats.is_ground[unit_ids]
+
+    def army_value(self, num_units):
+        # Value of the units in combat, with the square root drop off for ground units past the optimal amount attacking.
+        # Too many units: Model excess unit dps as a square root drop off.
+        with np.errstate(invalid='ignore'):
+            crowded = self.optimal_units + (np.sqrt(num_units - self.optimal_units))*self.unit_value
+        return np.where((num_units <= self.optimal_units) | ~self.is_ground, num_units*self.unit_value, crowded)
+
+
+def effective_dps(own, enemy, own_counts, enemy_counts, future_own_units, future_enemy_units,
+                  own_time_to_kill, own_time_to_reach, enemy_time_to_kill, enemy_time_to_reach):
+    # Effective dps dealt and taken for every own/enemy unit type pair, indexed [...][own unit id][enemy unit id].
+    # Own and enemy are ArmyTerms. Any leading dimensions of the future unit arrays are candidate futures.
+    own_units = own_counts + future_own_units
+    enemy_units = enemy_counts + future_enemy_units
+    own_value = own_units*own.unit_value
+    enemy_value = enemy_units*enemy.unit_value
+
+    # Only pairs where both unit types exist now or in the future fight. Other pairs deal 0 effective dps.
+    fighting = ((own_counts > 0) | (future_own_units != 0))[..., :, None] & ((enemy_counts > 0) | (future_enemy_units != 0))[..., None, :]
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Time it takes all our units of a type to kill all enemy units of another type, and vice versa
+        own_time_to_kill = own_time_to_kill*(enemy_value[..., None, :]/own.army_value(own_units)[..., :, None])
+        enemy_time_to_kill = enemy_time_to_kill*(own_value[..., :, None]/enemy.army_value(enemy_units)[..., None, :])
+        # Effective dps = Time it takes for each unit to reach and kill all units of another type. Weigh this for all units by their total value.
+        effective_dps_dealt = np.where(fighting, (1/(own_time_to_reach + own_time_to_kill))*enemy_value[..., None, :], 0.0)
+        effective_dps_taken = np.where(fighting, (1/(enemy_time_to_reach + enemy_time_to_kill))*own_value[..., :, None], 0.0)
+    return effective_dps_dealt, effective_dps_taken
+
+
+def add_tanking(effective_hp, ranges, dps):
+    # Units tanking for each other: Effective hp of unit is its time to reach + time to kill of all units shorter range than it.
+    # Adds dps[..., j] to effective_hp[..., i] for every j with a shorter range than i. Cumsum adds the terms one by one in order of j,
+    # the same order as adding them in a loop, so results do not depend on the summation order.
+    shorter_range = ranges[:, None] > ranges[None, :]
+    terms = np.where(shorter_range, dps[..., None, :], 0.0)
+    return np.cumsum(np.concatenate([effective_hp[..., None], terms], axis=-1), axis=-1)[..., -1]
+
+
+def combat_threat(own, enemy, effective_dps_dealt, effective_dps_taken):
+    # Threat level from the effective dps matrices of effective_dps.
+    # TODO: Effective dps only lasts as long as the unit is alive. This is reflected in our combat score, but does not reflect how effective hp is calculated assuming full effective dps!
+    # Enemies with 0 damage to us are not a threat, we don't need to deal with them! We need to fix this to avoid making phoenix as an air tank against no air units!
+    # Effective hp = 1/time to die
+    # Time to die = num_units*time_to_kill + time_to_reach
+    # num_units reduces over time based on our num_units*time_to_kill + time_to_reach
+    own_dps_taken = np.sum(effective_dps_taken, axis=-1)
+    enemy_dps_taken = np.sum(effective_dps_dealt, axis=-2)
+    own_effective_dps = np.sum(effective_dps_dealt, axis=-1)
+    own_effective_hp = 1/np.sum(np.clip(effective_dps_taken, a_min=NO_THREAT, a_max=None), axis=-1)
+    enemy_effective_dps = np.sum(effective_dps_taken, axis=-2)
+    enemy_effective_hp = 1/np.sum(np.clip(effective_dps_dealt, a_min=NO_THREAT, a_max=None), axis=-2)
+
+    # TODO: Also factor in time to kill of other units of the same type, not just shorter ranged units
+    own_effective_hp = add_tanking(own_effective_hp, own.range, own_dps_taken)
+    enemy_effective_hp = add_tanking(enemy_effective_hp, enemy.range, enemy_dps_taken)
+
+    # Combat score = sum of each unit's effective dps* its effective hp.
+    own_combat_score = np.sum(own_effective_dps*own_effective_hp, axis=-1)
+    enemy_combat_score = np.sum(enemy_effective_dps*enemy_effective_hp, axis=-1)
+    # Threat level = our combat score/enemy combat score
+    return enemy_combat_score/np.maximum(own_combat_score, 0.0001)
+
+
+def threat_levels(own_stats, enemy_stats, own_counts, enemy_counts, future_own_units, future_enemy_units,
+                  own_time_to_kill, own_time_to_reach, enemy_time_to_kill, enemy_time_to_reach, gas_value):
+    # Threat level of K candidate futures in one evaluation.
+    # Own_counts and enemy_counts are the number of units of each type id we have/know the enemy has.
+    # Future_own_units is a K x own unit id matrix of extra units we anticipate, one candidate future per row.
+    # Future_enemy_units is either one array shared by every candidate or a K x enemy unit id matrix.
+    # Returns an array of K threat levels.
+    # Known issue: If 2 units have the same range, they will be allocated their own optimal units attacking. Similarly, they will not count as tanking for each other.
+    own = ArmyTerms(own_stats, gas_value)
+    enemy = ArmyTerms(enemy_stats, gas_value)
+    effective_dps_dealt, effective_dps_taken = effective_dps(own, enemy, own_counts, enemy_counts,
+                                                             np.atleast_2d(future_own_units), np.atleast_2d(future_enemy_units),
+                                                             own_time_to_kill, own_time_to_reach, enemy_time_to_kill, enemy_time_to_reach)
+    return combat_threat(own, enemy, effective_dps_dealt, effective_dps_taken)
+
+
+def threat_level(own_stats, enemy_stats, own_counts, enemy_counts, future_own_units, future_enemy_units,
+                 own_time_to_kill, own_time_to_reach, enemy_time_to_kill, enemy_time_to_reach, gas_value):
+    # Threat level of a single future, see threat_levels.
+    return threat_levels(own_stats, enemy_stats, own_counts, enemy_counts, future_own_units, future_enemy_units,
+                         own_time_to_kill, own_time_to_reach, enemy_time_to_kill, enemy_time_to_reach, gas_value)[0]
+
+
+class ThreatModel:
+    # Incremental threat level. Holds unit counts per type id and the effective dps matrices for them.
+    # Gaining or losing units of one type only marks its row (own) or column (enemy) as stale, and threat_level()
+    # recomputes just the stale rows and columns before summing up. Gives the same result as calculate_threat_level.
+    def __init__(self, own_stats, enemy_stats, own_time_to_kill, own_time_to_reach, enemy_time_to_kill, enemy_time_to_reach, gas_value):
+        self.own_stats = own_stats
+        self.enemy_stats = enemy_stats
+        self.own = ArmyTerms(own_stats, gas_value)
+        self.enemy = ArmyTerms(enemy_stats, gas_value)
+        self.gas_value = gas_value
+        self.matchups = (own_time_to_kill, own_time_to_reach, enemy_time_to_kill, enemy_time_to_reach)
+        self.own_counts = np.zeros(len(own_stats))
+        self.enemy_counts = np.zeros(len(enemy_stats))
+        self.future_own_units = np.zeros(len(own_stats))
+        self.future_enemy_units = np.zeros(len(enemy_stats))
+        self.effective_dps_dealt = np.zeros((len(own_stats), len(enemy_stats)))
+        self.effective_dps_taken = np.zeros((len(own_stats), len(enemy_stats)))
+        self.stale_rows = set()
+        self.stale_columns = set()
+        self.threat = None
+
+    def resync(self, own_units, enemy_units):
+        # Recount both armies from scratch, e.g. to correct for units we missed events for.
+        own_counts = self.own_stats.counts(own_units)
+        enemy_counts = self.enemy_stats.counts(enemy_units)
+        self.stale_rows.update(np.flatnonzero(own_counts != self.own_counts).tolist())
+        self.stale_columns.update(np.flatnonzero(enemy_counts != self.enemy_counts).tolist())
+        self.own_counts = own_counts
+        self.enemy_counts = enemy_counts
+
+    def add_own(self, type_id, amount=1):
+        # Use a negative amount for lost units. Unit types that are not in our army's table are ignored.
+        i = self.own_stats.index.get(type_id)
+        if i is not None:
+            self.own_counts[i] += amount
+            self.stale_rows.add(i)
+
+    def add_enemy(self, type_id, amount=1):
+        j = self.enemy_stats.index.get(type_id)
+        if j is not None:
+            self.enemy_counts[j] += amount
+            self.stale_columns.add(j)
+
+    def set_future(self, future_own_units=None, future_enemy_units=None):
+        # Future units we anticipate, as passed to calculate_threat_level. Only the unit types whose amount changed go stale.
+        if future_own_units is None:
+            future_own_units = np.zeros(len(self.own_stats))
+        if future_enemy_units is None:
+            future_enemy_units = np.zeros(len(self.enemy_stats))
+        future_own_units = np.array(future_own_units, dtype=float)
+        future_enemy_units = np.array(future_enemy_units, dtype=float)
+        self.stale_rows.update(np.flatnonzero(future_own_units != self.future_own_units).tolist())
+        self.stale_columns.update(np.flatnonzero(future_enemy_units != self.future_enemy_units).tolist())
+        self.future_own_units = future_own_units
+        self.future_enemy_units = future_enemy_units
+
+    def update(self):
+        # Recompute the stale rows, then the stale columns. Each costs one row/column of pair evaluations.
+        own_time_to_kill, own_time_to_reach, enemy_time_to_kill, enemy_time_to_reach = self.matchups
+        if self.stale_rows:
+            rows = np.array(sorted(self.stale_rows))
+            dealt, taken = effective_dps(ArmyTerms(self.own_stats, self.gas_value, rows), self.enemy,
+                                         self.own_counts[rows], self.enemy_counts, self.future_own_units[rows], self.future_enemy_units,
+                                         own_time_to_kill[rows], own_time_to_reach[rows], enemy_time_to_kill[rows], enemy_time_to_reach[rows])
+            self.effective_dps_dealt[rows] = dealt
+            self.effective_dps_taken[rows] = taken
+        if self.stale_columns:
+            columns = np.array(sorted(self.stale_columns))
+            dealt, taken = effective_dps(self.own, ArmyTerms(self.enemy_stats, self.gas_value, columns),
+                                         self.own_counts, self.enemy_counts[columns], self.future_own_units, self.future_enemy_units[columns],
+                                         own_time_to_kill[:, columns], own_time_to_reach[:, columns], enemy_time_to_kill[:, columns], enemy_time_to_reach[:, columns])
+            self.effective_dps_dealt[:, columns] = dealt
+            self.effective_dps_taken[:, columns] = taken
+        if self.stale_rows or self.stale_columns or self.threat is None:
+            self.threat = combat_threat(self.own, self.enemy, self.effective_dps_dealt, self.effective_dps_taken)
+        self.stale_rows.clear()
+        self.stale_columns.clear()
+
+    def threat_level(self):
+        self.update()
+        return self.threat
+
+
+class ThreatCache:
+    # Bounded LRU cache of threat levels, keyed on the army compositions they were worked out for.
+    # Future unit amounts are fractional, so they are rounded to future_step units to let near identical futures share an entry.
+    # Only valid for one set of matchups: clear it whenever the matchups are rebuilt.
+    def __init__(self, max_size=4096, future_step=0.01):
+        self.max_size = max_size
+        self.future_step = future_step
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, own_counts, enemy_counts, future_own_units, future_enemy_units, gas_value):
+        return (tuple(np.rint(own_counts).astype(int).tolist()), tuple(np.rint(enemy_counts).astype(int).tolist()),
+                tuple(np.rint(np.asarray(future_own_units)/self.future_step).astype(int).tolist()),
+                tuple(np.rint(np.asarray(future_enemy_units)/self.future_step).astype(int).tolist()), gas_value)
+
+    def get(self, key):
+        # Returns None on a miss.
+        threat = self.entries.get(key)
+        if threat is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return threat
+
+    def put(self, key, threat):
+        self.entries[key] = threat
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def hit_rate(self):
+        return self.hits/max(self.hits + self.misses, 1)
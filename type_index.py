@@ -0,0 +1,61 @@
+"""
+Units grouped by type, built once per game step.
+
+Filtering self.units or self.structures by type goes over every unit each time it is called, and the bot does that
+dozens of times per step for the same few types. TypeIndex sorts a player's units and structures by type in one pass
+when the step begins, and memoizes each type filter and its ready and idle subsets for the rest of the step.
+The returned Units are shared, so don't modify them.
+"""
+from sc2.units import Units
+
+
+class TypeIndex:
+    def __init__(self, bot, groups):
+        # groups: function returning the Units groups to index, e.g. lambda: (bot.units, bot.structures)
+        self.bot = bot
+        self.groups = groups
+        self.game_loop = None
+        self.by_type = {}
+        self.order = {}
+        self.memo = {}
+
+    def refresh(self):
+        if self.bot.state.game_loop != self.game_loop:
+            self.game_loop = self.bot.state.game_loop
+            self.by_type = {}
+            self.order = {}
+            self.memo = {}
+            for group in self.groups():
+                for unit in group:
+                    self.order[unit.tag] = len(self.order)
+                    self.by_type.setdefault(unit.type_id, []).append(unit)
+
+    def __call__(self, type_ids):
+        # Same as units(type_ids) for a type or a set of types, in the same order.
+        self.refresh()
+        key = frozenset(type_ids) if isinstance(type_ids, (set, frozenset, list, tuple)) else type_ids
+        units = self.memo.get(key)
+        if units is None:
+            if isinstance(key, frozenset):
+                members = [unit for type_id in key for unit in self.by_type.get(type_id, ())]
+                members.sort(key=lambda unit: self.order[unit.tag])
+            else:
+                members = self.by_type.get(key, ())
+            units = Units(members, self.bot)
+            self.memo[key] = units
+        return units
+
+    def subset(self, name, type_ids):
+        units = self(type_ids)
+        key = (name, id(units))
+        subset = self.memo.get(key)
+        if subset is None:
+            subset = getattr(units, name)
+            self.memo[key] = subset
+        return subset
+
+    def ready(self, type_ids):
+        return self.subset('ready', type_ids)
+
+    def idle(self, type_ids):
+        return self.subset('idle', type_ids)
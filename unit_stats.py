@@ -0,0 +1,181 @@
+"""
+Array-backed unit stat tables.
+
+Each race gets one StatTable holding its unit stats column-wise (one NumPy array per stat), indexed by a stable
+unit id: the position of the unit type in that race's army list. UnitStats is a thin row accessor, so code can keep
+reading stats as own_army.hp while the vectorized threat and matchup math reads whole columns at once.
+
+Tables can be saved to and loaded from a versioned .npz data file, see build_unit_stats.py. The file holds every stat
+of a table in one array, and the version of the definitions it was built from. Costs and supply are not stored as
+numbers but as how much of which unit types' game data costs they are made of (e.g. an archon is two high templar),
+so they are read from the game data when the file is loaded and follow balance patches without a rebuild.
+"""
+import os
+import numpy as np
+from sc2.ids.unit_typeid import UnitTypeId
+
+
+# Unit attributes are stored as bit flags, so bonus damage checks become a bitwise and.
+ATTRIBUTES = ['Light', 'Armored', 'Biological', 'Mechanical', 'Psionic', 'Massive', 'Heroic', 'Structure']
+ATTRIBUTE_BITS = {attribute: 1 << bit for bit, attribute in enumerate(ATTRIBUTES)}
+
+NUMERIC_FIELDS = ['attacks_ground', 'attacks_air', 'dmg_ground', 'dmg_air', 'bonus_dmg_ground', 'bonus_dmg_air',
+                  'attack_speed_ground', 'attack_speed_air', 'attack_point_ground', 'attack_point_air',
+                  'hp', 'shields', 'armor', 'shield_armor', 'range_ground', 'range_air', 'leash_range', 'movement_speed',
+                  'splash_area_air', 'splash_area_ground', 'size', 'minerals', 'vespene', 'supply', 'build_time']
+BOOL_FIELDS = ['is_air', 'is_ground']
+ATTRIBUTE_FIELDS = ['attribute', 'bonus_attr_ground', 'bonus_attr_air']
+TABLE_FIELDS = NUMERIC_FIELDS + BOOL_FIELDS + ATTRIBUTE_FIELDS
+# Fields taken from the game data when a data file is loaded, in the order of unit_cost in unit_list.py
+COST_FIELDS = ['minerals', 'vespene', 'supply']
+STORED_FIELDS = [field for field in TABLE_FIELDS if field not in COST_FIELDS]
+FIELD_TYPES = dict([(field, float) for field in NUMERIC_FIELDS] + [(field, bool) for field in BOOL_FIELDS]
+                   + [(field, np.int64) for field in ATTRIBUTE_FIELDS])
+
+# Bump this whenever the stored fields or their meaning change, so old data files get rebuilt instead of misread.
+SCHEMA_VERSION = 2
+
+
+def attribute_bits(attributes):
+    # Accepts a list of attribute names, a single name or None.
+    if attributes is None:
+        return 0
+    if isinstance(attributes, str):
+        return ATTRIBUTE_BITS[attributes]
+    bits = 0
+    for attribute in attributes:
+        bits |= ATTRIBUTE_BITS[attribute]
+    return bits
+
+
+def attribute_names(bits):
+    return [attribute for attribute in ATTRIBUTES if bits & ATTRIBUTE_BITS[attribute]]
+
+
+class StatTable:
+    # Stats of one race's units. Behaves like the old list of unit types: len(), iteration and indexing by id
+    # give UnitStats rows. Columns are available as attributes, e.g. table.hp is an array with one entry per unit id.
+    def __init__(self, type_ids, columns):
+        self.type_ids = list(type_ids)
+        self.index = {type_id: i for i, type_id in enumerate(self.type_ids)}
+        self.columns = columns
+        self.units = [UnitStats(self, i) for i in range(len(self.type_ids))]
+
+    @classmethod
+    def from_rows(cls, type_ids, rows):
+        # Rows map a unit type to a dict of its stats, as written in unit_list.py.
+        columns = {}
+        for field in NUMERIC_FIELDS:
+            columns[field] = np.array([rows[type_id][field] for type_id in type_ids], dtype=float)
+        for field in BOOL_FIELDS:
+            columns[field] = np.array([rows[type_id][field] for type_id in type_ids], dtype=bool)
+        for field in ATTRIBUTE_FIELDS:
+            columns[field] = np.array([attribute_bits(rows[type_id][field]) for type_id in type_ids], dtype=np.int64)
+        return cls(type_ids, columns)
+
+    def __len__(self):
+        return len(self.units)
+
+    def __iter__(self):
+        return iter(self.units)
+
+    def __getitem__(self, key):
+        # Index with a unit id, or with the UnitTypeId itself.
+        if isinstance(key, (int, np.integer)):
+            return self.units[key]
+        return self.units[self.index[key]]
+
+    def __contains__(self, type_id):
+        return type_id in self.index
+
+    def counts(self, units):
+        # Number of units of each unit id in a Units group, in one pass. Units not in this table are ignored.
+        counts = np.zeros(len(self.type_ids))
+        for unit in units:
+            i = self.index.get(unit.type_id)
+            if i is not None:
+                counts[i] += 1
+        return counts
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get('columns')
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+
+class UnitStats:
+    # One row of a StatTable. id is the row index, type_id the UnitTypeId to use when talking to the game.
+    __slots__ = ('table', 'id', 'type_id')
+
+    def __init__(self, table, unit_id):
+        self.table = table
+        self.id = unit_id
+        self.type_id = table.type_ids[unit_id]
+
+    def __getattr__(self, name):
+        try:
+            value = self.table.columns[name][self.id]
+        except KeyError:
+            raise AttributeError(name)
+        if name == 'attribute':
+            return attribute_names(value)
+        if name in ATTRIBUTE_FIELDS:
+            names = attribute_names(value)
+            return names[0] if names else None
+        return value
+
+    def __repr__(self):
+        return 'UnitStats(' + str(self.type_id) + ')'
+
+
+def save_tables(path, tables, recipes, definitions_version, definitions_hash):
+    # Writes a dict of name -> StatTable to one .npz file, in as few arrays as possible since each one is read separately.
+    # recipes: (cost type ids, coefficients), where coefficients[field, unit, cost type] is how many times the unit's
+    # COST_FIELDS[field] counts that of the cost type, units in the order of the tables. definitions_hash identifies the
+    # definitions, for build_unit_stats.py to tell whether they changed.
+    names = list(tables)
+    # One column per unit: its table, its UnitTypeId value, then its stats
+    units = [np.concatenate([np.full(len(tables[name].type_ids), float(i)) for i, name in enumerate(names)]),
+             np.concatenate([[float(type_id.value) for type_id in tables[name].type_ids] for name in names])]
+    units += [np.concatenate([tables[name].columns[field] for name in names]).astype(float) for field in STORED_FIELDS]
+    cost_type_ids, coefficients = recipes
+    np.savez(path, header=np.array([SCHEMA_VERSION, definitions_version], dtype=np.int64), definitions_hash=np.array(definitions_hash),
+             tables=np.array(names), units=np.array(units), cost_type_id=np.array([type_id.value for type_id in cost_type_ids], dtype=np.int64),
+             cost_recipe=np.asarray(coefficients, dtype=float))
+
+
+def read_header(path):
+    # (schema version, definitions version, definitions hash) of a data file, or None if there is none.
+    if not os.path.isfile(path):
+        return None
+    with np.load(path) as data:
+        if not {'header', 'definitions_hash'} <= set(data.files):
+            return None
+        schema_version, definitions_version = data['header'].tolist()[:2]
+        return schema_version, definitions_version, str(data['definitions_hash'])
+
+
+def load_tables(path, definitions_version, costs):
+    # Reads the tables written by save_tables in one go. costs(type_id) gives the (minerals, vespene, supply) of a unit
+    # type in the game data. Returns None if there is no data file, or it was written for another schema version or
+    # other definitions.
+    if not os.path.isfile(path):
+        return None
+    with np.load(path) as data:
+        if 'header' not in data.files or data['header'].tolist()[:2] != [SCHEMA_VERSION, definitions_version]:
+            return None
+        names, units, cost_type_ids, recipe = data['tables'], data['units'], data['cost_type_id'], data['cost_recipe']
+    # (cost type, field) values from the game data, combined by the recipe of each unit
+    values = np.array([costs(UnitTypeId(value)) for value in cost_type_ids.tolist()], dtype=float).reshape(-1, len(COST_FIELDS))
+    cost_columns = [recipe[field_index] @ values[:, field_index] for field_index in range(len(COST_FIELDS))]
+    table_index = units[0]
+    tables = {}
+    for i, name in enumerate(names.tolist()):
+        in_table = table_index == i
+        type_ids = [UnitTypeId(value) for value in units[1, in_table].astype(np.int64).tolist()]
+        columns = {field: units[row + 2, in_table].astype(FIELD_TYPES[field]) for row, field in enumerate(STORED_FIELDS)}
+        for field, column in zip(COST_FIELDS, cost_columns):
+            columns[field] = column[in_table]
+        tables[name] = StatTable(type_ids, columns)
+    return tables
@@ -0,0 +1,190 @@
+"""
+Which workers mine what, and moving idle and surplus workers to the bases and gas buildings that are missing harvesters.
+
+HarvesterRegistry keeps the workers of every mineral field and gas building across steps, so finding the workers on
+a resource or counting them doesn't go over every worker's orders.
+
+Every worker that may move is a row of one cost matrix and every missing harvester at a base or gas building is a
+column. The workers that may move are idle workers and the surplus of oversaturated bases, or, depending on the
+mineral-gas balance, workers on minerals or in gas. Costs are the travel distance plus a little for each harvester
+already headed to the same target, so a short supply of workers gets spread out. One min-cost assignment then sends
+the closest workers, instead of handing workers out base by base, sending the same worker to several places in one
+step or pulling a worker across the map while a closer one was free.
+"""
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from sc2.ids.ability_id import AbilityId
+
+
+# Mineral workers this close to an oversaturated base can be moved away from it
+BASE_RADIUS = 10
+# Extra cost (in distance) for each harvester already assigned to the same target
+SLOT_COST = 2
+# Cost of pairs that must not be assigned
+NEVER = 1e9
+# Hysteresis: gas is filled above resource_ratio (mineral income/gas income) and emptied below this part of it
+MINERAL_RATIO_BAND = 0.95
+# Harvesters per mineral field that mine at full speed. A third one mostly waits for the others.
+HARVESTERS_PER_PATCH = 2
+# Orders of workers that are still on their resource, bringing back what they mined
+RETURN_ORDERS = {AbilityId.HARVEST_RETURN, AbilityId.HARVEST_RETURN_PROBE, AbilityId.HARVEST_RETURN_SCV, AbilityId.HARVEST_RETURN_DRONE}
+
+
+class HarvesterRegistry:
+    # Which workers mine which resource, kept across steps. Updated with assign() when we send a worker to gather,
+    # with remove() when a worker or resource dies, and reconciled with the workers' orders by sync() every now and
+    # then, for the orders the game gives on its own (rallies, workers finishing a build).
+    def __init__(self):
+        # {worker tag: resource tag}
+        self.by_worker = {}
+        # {resource tag: set of worker tags}
+        self.by_resource = {}
+
+    def assign(self, worker_tag, resource_tag):
+        self.release(worker_tag)
+        self.by_worker[worker_tag] = resource_tag
+        self.by_resource.setdefault(resource_tag, set()).add(worker_tag)
+
+    def release(self, worker_tag):
+        resource_tag = self.by_worker.pop(worker_tag, None)
+        if resource_tag is not None:
+            self.by_resource[resource_tag].discard(worker_tag)
+
+    def remove(self, tag):
+        # Call when a unit dies. Handles workers, depleted mineral fields and destroyed gas buildings.
+        self.release(tag)
+        for worker_tag in self.by_resource.pop(tag, ()):
+            del self.by_worker[worker_tag]
+
+    def resource_of(self, worker_tag):
+        return self.by_worker.get(worker_tag)
+
+    def workers_on(self, resource_tag):
+        # Tags of the workers mining this resource. Don't modify the set.
+        return self.by_resource.get(resource_tag, ())
+
+    def saturation(self, resource_tag):
+        # Number of workers mining this resource
+        return len(self.by_resource.get(resource_tag, ()))
+
+    def workers_on_any(self, resource_tags, amount=None):
+        # Tags of up to amount workers mining any of these resources, the most crowded resources first.
+        tags = []
+        for resource_tag in sorted(resource_tags, key=self.saturation, reverse=True):
+            tags.extend(self.by_resource.get(resource_tag, ()))
+            if amount is not None and len(tags) >= amount:
+                return tags[:amount]
+        return tags
+
+    def sync(self, workers, resource_tags):
+        # Takes the assignments of the workers we see from their orders. Workers inside a gas building are not
+        # seen and keep theirs, as do workers returning cargo. Forgets resources that are gone.
+        for worker in workers:
+            order_target = worker.order_target
+            if order_target in resource_tags:
+                if self.by_worker.get(worker.tag) != order_target:
+                    self.assign(worker.tag, order_target)
+            elif not (worker.orders and worker.orders[0].ability.id in RETURN_ORDERS):
+                self.release(worker.tag)
+        for resource_tag in [tag for tag in self.by_resource if tag not in resource_tags]:
+            self.remove(resource_tag)
+
+
+class WorkerAllocator:
+    def __init__(self, bot, harvesters):
+        self.bot = bot
+        self.harvesters = harvesters
+
+    def plan(self, resource_ratio):
+        # Returns the gather orders [(worker, target)] and townhall rallies [(townhall, mineral field)] for this step.
+        bot = self.bot
+        harvesters = self.harvesters
+        workers = bot.workers
+        townhalls = bot.townhalls.ready
+        mineral_field = bot.mineral_field
+        gas_buildings = bot.gas_buildings.ready
+        if not workers or not townhalls or not mineral_field:
+            return [], []
+        ratio = bot.state.score.collection_rate_minerals/max(bot.state.score.collection_rate_vespene, 1)
+        need_gas = ratio > resource_ratio
+        need_minerals = ratio < resource_ratio*MINERAL_RATIO_BAND
+
+        # Mineral fields of every base, closest first. The closest is where the base rallies to.
+        field_distances = bot.distances.squared(mineral_field, townhalls)
+        base_fields = {}
+        for column, base in enumerate(townhalls):
+            near_base = np.flatnonzero(field_distances[:, column] < BASE_RADIUS**2)
+            base_fields[base.tag] = [mineral_field[int(i)] for i in near_base[np.argsort(field_distances[near_base, column])]]\
+                or [mineral_field[int(np.argmin(field_distances[:, column]))]]
+
+        # Columns: one per missing harvester. New harvesters of a base go to its closest fields with less than
+        # HARVESTERS_PER_PATCH harvesters, then to its closest field. Saturated bases rally to the (last) base missing harvesters.
+        targets = []
+        ranks = []
+        gas_targets = []
+        rallies = []
+        oversaturated = [base for base in townhalls if base.surplus_harvesters > 0]
+        for base in townhalls:
+            if base.surplus_harvesters < 0:
+                fields = base_fields[base.tag]
+                open_slots = [field for field in fields for slot in range(HARVESTERS_PER_PATCH - harvesters.saturation(field.tag))]
+                for rank in range(-base.surplus_harvesters):
+                    targets.append(open_slots[rank] if rank < len(open_slots) else fields[0])
+                    ranks.append(rank)
+                    gas_targets.append(False)
+                rallies.extend((other_base, fields[0]) for other_base in oversaturated)
+                rallies.append((base, fields[0]))
+        if need_gas:
+            for gas in gas_buildings:
+                for rank in range(-gas.surplus_harvesters):
+                    targets.append(gas)
+                    ranks.append(rank)
+                    gas_targets.append(True)
+        if not targets:
+            return [], rallies
+
+        # Rows: idle workers and the surplus of oversaturated bases, taken from their most crowded fields. Without
+        # those, workers on minerals can fill gas when we need gas, and workers in gas can fill bases when we have too much gas.
+        workers_by_tag = {worker.tag: worker for worker in workers}
+
+        def movable(worker_tags, amount=None):
+            # Workers we see that aren't carrying anything back, so no mined resources are lost
+            movable_workers = []
+            for tag in worker_tags:
+                worker = workers_by_tag.get(tag)
+                if worker is not None and not worker.is_carrying_resource:
+                    movable_workers.append(worker)
+                    if len(movable_workers) == amount:
+                        break
+            return movable_workers
+
+        donors = list(workers.idle)
+        donor_tags = {worker.tag for worker in donors}
+        for base in oversaturated:
+            crowded = [tag for tag in harvesters.workers_on_any([field.tag for field in base_fields[base.tag]]) if tag not in donor_tags]
+            surplus = movable(crowded, base.surplus_harvesters)
+            donors.extend(surplus)
+            donor_tags.update(worker.tag for worker in surplus)
+        # Which targets each row may take
+        allowed = [None]*len(donors)
+        if not donors:
+            if need_gas:
+                donors = movable(harvesters.workers_on_any(mineral_field.tags))
+                allowed = [True]*len(donors)
+            elif need_minerals and gas_buildings:
+                donors = movable(harvesters.workers_on_any(gas_buildings.tags))
+                allowed = [False]*len(donors)
+        if not donors:
+            return [], rallies
+
+        donor_positions = np.array([worker.position_tuple for worker in donors], dtype=float)
+        target_positions = np.array([target.position_tuple for target in targets], dtype=float)
+        difference = donor_positions[:, np.newaxis, :] - target_positions[np.newaxis, :, :]
+        cost = np.sqrt(np.einsum('ijk,ijk->ij', difference, difference)) + SLOT_COST*np.array(ranks, dtype=float)
+        gas_targets = np.array(gas_targets)
+        for row, target_kind in enumerate(allowed):
+            if target_kind is not None:
+                cost[row, gas_targets != target_kind] = NEVER
+        rows, columns = linear_sum_assignment(cost)
+        orders = [(donors[row], targets[column]) for row, column in zip(rows, columns) if cost[row, column] < NEVER]
+        return orders, rallies